@@ -1,10 +1,11 @@
+import multiprocessing
 import sys
 import time
 import psutil
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                             QHBoxLayout, QPushButton, QLabel, QSpinBox, 
                             QFileDialog, QMessageBox, QProgressBar, QLineEdit,
-                            QGridLayout, QScrollArea)
+                            QGridLayout, QScrollArea, QComboBox, QCheckBox)
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QPixmap, QImage
 import cv2
@@ -16,9 +17,14 @@ from modules import (
     CryptoService, 
     ImageService, 
     FileService, 
+    ShareFormat,
+    ShareStore,
     HistogramWindow, 
     PasswordSwitch, 
-    MetricsPanel
+    MetricsPanel,
+    JobRunner,
+    TraceService,
+    array_to_qimage
 )
 
 class SISApp(QMainWindow):
@@ -33,6 +39,9 @@ class SISApp(QMainWindow):
         self.crypto_service = CryptoService()
         self.image_service = ImageService()
         self.file_service = FileService()
+        self.share_store = ShareStore()
+        self.job_runner = JobRunner(self)
+        self.job_start_time = None
         
         # Uygulama durumu
         self.image_path = None
@@ -176,6 +185,29 @@ class SISApp(QMainWindow):
         threshold_layout.addWidget(self.threshold_spin)
         control_layout.addLayout(threshold_layout)
 
+        # Paylaşım şeması
+        scheme_layout = QHBoxLayout()
+        scheme_label = QLabel("Paylaşım Şeması:")
+        scheme_label.setStyleSheet("""
+            font-size: 14px;
+            min-width: 150px;
+            color: #2196F3;
+            font-weight: bold;
+        """)
+        self.scheme_combo = QComboBox()
+        self.scheme_combo.addItem("Shamir (GF(2^8))", "gf256")
+        self.scheme_combo.addItem("Thien-Lin (1/k pay)", "thien_lin")
+        self.scheme_combo.addItem("XOR (k = n)", "xor")
+        self.scheme_combo.setFixedWidth(200)
+        scheme_layout.addWidget(scheme_label)
+        scheme_layout.addWidget(self.scheme_combo)
+        control_layout.addLayout(scheme_layout)
+
+        # Aşamalı (çok çözünürlüklü) paylaşım
+        self.progressive_check = QCheckBox("Aşamalı önizleme (1/8, 1/4, 1/2 seviyeleri)")
+        self.progressive_check.setStyleSheet("font-size: 14px; color: #2196F3; font-weight: bold;")
+        control_layout.addWidget(self.progressive_check)
+
         # Parola switch widget'ı
         password_layout = QHBoxLayout()
         password_label = QLabel("Parola:")
@@ -211,8 +243,13 @@ class SISApp(QMainWindow):
         self.histogram_button.clicked.connect(self.show_histograms)
         self.histogram_button.setEnabled(False)
 
+        self.cancel_button = QPushButton("İptal")
+        self.cancel_button.clicked.connect(self.cancel_job)
+        self.cancel_button.setEnabled(False)
+
         # Tüm butonlara aynı stili uygula
-        for button in [self.load_button, self.share_button, self.reconstruct_button, self.histogram_button]:
+        for button in [self.load_button, self.share_button, self.reconstruct_button, self.histogram_button,
+                       self.cancel_button]:
             button.setStyleSheet("""
                 QPushButton {
                     background-color: #2196F3;
@@ -310,11 +347,11 @@ class SISApp(QMainWindow):
         if file_path:
             try:
                 self.image_path = file_path
-                # Görüntü servisi ile yükle
+                # Görüntü servisi ile yükle (tek çözme; paylaştırma aynı önbellek dizisini kullanır)
                 self.original_image = self.image_service.load_and_resize_image(file_path)
                 
-                # UI güncelle
-                pixmap = QPixmap(file_path)
+                # UI güncelle: önizleme çözülmüş dizinin kopyasız QImage görünümünden oluşur
+                pixmap = QPixmap.fromImage(array_to_qimage(self.original_image))
                 scaled_pixmap = pixmap.scaled(
                     self.original_image_label.size().width(),
                     self.original_image_label.size().height(),
@@ -346,7 +383,7 @@ class SISApp(QMainWindow):
                 QMessageBox.critical(self, "Hata", f"Görüntü yüklenirken hata oluştu: {str(e)}")
 
     def share_image(self):
-        """Görüntü paylaştırma işlemi"""
+        """Görüntü paylaştırma işlemi (ağır iş arka planda çalışır)"""
         if not self.image_path:
             QMessageBox.warning(self, "Uyarı", "Lütfen önce bir görüntü yükleyin!")
             return
@@ -359,63 +396,135 @@ class SISApp(QMainWindow):
             QMessageBox.warning(self, "Uyarı", "Parola zorunlu! Lütfen bir parola girin!")
             return
 
-        try:
-            start_time = time.time()
-            self.share_button.setEnabled(False)
-            self.progress_bar.setVisible(True)
-            self.progress_bar.setValue(0)
-
-            num_shares = self.shares_spin.value()
-            threshold = self.threshold_spin.value()
-
-            if threshold > num_shares:
-                QMessageBox.critical(self, "Hata", "Minimum parça sayısı toplam parça sayısından büyük olamaz!")
-                return
+        num_shares = self.shares_spin.value()
+        threshold = self.threshold_spin.value()
+        scheme = self.scheme_combo.currentData()
 
-            # Görüntü servisi ile paylaştır
-            shares, original_shape = self.image_service.secret_image_sharing(
-                self.image_path, num_shares, threshold, password
-            )
+        if threshold > num_shares:
+            QMessageBox.critical(self, "Hata", "Minimum parça sayısı toplam parça sayısından büyük olamaz!")
+            return
 
-            # Pay görselleştirmelerini oluştur
-            self.share_images = self.image_service.create_share_visualization(shares, original_shape)
+        if scheme == "xor" and threshold != num_shares:
+            QMessageBox.critical(self, "Hata", "XOR şeması için minimum parça sayısı toplam parça sayısına eşit olmalı!")
+            return
 
-            # Payları kaydet
-            for share_idx in range(num_shares):
-                share_data = []
-                for byte_shares in shares:
-                    share_data.append(byte_shares[share_idx])
+        pyramid_levels = 3 if self.progressive_check.isChecked() else 0
+        self.start_job(
+            self.run_share_job, self.image_path, self.original_image, num_shares, threshold, scheme,
+            password_required, password, pyramid_levels,
+            on_finished=self.on_share_finished
+        )
+
+    def run_share_job(self, context, image_path, original_image, num_shares, threshold, scheme,
+                      password_required, password, pyramid_levels):
+        """Arka plan işi: paylaştır, görselleştir ve kaydet (widget'lara dokunmaz)"""
+        # Görüntü servisi ile paylaştır
+        context.stage("Paylaştırılıyor", 0, 60)
+        shares, original_shape = self.image_service.secret_image_sharing(
+            image_path, num_shares, threshold, password, backend=scheme,
+            pyramid_levels=pyramid_levels, progress=context.report
+        )
+        level_shares = shares if isinstance(shares, dict) else {0: shares}
+
+        # Pay görselleştirmelerini oluştur
+        context.stage("Görselleştiriliyor", 60, 65)
+        share_images = self.image_service.create_share_visualization(level_shares[0], original_shape)
+
+        # Şifreli paylar için tüm küme tek bir anahtar türetmesini paylaşır
+        key_batch = None
+        if password_required and password:
+            key_batch = self.crypto_service.create_key_batch(password)
+        context.check_cancelled()
+
+        # Payları ve görselleştirmeleri eşzamanlı, atomik olarak kaydet
+        share_data_list = self.image_service.share_data_list(shares, num_shares)
+
+        # Paylar görüntü içeriğinden türetilen kimliğin klasörüne yazılır (shares/<kimlik>/)
+        context.stage("Kaydediliyor", 65, 100)
+        image_id = self.share_store.image_id(image_path)
+        pixel_digest = None
+        if original_image is not None and original_image.shape == tuple(original_shape):
+            pixel_digest = ShareFormat.pixel_digest(original_image)
+        self.share_store.put_batch(
+            image_id, share_data_list, share_images, original_shape, password_required, password,
+            threshold=threshold, scheme=scheme, num_shares=num_shares,
+            key_batch=key_batch, progress=context.report, pixel_digest=pixel_digest
+        )
+
+        return {
+            "share_images": share_images,
+            "num_shares": num_shares,
+            "threshold": threshold,
+            "password_required": password_required,
+            "directory": self.share_store.directory(image_id)
+        }
 
-                # Dosya servisi ile kaydet
-                self.file_service.save_share_data(
-                    share_idx, share_data, original_shape, password_required, password
-                )
-                
-                # Pay görselleştirmesini kaydet
-                self.file_service.save_share_image(share_idx, self.share_images[share_idx])
+    def on_share_finished(self, result):
+        """Paylaştırma bitti: sonuçları UI'da göster"""
+        self.finish_job()
+        self.share_images = result["share_images"]
+
+        # Pay görselleştirmelerini UI'da göster
+        self.display_shares()
+
+        encryption_status = "şifrelenmiş" if result["password_required"] else "şifrelenmemiş"
+        QMessageBox.information(self, "Başarılı", 
+                              f"Görüntü {result['num_shares']} parçaya bölündü (minimum {result['threshold']} parça gerekli)!\nDurum: {encryption_status}\n"
+                              f"Klasör: {result['directory']}")
+
+        # Metrikler
+        share_time = (time.time() - self.job_start_time) * 1000
+        self.metrics_panel.update_metric('share_generation_time', share_time)
+        memory_usage = psutil.Process().memory_info().rss / 1024 / 1024
+        self.metrics_panel.update_metric('memory_usage', memory_usage)
+
+    def start_job(self, fn, *args, on_finished=None, on_preview=None):
+        """Arka plan işini başlat; işlem butonlarını kilitle, iptal butonunu aç"""
+        self.job_start_time = time.time()
+        self.share_button.setEnabled(False)
+        self.reconstruct_button.setEnabled(False)
+        self.cancel_button.setEnabled(True)
+        self.progress_bar.setValue(0)
+        self.progress_bar.setFormat("%p%")
+        self.progress_bar.setVisible(True)
+        self.job_runner.submit(
+            fn, *args,
+            on_progress=self.on_job_progress, on_preview=on_preview, on_finished=on_finished,
+            on_failed=self.on_job_failed, on_cancelled=self.on_job_cancelled,
+            on_trace=self.metrics_panel.update_stages
+        )
+
+    def finish_job(self):
+        """İş bitti (başarılı, hatalı ya da iptal): butonları eski haline getir"""
+        self.share_button.setEnabled(True)
+        self.reconstruct_button.setEnabled(True)
+        self.cancel_button.setEnabled(False)
+        self.progress_bar.setVisible(False)
 
-                progress = (share_idx + 1) / num_shares * 100
-                self.progress_bar.setValue(int(progress))
-                QApplication.processEvents()
+    def on_job_progress(self, percent, stage):
+        """Toplu (en fazla ~20/sn) ilerleme güncellemesi"""
+        self.progress_bar.setValue(percent)
+        self.progress_bar.setFormat(f"{stage} %p%" if stage else "%p%")
 
-            # Pay görselleştirmelerini UI'da göster
-            self.display_shares()
+    def on_job_failed(self, message):
+        self.finish_job()
+        QMessageBox.critical(self, "Hata", f"İşlem sırasında hata oluştu: {message}")
 
-            encryption_status = "şifrelenmiş" if password_required else "şifrelenmemiş"
-            QMessageBox.information(self, "Başarılı", 
-                                  f"Görüntü {num_shares} parçaya bölündü (minimum {threshold} parça gerekli)!\nDurum: {encryption_status}")
+    def on_job_cancelled(self):
+        self.finish_job()
+        self.image_service.log_event("İşlem kullanıcı tarafından iptal edildi")
+        QMessageBox.information(self, "İptal", "İşlem iptal edildi.")
 
-            # Metrikler
-            share_time = (time.time() - start_time) * 1000
-            self.metrics_panel.update_metric('share_generation_time', share_time)
-            memory_usage = psutil.Process().memory_info().rss / 1024 / 1024
-            self.metrics_panel.update_metric('memory_usage', memory_usage)
+    def cancel_job(self):
+        """Çalışan işe iptal isteği gönder"""
+        self.cancel_button.setEnabled(False)
+        self.job_runner.cancel_all()
 
-        except Exception as e:
-            QMessageBox.critical(self, "Hata", f"İşlem sırasında hata oluştu: {str(e)}")
-        finally:
-            self.share_button.setEnabled(True)
-            self.progress_bar.setVisible(False)
+    def closeEvent(self, event):
+        """Pencere kapanırken çalışan işleri iptal edip bitmelerini bekle"""
+        self.job_runner.cancel_all()
+        self.job_runner.wait(5000)
+        super().closeEvent(event)
 
     def display_shares(self):
         """Pay görselleştirmelerini UI'da göster"""
@@ -499,105 +608,131 @@ class SISApp(QMainWindow):
             self.shares_size_label.setText(f"Pay Görüntüleri Boyutu: {width}x{height} piksel")
 
     def reconstruct_image(self):
-        """Görüntü geri yükleme işlemi"""
-        try:
-            start_time = time.time()
-            
-            # Pay dosyalarını seç
-            share_files, _ = QFileDialog.getOpenFileNames(
-                self, "Paylaşımları Seç", "shares", "Share Files (*.bin)"
-            )
-            
-            if not share_files:
-                return
-
-            threshold = self.threshold_spin.value()
-            if len(share_files) < threshold:
-                QMessageBox.critical(self, "Hata", f"En az {threshold} parça gerekli!")
-                return
-
-            self.reconstruct_button.setEnabled(False)
-            self.progress_bar.setVisible(True)
-            self.progress_bar.setValue(0)
-            QApplication.processEvents()
-
-            wrapped_shares = []
-            password_required = None
-
-            # Pay dosyalarını yükle
-            for i, file in enumerate(share_files[:threshold]):
-                wrapped_share, is_encrypted = self.file_service.load_share_file(
-                    file, self.password_widget.get_password()
-                )
-                wrapped_shares.append(wrapped_share)
-                password_required = is_encrypted
+        """Görüntü geri yükleme işlemi (ağır iş arka planda çalışır)"""
+        # Pay dosyalarını seç
+        share_files, _ = QFileDialog.getOpenFileNames(
+            self, "Paylaşımları Seç", "shares", "Share Files (*.bin)"
+        )
+        
+        if not share_files:
+            return
 
-                progress = (i + 1) / threshold * 50
-                self.progress_bar.setValue(int(progress))
-                QApplication.processEvents()
+        threshold = self.threshold_spin.value()
+        if len(share_files) < threshold:
+            QMessageBox.critical(self, "Hata", f"En az {threshold} parça gerekli!")
+            return
+
+        self.start_job(
+            self.run_reconstruct_job, share_files, threshold, self.password_widget.get_password(),
+            self.original_image,
+            on_finished=self.on_reconstruct_finished, on_preview=self.display_reconstructed_preview
+        )
 
-            # Parola kontrolü
-            if password_required and not self.password_widget.get_password():
-                QMessageBox.warning(self, "Uyarı", "Bu dosyalar şifrelenmiş! Lütfen parola girin!")
-                return
+    def run_reconstruct_job(self, context, share_files, threshold, password, original_image):
+        """Arka plan işi: payları yükle, geri yükle, kaydet ve doğrula (widget'lara dokunmaz)"""
+        # Pay dosyalarını eşzamanlı yükle (fazla paylar hata tespiti için kullanılır)
+        context.stage("Paylar yükleniyor", 0, 40)
+        wrapped_shares, password_required = self.file_service.load_share_files(
+            share_files, password, progress=context.report
+        )
 
-            # Görüntü servisi ile geri yükle
-            self.reconstructed_image = self.image_service.reconstruct_image_from_shares(
-                wrapped_shares, threshold, self.password_widget.get_password()
+        # Parola kontrolü
+        if password_required and not password:
+            raise ValueError("Bu dosyalar şifrelenmiş! Lütfen parola girin!")
+
+        # Aşamalı paylarda önce kaba seviyeleri önizleme olarak göster
+        sections = wrapped_shares[0].get("sections") or {}
+        if len(sections) > 1:
+            for level, preview in self.image_service.reconstruct_progressive(
+                    wrapped_shares, threshold, stop_level=1):
+                context.preview(preview)
+
+        # Görüntü servisi ile geri yükle
+        context.stage("Geri yükleniyor", 40, 85)
+        faulty_shares = {}
+        # Hata tespitli yol payların başlığındaki k ile çalışır; karar da ona göre verilir
+        share_threshold = wrapped_shares[0].get("threshold") or threshold
+        if len(wrapped_shares) > share_threshold and wrapped_shares[0].get("scheme") == "gf256":
+            reconstructed_image, faulty_shares = self.image_service.reconstruct_image_robust(
+                wrapped_shares, threshold
             )
-            
-            # RGB'ye çevir
-            reconstructed_image = cv2.cvtColor(self.reconstructed_image, cv2.COLOR_BGR2RGB)
-            
-            self.progress_bar.setValue(75)
-            QApplication.processEvents()
-            
-            # Dosya servisi ile kaydet
-            self.file_service.save_reconstructed_image(reconstructed_image)
-            
-            # UI'da göster
-            qimg = QImage(reconstructed_image.data, reconstructed_image.shape[1], 
-                         reconstructed_image.shape[0], reconstructed_image.strides[0], 
-                         QImage.Format.Format_RGB888)
-            pixmap = QPixmap.fromImage(qimg)
-            scaled_pixmap = pixmap.scaled(
-                self.reconstructed_image_label.size().width(),
-                self.reconstructed_image_label.size().height(),
-                Qt.AspectRatioMode.KeepAspectRatio,
-                Qt.TransformationMode.SmoothTransformation
+            context.report(1, 1)
+        else:
+            reconstructed_image = self.image_service.reconstruct_image_from_shares(
+                wrapped_shares, threshold, password, progress=context.report
             )
-            self.reconstructed_image_label.setPixmap(scaled_pixmap)
-            
-            # Boyut etiketini güncelle
-            self.update_image_size_label(self.reconstructed_size_label, self.reconstructed_image)
-            
-            self.progress_bar.setValue(100)
-            
-            # Başarı mesajı - sadece şifreli/şifresiz durumu
-            encryption_status = "şifrelenmiş" if password_required else "şifrelenmemiş"
-            success_message = f"Görüntü başarıyla geri yüklendi!\nDurum: {encryption_status}"
-            QMessageBox.information(self, "Başarılı", success_message)
-            self.image_service.log_event(f"{len(wrapped_shares)} parça kullanılarak görüntü geri yüklendi. Durum: {encryption_status}")
-
-            # Benzerlik hesapla
-            if self.original_image is not None:
-                similarity = self.image_service.calculate_image_similarity(
-                    self.original_image, self.reconstructed_image
-                )
-                self.metrics_panel.update_metric('image_similarity', similarity)
-                self.image_service.log_event(f"Görüntü benzerlik oranı: {similarity:.2%}")
 
-            # Metrikler
-            reconstruction_time = (time.time() - start_time) * 1000
-            self.metrics_panel.update_metric('reconstruction_time', reconstruction_time)
-            memory_usage = psutil.Process().memory_info().rss / 1024 / 1024
-            self.metrics_panel.update_metric('memory_usage', memory_usage)
+        # Dosya servisi ile kaydet
+        context.stage("Kaydediliyor", 85, 95)
+        self.file_service.save_reconstructed_image(cv2.cvtColor(reconstructed_image, cv2.COLOR_BGR2RGB))
+
+        # Benzerlik: paylardaki piksel özeti eşleşirse görüntü birebir aynıdır, metrik
+        # yalnızca özet farklıysa (ya da yoksa) küçültülmüş ızgarada hesaplanır
+        context.stage("Doğrulanıyor", 95, 100)
+        exact_match = self.image_service.verify_reconstruction(reconstructed_image, wrapped_shares)
+        similarity = None
+        if exact_match:
+            similarity = 1.0
+        elif original_image is not None and original_image.shape == reconstructed_image.shape:
+            similarity = self.image_service.quality_metrics(original_image, reconstructed_image)["ssim"]
+        if exact_match is False:
+            self.image_service.log_event("Uyarı: geri yüklenen görüntü paylardaki piksel özetiyle eşleşmiyor")
+
+        return {
+            "image": reconstructed_image,
+            "faulty_shares": faulty_shares,
+            "password_required": password_required,
+            "share_count": len(wrapped_shares),
+            "similarity": similarity
+        }
 
-        except Exception as e:
-            QMessageBox.critical(self, "Hata", f"İşlem sırasında hata oluştu: {str(e)}")
-        finally:
-            self.reconstruct_button.setEnabled(True)
-            self.progress_bar.setVisible(False)
+    def on_reconstruct_finished(self, result):
+        """Geri yükleme bitti: sonuçları UI'da göster"""
+        self.finish_job()
+        self.reconstructed_image = result["image"]
+
+        # UI'da göster
+        pixmap = QPixmap.fromImage(array_to_qimage(self.reconstructed_image))
+        scaled_pixmap = pixmap.scaled(
+            self.reconstructed_image_label.size().width(),
+            self.reconstructed_image_label.size().height(),
+            Qt.AspectRatioMode.KeepAspectRatio,
+            Qt.TransformationMode.SmoothTransformation
+        )
+        self.reconstructed_image_label.setPixmap(scaled_pixmap)
+        
+        # Boyut etiketini güncelle
+        self.update_image_size_label(self.reconstructed_size_label, self.reconstructed_image)
+        
+        # Başarı mesajı - sadece şifreli/şifresiz durumu
+        encryption_status = "şifrelenmiş" if result["password_required"] else "şifrelenmemiş"
+        success_message = f"Görüntü başarıyla geri yüklendi!\nDurum: {encryption_status}"
+        if result["faulty_shares"]:
+            faulty_list = ", ".join(str(x) for x in result["faulty_shares"])
+            success_message += f"\nBozuk paylar tespit edilip düzeltildi: {faulty_list}"
+        QMessageBox.information(self, "Başarılı", success_message)
+        self.image_service.log_event(f"{result['share_count']} parça kullanılarak görüntü geri yüklendi. Durum: {encryption_status}")
+
+        similarity = result["similarity"]
+        if similarity is not None:
+            self.metrics_panel.update_metric('image_similarity', similarity)
+            self.image_service.log_event(f"Görüntü benzerlik oranı: {similarity:.2%}")
+
+        # Metrikler
+        reconstruction_time = (time.time() - self.job_start_time) * 1000
+        self.metrics_panel.update_metric('reconstruction_time', reconstruction_time)
+        memory_usage = psutil.Process().memory_info().rss / 1024 / 1024
+        self.metrics_panel.update_metric('memory_usage', memory_usage)
+
+    def display_reconstructed_preview(self, image):
+        """Geri yüklenen görüntünün düşük çözünürlüklü önizlemesini göster"""
+        pixmap = QPixmap.fromImage(array_to_qimage(image)).scaled(
+            self.reconstructed_image_label.size().width(),
+            self.reconstructed_image_label.size().height(),
+            Qt.AspectRatioMode.KeepAspectRatio,
+            Qt.TransformationMode.SmoothTransformation
+        )
+        self.reconstructed_image_label.setPixmap(pixmap)
 
     def show_histograms(self):
         """Histogram penceresini göster"""
@@ -621,10 +756,14 @@ class SISApp(QMainWindow):
 
 def main():
     """Ana uygulama başlatıcı"""
+    # SIS_TRACE=1 ile aşama süreleri metrik panelinde gösterilir (SIS_TRACE_FILE: JSON-lines)
+    TraceService.enable_from_environment()
     app = QApplication(sys.argv)
     window = SISApp()
     window.show()
     sys.exit(app.exec())
 
 if __name__ == "__main__":
+    # PyInstaller ile donmuş exe'de süreç havuzu işçileri arayüzü yeniden açmasın
+    multiprocessing.freeze_support()
     main() 
\ No newline at end of file
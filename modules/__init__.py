@@ -1,14 +1,55 @@
+from importlib import import_module
 
 from .crypto_service import CryptoService
 from .image_service import ImageService
 from .file_service import FileService
-from .ui_components import HistogramWindow, PasswordSwitch, MetricsPanel
+from .shamir_engine import ShamirEngine
+from .thien_lin_engine import ThienLinEngine
+from .xor_engine import XorEngine
+from .parallel_engine import ParallelEngine
+from .share_format import ShareFormat
+from .share_store import ShareStore
+from .batch_service import BatchService
+from .benchmark_service import BenchmarkService
+from .histogram_service import HistogramService
+from .image_loader import ImageLoader
+from .trace_service import TraceService
+# UI dışa aktarımları (PyQt6 / matplotlib) ilk erişimde yüklenir; servis katmanı hafif kalır.
+# __all__ dışında tutulurlar, böylece `from modules import *` Qt olmadan da çalışır
+_LAZY_EXPORTS = {
+    'HistogramWindow': '.ui_components',
+    'PasswordSwitch': '.ui_components',
+    'MetricsPanel': '.ui_components',
+    'array_to_qimage': '.ui_components',
+    'JobRunner': '.job_runner',
+    'JobCancelled': '.job_runner',
+}
 
 __all__ = [
     'CryptoService',
     'ImageService', 
     'FileService',
-    'HistogramWindow',
-    'PasswordSwitch',
-    'MetricsPanel'
-] 
\ No newline at end of file
+    'ShamirEngine',
+    'ThienLinEngine',
+    'XorEngine',
+    'ParallelEngine',
+    'ShareFormat',
+    'ShareStore',
+    'BatchService',
+    'BenchmarkService',
+    'HistogramService',
+    'ImageLoader',
+    'TraceService',
+]
+
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        value = getattr(import_module(_LAZY_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
@@ -0,0 +1,9 @@
+"""python -m modules giriş noktası"""
+
+import multiprocessing
+import sys
+from .cli import main
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
@@ -0,0 +1,237 @@
+"""
+Toplu Paylaştırma Servisi
+Bir klasördeki (ya da glob desenine uyan) görüntüleri süreç havuzunda paylaştırır;
+her görüntünün durumu bildirim dosyasında tutulur, yarıda kalan çalışma kaldığı yerden devam eder
+"""
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import glob
+import json
+import os
+import shutil
+import time
+from .crypto_service import CryptoService
+from .file_service import FileService
+from .image_service import ImageService
+from .share_format import ShareFormat
+from .share_store import ShareStore
+
+MANIFEST_FILE = "batch_manifest.json"
+MANIFEST_VERSION = 1
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff", ".webp")
+# Bildirim en fazla bu kadar saniyede bir diske yazılır; kesintide yalnızca son aralık yeniden yapılır
+MANIFEST_SAVE_INTERVAL = 1.0
+
+
+def _share_worker(image_path: str, image_id: str, directory: str, settings: dict, password: str = None) -> dict:
+    """Tek görüntüyü paylaştırıp <directory>/<kimlik>/ altına yaz (süreç havuzunda çalışır)
+
+    Küme geçici klasöre yazılıp tamamlanınca eski kümenin yerine konur. Hata fırlatmak yerine
+    sözlükte "error" döndürür; böylece her istisna türü ana sürece taşınabilir.
+    """
+    start = time.perf_counter()
+    try:
+        target = os.path.join(directory, image_id)
+        max_dimension = settings["max_dimension"] or None
+        num_shares, threshold, scheme = settings["num_shares"], settings["threshold"], settings["scheme"]
+        shares, original_shape = ImageService.secret_image_sharing(
+            image_path, num_shares, threshold, password, backend=scheme, max_dimension=max_dimension)
+        pixel_digest = ShareFormat.pixel_digest(ImageService.load_and_resize_image(image_path, max_dimension))
+        key_batch = CryptoService.create_key_batch(password) if password else None
+        staging = ShareStore.staging_directory(directory, image_id)
+        try:
+            staged_paths = FileService.save_share_batch(
+                ImageService.share_data_list(shares, num_shares), None, original_shape, bool(password),
+                password, threshold=threshold, scheme=scheme, num_shares=num_shares, key_batch=key_batch,
+                workers=1, directory=staging, pixel_digest=pixel_digest)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        ShareStore.replace_directory(staging, target)
+        paths = [os.path.join(target, os.path.basename(path)) for path in staged_paths]
+    except Exception as e:
+        return {"status": "failed", "error": f"{type(e).__name__}: {e}",
+                "seconds": time.perf_counter() - start}
+
+    return {
+        "status": "done",
+        "image_id": image_id,
+        "shape": [int(dim) for dim in original_shape],
+        "shares": paths,
+        "share_bytes": sum(os.path.getsize(path) for path in paths),
+        "seconds": time.perf_counter() - start,
+    }
+
+
+class BatchService:
+    """Klasör ölçeğinde paylaştırma servisi"""
+
+    @staticmethod
+    def collect_images(source: str, recursive: bool = False) -> list:
+        """Klasördeki ya da glob desenine uyan görüntü dosyalarını sıralı olarak döndür"""
+        if os.path.isdir(source):
+            pattern = os.path.join(source, "**", "*") if recursive else os.path.join(source, "*")
+        else:
+            pattern = source
+        paths = [
+            path for path in glob.glob(pattern, recursive=recursive)
+            if os.path.isfile(path) and path.lower().endswith(IMAGE_EXTENSIONS)
+        ]
+        return sorted(paths)
+
+    @staticmethod
+    def manifest_path(directory: str) -> str:
+        return os.path.join(directory, MANIFEST_FILE)
+
+    @staticmethod
+    def load_manifest(directory: str):
+        """Bildirimi oku; yoksa None"""
+        try:
+            with open(BatchService.manifest_path(directory), "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            return None
+        except ValueError:
+            raise ValueError(f"Bildirim dosyası bozuk: {BatchService.manifest_path(directory)}")
+        if manifest.get("version") != MANIFEST_VERSION:
+            raise ValueError(f"Desteklenmeyen bildirim sürümü: {manifest.get('version')}")
+        return manifest
+
+    @staticmethod
+    def save_manifest(directory: str, manifest: dict):
+        """Bildirimi atomik olarak yaz"""
+        with FileService.atomic_open(BatchService.manifest_path(directory)) as f:
+            f.write(json.dumps(manifest, indent=1, ensure_ascii=False).encode("utf-8"))
+
+    @staticmethod
+    def is_complete(entry: dict, stat: os.stat_result) -> bool:
+        """Kayıt tamamlanmış, kaynak dosya değişmemiş ve pay dosyaları yerinde mi"""
+        return (entry.get("status") == "done"
+                and entry.get("size") == stat.st_size and entry.get("mtime_ns") == stat.st_mtime_ns
+                and all(os.path.exists(path) for path in entry.get("shares", ())))
+
+    @staticmethod
+    def share_directory(source: str, directory: str = "shares", num_shares: int = 3, threshold: int = None,
+                        scheme: str = "gf256", password: str = None, max_dimension: int = 800,
+                        workers: int = None, recursive: bool = False, restart: bool = False,
+                        progress=None) -> dict:
+        """source'taki tüm görüntüleri paylaştır; paylar <directory>/<kimlik>/share_<x>.bin olur
+
+        Görüntüler ayrı süreçlerde paylaştırılır ve ShareStore dizinine kaydedilir. Durum
+        <directory>/batch_manifest.json'da tutulur: aynı komut yeniden çalıştırıldığında tamamlanmış
+        ve o zamandan beri değişmemiş görüntüler atlanır, başarısız olanlar yeniden denenir.
+        Bildirim farklı k / n / şema / boyut / şifreleme ayarlarıyla oluşturulmuşsa restart=True
+        olmadan devam edilmez. İçeriği aynı olan dosyalar aynı kimliği paylaştığından bir kez
+        paylaştırılır ve hepsi aynı pay kümesine bağlanır. progress(tamamlanan, toplam) her
+        görüntüden sonra çağrılır.
+
+        Dönüş: toplam, paylaştırılan, atlanan, başarısız sayıları ile süre, görüntü/sn ve MB/sn
+        (kaynak dosya baytları üzerinden) içeren özet.
+        """
+        threshold = threshold or num_shares // 2 + 1
+        settings = {"num_shares": num_shares, "threshold": threshold, "scheme": scheme,
+                    "max_dimension": max_dimension or 0, "encrypted": bool(password)}
+        image_paths = BatchService.collect_images(source, recursive)
+        if not image_paths:
+            raise ValueError(f"Paylaştırılacak görüntü bulunamadı: {source}")
+
+        os.makedirs(directory, exist_ok=True)
+        manifest = None if restart else BatchService.load_manifest(directory)
+        if manifest is not None and manifest["settings"] != settings:
+            raise ValueError("Bildirim farklı ayarlarla oluşturulmuş; baştan başlamak için restart kullanın")
+        if manifest is None:
+            manifest = {"version": MANIFEST_VERSION, "settings": settings, "images": {}}
+        entries = manifest["images"]
+
+        pending = []
+        skipped = 0
+        completed = {}
+        for image_path in image_paths:
+            key = os.path.abspath(image_path)
+            stat = os.stat(image_path)
+            entry = entries.get(key)
+            if entry is not None and BatchService.is_complete(entry, stat):
+                completed.setdefault(entry["image_id"], entry)
+                skipped += 1
+                continue
+            entries[key] = {"status": "pending", "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+            pending.append(key)
+
+        # Aynı içerikli dosyalar tek işte toplanır; iki süreç aynı klasöre yazmaz
+        groups = {}
+        failed = 0
+        for key in pending:
+            entry = entries[key]
+            try:
+                image_id = ShareStore.image_id(key)
+            except OSError as e:
+                entry.update(status="failed", error=f"{type(e).__name__}: {e}")
+                failed += 1
+                continue
+            previous = completed.get(image_id)
+            if previous is not None:
+                entry.update({field: previous[field] for field in ("status", "image_id", "shape", "shares",
+                                                                   "share_bytes")}, seconds=0.0)
+                skipped += 1
+                continue
+            groups.setdefault(image_id, []).append(key)
+
+        total = len(image_paths)
+        done_count = skipped + failed
+        shared = 0
+        input_bytes = share_bytes = 0
+        if progress is not None:
+            progress(done_count, total)
+
+        start = time.perf_counter()
+        last_save = 0.0
+        with ShareStore(directory) as store:
+            executor = ProcessPoolExecutor(max_workers=workers or os.cpu_count())
+            try:
+                futures = {executor.submit(_share_worker, keys[0], image_id, directory, settings, password): keys
+                           for image_id, keys in groups.items()}
+                for future in as_completed(futures):
+                    keys = futures[future]
+                    result = future.result()
+                    for key in keys:
+                        entries[key].update(result)
+                    if result["status"] == "done":
+                        store.register(result["image_id"], result["shares"], result["shape"],
+                                       threshold, scheme, num_shares)
+                        shared += len(keys)
+                        input_bytes += entries[keys[0]]["size"]
+                        share_bytes += result["share_bytes"]
+                    else:
+                        failed += len(keys)
+                        ImageService.log_event(f"Toplu paylaştırma hatası ({keys[0]}): {result['error']}")
+
+                    done_count += len(keys)
+                    if progress is not None:
+                        progress(done_count, total)
+                    now = time.monotonic()
+                    if now - last_save >= MANIFEST_SAVE_INTERVAL:
+                        BatchService.save_manifest(directory, manifest)
+                        last_save = now
+            finally:
+                executor.shutdown(wait=True, cancel_futures=True)
+                BatchService.save_manifest(directory, manifest)
+
+        elapsed = time.perf_counter() - start
+        summary = {
+            "total": total,
+            "shared": shared,
+            "skipped": skipped,
+            "failed": failed,
+            "seconds": elapsed,
+            "input_bytes": input_bytes,
+            "share_bytes": share_bytes,
+            "images_per_second": shared / elapsed if elapsed > 0 else 0.0,
+            "mb_per_second": input_bytes / (1024 * 1024) / elapsed if elapsed > 0 else 0.0,
+            "failures": {key: entries[key]["error"] for key in pending if entries[key]["status"] == "failed"},
+        }
+        ImageService.log_event(
+            f"Toplu paylaştırma: {shared} görüntü {elapsed:.2f} sn'de "
+            f"({summary['images_per_second']:.2f} görüntü/sn, {summary['mb_per_second']:.2f} MB/sn), "
+            f"{skipped} atlandı, {failed} başarısız."
+        )
+        return summary
@@ -0,0 +1,204 @@
+"""
+Performans Ölçüm Servisi
+Sentetik görüntülerle paylaştırma, geri yükleme, görselleştirme, şifreleme ve dosya G/Ç sürelerini
+arayüz olmadan ölçer; sonuçlar JSON olarak kaydedilip önceki bir temel ölçümle karşılaştırılır
+"""
+
+import json
+import os
+import platform
+import shutil
+import statistics
+import tempfile
+import time
+import cv2
+import numpy as np
+from .crypto_service import CryptoService
+from .file_service import FileService
+from .image_loader import ImageLoader
+from .image_service import ImageService
+
+RESULTS_VERSION = 1
+DEFAULT_SIZES = ((256, 256), (800, 600), (1920, 1080))
+DEFAULT_THRESHOLDS = ((2, 3), (3, 5))
+BENCHMARK_PASSWORD = "benchmark"
+# Sonuçları eşleştiren alanlar; temel ölçümle karşılaştırmada aynı anahtarlı satırlar kıyaslanır
+RESULT_KEY = ("case", "scheme", "width", "height", "threshold", "num_shares", "encrypted")
+
+
+class BenchmarkService:
+    """Tekrarlanabilir performans ölçümü servisi"""
+
+    @staticmethod
+    def synthetic_image(width: int, height: int, seed: int = 0) -> np.ndarray:
+        """Yumuşak geçişler ve gürültü içeren, tohuma göre hep aynı BGR görüntü"""
+        rng = np.random.default_rng(seed)
+        y, x = np.mgrid[0:height, 0:width].astype(np.float32)
+        base = np.stack([x / max(width - 1, 1), y / max(height - 1, 1),
+                         0.5 + 0.5 * np.sin((x + y) / 32.0)], axis=2) * 200.0
+        noise = rng.normal(0.0, 12.0, size=(height, width, 3))
+        return np.clip(base + noise, 0, 255).astype(np.uint8)
+
+    @staticmethod
+    def measure(fn, repeat: int = 3, setup=None) -> dict:
+        """fn'i repeat kez çalıştırıp süreleri (saniye) özetle; setup her çalıştırmadan önce,
+        süreye katılmadan çağrılır. Son çalıştırmanın dönüş değeri "value" altında döner."""
+        timings = []
+        value = None
+        for _ in range(max(repeat, 1)):
+            if setup is not None:
+                setup()
+            start = time.perf_counter()
+            value = fn()
+            timings.append(time.perf_counter() - start)
+        return {
+            "seconds": statistics.median(timings),
+            "min": min(timings),
+            "mean": statistics.fmean(timings),
+            "runs": len(timings),
+            "value": value,
+        }
+
+    @staticmethod
+    def environment() -> dict:
+        """Sonuçların yorumlanması için çalışma ortamı bilgisi"""
+        return {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "opencv": cv2.__version__,
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "cpu_count": os.cpu_count(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+
+    @staticmethod
+    def clear_caches():
+        """Görüntü ve anahtar önbelleklerini boşalt; her ölçüm soğuk yoldan başlar"""
+        ImageLoader.cache.clear()
+        CryptoService.key_cache.clear()
+
+    @staticmethod
+    def run(sizes=DEFAULT_SIZES, thresholds=DEFAULT_THRESHOLDS, schemes=("gf256",),
+            encryption=(False, True), repeat: int = 3, workers: int = 1, progress=None) -> dict:
+        """Ölçüm matrisini çalıştır
+
+        Her (şema, boyut, k, n) için paylaştırma, görselleştirme ve geri yükleme; ayrıca her
+        şifreleme durumu için kaydetme ve yükleme, şifreli durumda da tek payın AEAD zarfıyla
+        yazılması (encrypt) ve okunması (decrypt) ölçülür. Önbellekler her çalıştırmadan önce boşaltılır, yani
+        paylaştırma süresi görüntü çözmeyi, kaydetme/yükleme süresi de PBKDF2'yi içerir.
+        xor şeması yalnızca k == n ile çalıştığından diğer çiftler atlanır.
+        progress(tamamlanan, toplam) her (şema, boyut, k, n) grubundan sonra çağrılır.
+        """
+        groups = [(scheme, size, pair) for scheme in schemes for size in sizes for pair in thresholds
+                  if scheme != "xor" or pair[0] == pair[1]]
+        results = []
+        work_dir = tempfile.mkdtemp(prefix="sis_bench_")
+        try:
+            for group_idx, (scheme, (width, height), (threshold, num_shares)) in enumerate(groups):
+                image_path = os.path.join(work_dir, f"synthetic_{width}x{height}.png")
+                if not os.path.exists(image_path):
+                    cv2.imwrite(image_path, BenchmarkService.synthetic_image(width, height))
+                image_bytes = width * height * 3
+
+                def record(case, measurement, encrypted=False, size=image_bytes):
+                    measurement.pop("value")
+                    measurement.update(case=case, scheme=scheme, width=width, height=height,
+                                       threshold=threshold, num_shares=num_shares, encrypted=encrypted,
+                                       bytes=size, mb_per_second=size / (1024 * 1024) / measurement["seconds"]
+                                       if measurement["seconds"] > 0 else 0.0)
+                    results.append(measurement)
+
+                share = BenchmarkService.measure(
+                    lambda: ImageService.secret_image_sharing(image_path, num_shares, threshold, backend=scheme,
+                                                              workers=workers, max_dimension=None),
+                    repeat, BenchmarkService.clear_caches)
+                shares, original_shape = share["value"]
+                record("share", share)
+                record("visualize", BenchmarkService.measure(
+                    lambda: ImageService.create_share_visualization(shares, original_shape), repeat))
+
+                share_list = ImageService.share_data_list(shares, num_shares)
+                for encrypted in encryption:
+                    password = BENCHMARK_PASSWORD if encrypted else None
+                    directory = os.path.join(work_dir, f"{scheme}_{width}x{height}_{threshold}_{num_shares}"
+                                                       f"_{int(encrypted)}")
+                    save = BenchmarkService.measure(
+                        lambda: FileService.save_share_batch(
+                            share_list, None, original_shape, encrypted, password, threshold=threshold,
+                            scheme=scheme, num_shares=num_shares, directory=directory),
+                        repeat, BenchmarkService.clear_caches)
+                    paths = save["value"]
+                    share_bytes = sum(os.path.getsize(path) for path in paths)
+                    record("save", save, encrypted, share_bytes)
+
+                    load = BenchmarkService.measure(
+                        lambda: FileService.load_share_files(paths[:threshold], password)[0],
+                        repeat, BenchmarkService.clear_caches)
+                    wrapped_shares = load["value"]
+                    record("load", load, encrypted, share_bytes * threshold // num_shares)
+
+                    if not encrypted:
+                        record("reconstruct", BenchmarkService.measure(
+                            lambda: ImageService.reconstruct_image_from_shares(wrapped_shares, threshold,
+                                                                               workers=workers), repeat))
+                        continue
+
+                    # Tek pay: FileService'in şifreli kaydetme/yükleme yolu (AEAD zarfı, sürüm 2)
+                    single_directory = os.path.join(directory, "single")
+                    encrypt = BenchmarkService.measure(
+                        lambda: FileService.save_share_data(
+                            0, share_list[0], original_shape, True, password, threshold=threshold,
+                            scheme=scheme, num_shares=num_shares, directory=single_directory),
+                        repeat, BenchmarkService.clear_caches)
+                    encrypted_path = encrypt["value"]
+                    encrypted_bytes = os.path.getsize(encrypted_path)
+                    record("encrypt", encrypt, True, encrypted_bytes)
+                    record("decrypt", BenchmarkService.measure(
+                        lambda: FileService.load_share_file(encrypted_path, password),
+                        repeat, BenchmarkService.clear_caches), True, encrypted_bytes)
+                    shutil.rmtree(directory, ignore_errors=True)
+
+                if progress is not None:
+                    progress(group_idx + 1, len(groups))
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+        return {"version": RESULTS_VERSION, "environment": BenchmarkService.environment(),
+                "repeat": repeat, "workers": workers, "results": results}
+
+    @staticmethod
+    def save(report: dict, file_path: str):
+        """Ölçüm raporunu JSON olarak atomik yaz"""
+        with FileService.atomic_open(file_path) as f:
+            f.write(json.dumps(report, indent=1).encode("utf-8"))
+
+    @staticmethod
+    def load(file_path: str) -> dict:
+        """Kaydedilmiş ölçüm raporunu oku"""
+        with open(file_path, "r", encoding="utf-8") as f:
+            report = json.load(f)
+        if report.get("version") != RESULTS_VERSION:
+            raise ValueError(f"Desteklenmeyen ölçüm sürümü: {report.get('version')}")
+        return report
+
+    @staticmethod
+    def compare(report: dict, baseline: dict, tolerance: float = 0.10) -> list:
+        """Ortak satırların medyan sürelerini temel ölçümle karşılaştır
+
+        Her satır için {anahtar alanlar, "baseline", "seconds", "ratio", "regression"} döner;
+        süre temel ölçümün (1 + tolerance) katını aşıyorsa regression True olur.
+        """
+        baseline_rows = {tuple(row[field] for field in RESULT_KEY): row for row in baseline["results"]}
+        comparison = []
+        for row in report["results"]:
+            key = tuple(row[field] for field in RESULT_KEY)
+            base = baseline_rows.get(key)
+            if base is None or base["seconds"] <= 0:
+                continue
+            ratio = row["seconds"] / base["seconds"]
+            entry = dict(zip(RESULT_KEY, key))
+            entry.update(baseline=base["seconds"], seconds=row["seconds"], ratio=ratio,
+                         regression=ratio > 1.0 + tolerance)
+            comparison.append(entry)
+        return comparison
@@ -0,0 +1,309 @@
+"""
+Komut Satırı Arayüzü
+Yalnızca servis katmanını kullanan başsız giriş noktası (PyQt6 / matplotlib içe aktarılmaz)
+
+Kullanım: python -m modules {share,batch,reconstruct,inspect,verify,bench} ...
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import cv2
+from .batch_service import BatchService
+from .benchmark_service import BenchmarkService
+from .file_service import FileService
+from .image_service import ImageService
+from .share_format import ShareFormat
+from .share_store import ShareStore
+from .trace_service import TraceService
+
+SCHEMES = ("gf256", "thien_lin", "xor", "secretsharing")
+
+
+def _password(args):
+    """Parolayı --password ya da --password-env ile verilen ortam değişkeninden al"""
+    if getattr(args, "password_env", None):
+        password = os.environ.get(args.password_env)
+        if password is None:
+            raise ValueError(f"Ortam değişkeni tanımlı değil: {args.password_env}")
+        return password
+    return getattr(args, "password", None)
+
+
+def _add_password_arguments(parser):
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--password", help="parola (komut geçmişinde görünür, --password-env tercih edin)")
+    group.add_argument("--password-env", metavar="DEĞİŞKEN", help="parolayı içeren ortam değişkeni")
+
+
+def _json_default(value):
+    if isinstance(value, (bytes, bytearray)):
+        return bytes(value).hex()
+    raise TypeError(f"JSON'a çevrilemiyor: {type(value).__name__}")
+
+
+def _load_and_reconstruct(args):
+    """Payları yükleyip görüntüyü geri yükle; (görüntü, sarılı paylar, bozuk paylar) döndür"""
+    wrapped_shares, _ = FileService.load_share_files(args.shares, _password(args),
+                                                     allow_legacy_pickle=args.allow_legacy_pickle)
+    threshold = args.threshold or wrapped_shares[0].get("threshold") or len(wrapped_shares)
+    faulty_shares = {}
+    if len(wrapped_shares) > threshold and wrapped_shares[0].get("scheme") == "gf256" and not args.fast:
+        image, faulty_shares = ImageService.reconstruct_image_robust(wrapped_shares, threshold)
+    else:
+        image = ImageService.reconstruct_image_from_shares(wrapped_shares, threshold, workers=args.workers)
+    return image, wrapped_shares, faulty_shares
+
+
+def cmd_share(args):
+    password = _password(args)
+    num_shares = args.num_shares
+    threshold = args.threshold or num_shares // 2 + 1
+    max_dimension = args.max_dimension or None
+    start = time.perf_counter()
+
+    if args.stream:
+        if password or args.scheme != "gf256":
+            raise ValueError("Akış modu yalnızca şifrelenmemiş gf256 paylarını destekler")
+        if args.store:
+            with ShareStore(args.out) as store:
+                paths, original_shape = ImageService.share_image_streaming(
+                    args.image, num_shares, threshold, store=store)
+        else:
+            paths, original_shape = ImageService.share_image_streaming(
+                args.image, num_shares, threshold, directory=args.out)
+    else:
+        shares, original_shape = ImageService.secret_image_sharing(
+            args.image, num_shares, threshold, password, backend=args.scheme, workers=args.workers,
+            pyramid_levels=args.progressive, max_dimension=max_dimension)
+        level_shares = shares if isinstance(shares, dict) else {0: shares}
+        share_data_list = ImageService.share_data_list(shares, num_shares)
+
+        share_images = None
+        if args.images:
+            share_images = ImageService.create_share_visualization(level_shares[0], original_shape)
+        pixel_digest = ShareFormat.pixel_digest(ImageService.load_and_resize_image(args.image, max_dimension))
+        save_args = dict(threshold=threshold, scheme=args.scheme, num_shares=num_shares,
+                         pixel_digest=pixel_digest)
+
+        if args.store:
+            with ShareStore(args.out) as store:
+                paths = store.put_batch(store.image_id(args.image), share_data_list, share_images,
+                                        original_shape, bool(password), password, **save_args)
+        else:
+            paths = FileService.save_share_batch(share_data_list, share_images, original_shape,
+                                                 bool(password), password, directory=args.out, **save_args)
+
+    elapsed = time.perf_counter() - start
+    for path in paths:
+        print(path)
+    print(f"{num_shares} pay (k={threshold}, {args.scheme}) {original_shape[1]}x{original_shape[0]} "
+          f"görüntüden {elapsed:.3f} sn'de oluşturuldu", file=sys.stderr)
+    return 0
+
+
+def cmd_batch(args):
+    def progress(done, total):
+        print(f"\r{done}/{total}", end="", file=sys.stderr, flush=True)
+
+    summary = BatchService.share_directory(
+        args.source, args.out, args.num_shares, args.threshold, args.scheme, _password(args),
+        max_dimension=args.max_dimension, workers=args.workers or None, recursive=args.recursive,
+        restart=args.restart, progress=progress)
+    print(file=sys.stderr)
+    for path, error in summary["failures"].items():
+        print(f"Başarısız: {path}: {error}", file=sys.stderr)
+    print(f"{summary['shared']} görüntü paylaştırıldı, {summary['skipped']} atlandı, "
+          f"{summary['failed']} başarısız - {summary['seconds']:.2f} sn, "
+          f"{summary['images_per_second']:.2f} görüntü/sn, {summary['mb_per_second']:.2f} MB/sn",
+          file=sys.stderr)
+    print(json.dumps(summary, ensure_ascii=False))
+    return 1 if summary["failed"] else 0
+
+
+def cmd_reconstruct(args):
+    start = time.perf_counter()
+    if args.stream:
+        ImageService.reconstruct_image_streaming(args.shares, args.output)
+        print(args.output)
+        return 0
+
+    image, wrapped_shares, faulty_shares = _load_and_reconstruct(args)
+    if not cv2.imwrite(args.output, image):
+        raise ValueError(f"Görüntü kaydedilemedi: {args.output}")
+    print(args.output)
+
+    exact_match = ImageService.verify_reconstruction(image, wrapped_shares)
+    if faulty_shares:
+        print(f"Bozuk paylar düzeltildi: {', '.join(str(x) for x in faulty_shares)}", file=sys.stderr)
+    if exact_match is False:
+        print("Uyarı: piksel özeti eşleşmiyor", file=sys.stderr)
+    print(f"{len(wrapped_shares)} paydan {time.perf_counter() - start:.3f} sn'de geri yüklendi",
+          file=sys.stderr)
+    return 0 if exact_match is not False else 1
+
+
+def cmd_inspect(args):
+    status = 0
+    for path in args.files:
+        try:
+            info = FileService.inspect_share(path)
+        except (OSError, ValueError) as e:
+            info = {"path": path, "error": str(e)}
+            status = 1
+        print(json.dumps(info, default=_json_default, ensure_ascii=False))
+    return status
+
+
+def cmd_verify(args):
+    """Çıkış kodu: 0 birebir aynı, 1 farklı, 2 karşılaştırılacak özet ya da orijinal yok"""
+    image, wrapped_shares, faulty_shares = _load_and_reconstruct(args)
+    exact_match = ImageService.verify_reconstruction(image, wrapped_shares)
+    result = {"exact_match": exact_match, "faulty_shares": list(faulty_shares)}
+
+    if not exact_match and args.original:
+        original = ImageService.load_and_resize_image(args.original, args.max_dimension or None)
+        if original.shape == image.shape:
+            result["exact_match"] = exact_match = bool((original == image).all())
+            if not exact_match:
+                result.update(ImageService.quality_metrics(original, image, args.metrics_dimension or None))
+        else:
+            result["exact_match"] = exact_match = False
+            result["error"] = "Görüntü boyutları eşleşmiyor"
+
+    print(json.dumps(result, ensure_ascii=False))
+    if exact_match is None:
+        return 2
+    return 0 if exact_match else 1
+
+
+def _parse_pairs(text, separator):
+    """"256x256,800x600" ya da "2/3,3/5" biçimindeki listeyi tamsayı çiftlerine çevir"""
+    try:
+        return tuple(tuple(int(part) for part in item.split(separator, 1)) for item in text.split(","))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Geçersiz liste: {text}")
+
+
+def cmd_bench(args):
+    encryption = {"both": (False, True), "on": (True,), "off": (False,)}[args.encryption]
+    report = BenchmarkService.run(
+        args.sizes, args.thresholds, tuple(args.schemes.split(",")), encryption, args.repeat, args.workers,
+        progress=lambda done, total: print(f"\r{done}/{total}", end="", file=sys.stderr, flush=True))
+    print(file=sys.stderr)
+    for row in report["results"]:
+        print(f"{row['case']:<12}{row['scheme']:<10}{row['width']:>5}x{row['height']:<5} "
+              f"k={row['threshold']} n={row['num_shares']} {'şifreli' if row['encrypted'] else 'açık':<8}"
+              f"{row['seconds'] * 1000:>10.2f} ms {row['mb_per_second']:>9.1f} MB/sn", file=sys.stderr)
+    if args.output:
+        BenchmarkService.save(report, args.output)
+        print(args.output)
+
+    if not args.baseline:
+        return 0
+    comparison = BenchmarkService.compare(report, BenchmarkService.load(args.baseline), args.tolerance)
+    regressions = [row for row in comparison if row["regression"]]
+    for row in regressions:
+        print(f"Gerileme: {row['case']} {row['scheme']} {row['width']}x{row['height']} "
+              f"k={row['threshold']} n={row['num_shares']} şifreli={row['encrypted']}: "
+              f"{row['baseline'] * 1000:.2f} ms -> {row['seconds'] * 1000:.2f} ms ({row['ratio']:.2f}x)",
+              file=sys.stderr)
+    print(f"{len(comparison)} ölçüm karşılaştırıldı, {len(regressions)} gerileme", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m modules",
+                                     description="Gizli görsel paylaşımı - komut satırı arayüzü")
+    parser.add_argument("--trace", metavar="DOSYA", help="aşama aralıklarını JSON-lines olarak yaz")
+    parser.add_argument("--prometheus", metavar="DOSYA", help="aşama toplamlarını Prometheus metin biçiminde yaz")
+    parser.add_argument("--no-trace-memory", action="store_true", help="izlemede tracemalloc kullanma")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    share = commands.add_parser("share", help="görüntüyü paylara böl")
+    share.add_argument("image")
+    share.add_argument("-n", "--num-shares", type=int, default=3)
+    share.add_argument("-k", "--threshold", type=int, help="minimum parça sayısı (varsayılan n/2+1)")
+    share.add_argument("--scheme", choices=SCHEMES, default="gf256")
+    share.add_argument("-o", "--out", default="shares", help="pay klasörü (--store ile depo kökü)")
+    share.add_argument("--store", action="store_true", help="payları <out>/<kimlik>/ altına yazıp dizine ekle")
+    share.add_argument("--max-dimension", type=int, default=800, help="0 tam çözünürlük")
+    share.add_argument("--progressive", type=int, default=0, metavar="SEVİYE", help="ek piramit seviyesi")
+    share.add_argument("--images", action="store_true", help="pay görselleştirmelerini de yaz")
+    share.add_argument("--stream", action="store_true", help="tam çözünürlükte şerit şerit paylaştır")
+    share.add_argument("--workers", type=int, default=1)
+    _add_password_arguments(share)
+    share.set_defaults(func=cmd_share)
+
+    batch = commands.add_parser("batch", help="klasördeki tüm görüntüleri süreç havuzunda paylaştır")
+    batch.add_argument("source", help="klasör ya da glob deseni (ör. 'resimler/*.jpg')")
+    batch.add_argument("-n", "--num-shares", type=int, default=3)
+    batch.add_argument("-k", "--threshold", type=int, help="minimum parça sayısı (varsayılan n/2+1)")
+    batch.add_argument("--scheme", choices=SCHEMES, default="gf256")
+    batch.add_argument("-o", "--out", default="shares", help="depo kökü; paylar <out>/<kimlik>/ altına yazılır")
+    batch.add_argument("--max-dimension", type=int, default=800, help="0 tam çözünürlük")
+    batch.add_argument("--workers", type=int, default=0, help="süreç sayısı (0: işlemci sayısı)")
+    batch.add_argument("-r", "--recursive", action="store_true", help="alt klasörleri de tara")
+    batch.add_argument("--restart", action="store_true", help="bildirimi yok sayıp baştan başla")
+    _add_password_arguments(batch)
+    batch.set_defaults(func=cmd_batch)
+
+    for name, func, help_text in (("reconstruct", cmd_reconstruct, "paylardan görüntüyü geri yükle"),
+                                  ("verify", cmd_verify, "geri yüklemeyi piksel özetiyle doğrula")):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument("shares", nargs="+")
+        command.add_argument("-k", "--threshold", type=int, help="varsayılan: pay başlığındaki değer")
+        command.add_argument("--fast", action="store_true", help="fazla paylarla hata düzeltmeyi atla")
+        command.add_argument("--workers", type=int, default=1)
+        command.add_argument("--allow-legacy-pickle", action="store_true",
+                             help="eski pickle pay dosyalarını aç (yalnızca güvenilen dosyalar; kod çalıştırabilir)")
+        _add_password_arguments(command)
+        command.set_defaults(func=func)
+        if name == "reconstruct":
+            command.add_argument("-o", "--output", default="reconstructed_image.png")
+            command.add_argument("--stream", action="store_true", help="şerit şerit PNG'ye yaz")
+        else:
+            command.add_argument("--original", help="özet yoksa ya da farklıysa karşılaştırılacak görüntü")
+            command.add_argument("--max-dimension", type=int, default=800,
+                                 help="orijinalin paylaştırıldığı boyut (0 tam çözünürlük)")
+            command.add_argument("--metrics-dimension", type=int, default=256,
+                                 help="PSNR/SSIM ızgarası (0 tam çözünürlük)")
+
+    bench = commands.add_parser("bench", help="sentetik görüntülerle performans ölçümü")
+    bench.add_argument("--sizes", type=lambda text: _parse_pairs(text, "x"), default="256x256,800x600,1920x1080",
+                       help="GENİŞLİKxYÜKSEKLİK listesi")
+    bench.add_argument("--thresholds", type=lambda text: _parse_pairs(text, "/"), default="2/3,3/5",
+                       help="k/n listesi")
+    bench.add_argument("--schemes", default="gf256", help="virgülle ayrılmış şemalar")
+    bench.add_argument("--encryption", choices=("both", "on", "off"), default="both")
+    bench.add_argument("--repeat", type=int, default=3)
+    bench.add_argument("--workers", type=int, default=1)
+    bench.add_argument("-o", "--output", help="sonuçların yazılacağı JSON dosyası")
+    bench.add_argument("--baseline", help="karşılaştırılacak önceki JSON sonuçları")
+    bench.add_argument("--tolerance", type=float, default=0.10, help="izin verilen yavaşlama oranı")
+    bench.set_defaults(func=cmd_bench)
+
+    inspect = commands.add_parser("inspect", help="pay dosyalarının meta verisini yükü okumadan yaz")
+    inspect.add_argument("files", nargs="+")
+    inspect.set_defaults(func=cmd_inspect)
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.trace or args.prometheus:
+        if args.trace:
+            open(args.trace, "w").close()
+        TraceService.enable(memory=not args.no_trace_memory, trace_file=args.trace)
+    try:
+        return args.func(args)
+    except (OSError, ValueError) as e:
+        print(f"Hata: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if args.prometheus:
+            with open(args.prometheus, "w", encoding="utf-8") as f:
+                f.write(TraceService.prometheus_text())
+        TraceService.disable()
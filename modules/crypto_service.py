@@ -6,15 +6,150 @@ AES şifreleme, HMAC doğrulama ve anahtar türetme işlemlerini yönetir
 from cryptography.hazmat.primitives import hashes, hmac
 from cryptography.hazmat.backends import default_backend
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM, ChaCha20Poly1305
 from cryptography.hazmat.primitives import padding
+from collections import OrderedDict
+import hashlib
+import io
 import os
 import pickle
+import struct
+import threading
+import time
+from .trace_service import TraceService, traced
+
+# Toplu anahtarla şifrelenmiş pay zarfı: magic, sürüm, PBKDF2 tur sayısı, salt, pay indeksi
+ENCRYPTED_MAGIC = b"SISE"
+# Sürüm 1: AES-CBC + HMAC-SHA256, sürüm 2: parçalı AEAD akışı
+ENCRYPTED_VERSION = 1
+AEAD_VERSION = 2
+PBKDF2_ITERATIONS = 100000
+_ENVELOPE = struct.Struct("<4sBI16sI")
+# Sürüm 2 eki: şifre algoritması, parça boyutu, 7 baytlık nonce öneki
+_AEAD_PARAMS = struct.Struct("<BI7s")
+
+AEAD_CIPHERS = {"aes-gcm": (1, AESGCM), "chacha20-poly1305": (2, ChaCha20Poly1305)}
+AEAD_CIPHER_IDS = {cipher_id: cls for cipher_id, cls in AEAD_CIPHERS.values()}
+AEAD_CIPHER_NAMES = {cipher_id: name for name, (cipher_id, _) in AEAD_CIPHERS.items()}
+# Zarf başlığını çözmek için dosyanın başından okunması yeterli bayt sayısı
+ENVELOPE_PROBE_SIZE = _ENVELOPE.size + _AEAD_PARAMS.size
+AEAD_TAG_SIZE = 16
+DEFAULT_AEAD_CHUNK = 1024 * 1024
+
+
+def _aead_nonce(prefix: bytes, counter: int, last: bool) -> bytes:
+    """STREAM yapısı: önek + parça sayacı + son parça bayrağı (kesilmiş dosyalar reddedilir)"""
+    return prefix + struct.pack(">IB", counter, 1 if last else 0)
+
+
+def _rechunk(buffers, chunk_size: int):
+    """Tampon dizisini (son_mu, parça) olarak sabit boyutlu parçalara böl
+
+    Parça tek bir tamponun içindeyse kopyalanmadan memoryview olarak verilir.
+    """
+    pending = None
+    carry = bytearray()
+    for buffer in buffers:
+        view = memoryview(buffer).cast("B")
+        while len(view):
+            if carry or len(view) < chunk_size:
+                take = min(chunk_size - len(carry), len(view))
+                carry += view[:take]
+                view = view[take:]
+                if len(carry) < chunk_size:
+                    continue
+                chunk, carry = bytes(carry), bytearray()
+            else:
+                chunk, view = view[:chunk_size], view[chunk_size:]
+            if pending is not None:
+                yield False, pending
+            pending = chunk
+    if carry or pending is None:
+        if pending is not None:
+            yield False, pending
+        pending = bytes(carry)
+    yield True, pending
+
+
+class KeyCache:
+    """(salt, parola özeti) ile anahtarlanan, boyut sınırlı ve süre dolunca silen anahtar önbelleği"""
+
+    def __init__(self, max_entries: int = 32, ttl: float = 300.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        # Türetilmekte olan anahtarlar: aynı anahtarı isteyen diğer iş parçacıkları bu kilidi bekler
+        self._flights = {}
+
+    @staticmethod
+    def make_key(password: str, salt: bytes, iterations: int):
+        """Önbellek anahtarı; parolanın kendisi değil SHA-256 özeti tutulur"""
+        return bytes(salt), iterations, hashlib.sha256(password.encode()).digest()
+
+    def get(self, key):
+        """Süresi dolmamış anahtarı döndür, yoksa None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        """Anahtarı ekle; sınır aşılırsa en eski kayıtları sil"""
+        with self._lock:
+            now = time.monotonic()
+            self._entries[key] = (value, now + self.ttl)
+            self._entries.move_to_end(key)
+            for stale in [k for k, (_, expires) in self._entries.items() if expires < now]:
+                del self._entries[stale]
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_create(self, key, factory):
+        """Anahtarı döndür; yoksa factory() ile üretip ekle
+
+        Aynı anahtarı eşzamanlı isteyenlerden yalnızca ilki factory'yi çalıştırır, diğerleri
+        onun sonucunu bekler (eşzamanlı pay yüklemelerinde PBKDF2 küme başına bir kez çalışır).
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+        with self._lock:
+            flight = self._flights.setdefault(key, threading.Lock())
+        try:
+            with flight:
+                value = self.get(key)
+                if value is None:
+                    value = factory()
+                    self.put(key, value)
+        finally:
+            with self._lock:
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+        return value
+
+    def clear(self):
+        """Önbelleği temizle"""
+        with self._lock:
+            self._entries.clear()
+
 
 class CryptoService:
     """Kriptografi işlemlerini yöneten servis sınıfı"""
+
+    # Oturum boyunca türetilmiş ana anahtarlar
+    key_cache = KeyCache()
     
     @staticmethod
+    @traced("crypto.kdf_legacy")
     def derive_keys(password: str, salt: bytes):
         """PBKDF2 ile anahtar türetme"""
         kdf = PBKDF2HMAC(
@@ -91,23 +226,198 @@ class CryptoService:
             return True  # Eğer parola dosyası yoksa, varsayılan olarak doğru kabul et
 
     @staticmethod
-    def encrypt_share_data(share_data: dict, password: str) -> bytes:
-        """Pay verisini şifrele"""
+    @traced("crypto.kdf")
+    def derive_master_key(password: str, salt: bytes, iterations: int = PBKDF2_ITERATIONS) -> bytes:
+        """PBKDF2 ile ana anahtarı türet; aynı (salt, parola) için önbellekten döner"""
+        def derive():
+            kdf = PBKDF2HMAC(
+                algorithm=hashes.SHA256(),
+                length=32,
+                salt=salt,
+                iterations=iterations,
+                backend=default_backend()
+            )
+            return kdf.derive(password.encode())
+
+        return CryptoService.key_cache.get_or_create(KeyCache.make_key(password, salt, iterations), derive)
+
+    @staticmethod
+    def create_key_batch(password: str, iterations: int = PBKDF2_ITERATIONS) -> dict:
+        """Bir pay kümesi için tek salt ve tek PBKDF2 çalıştırması ile toplu anahtar oluştur"""
         salt = os.urandom(16)
-        aes_key, hmac_key = CryptoService.derive_keys(password, salt)
-        
-        raw = pickle.dumps(share_data)
+        return {
+            "salt": salt,
+            "iterations": iterations,
+            "master_key": CryptoService.derive_master_key(password, salt, iterations)
+        }
+
+    @staticmethod
+    def derive_share_keys(master_key: bytes, share_index: int):
+        """Ana anahtardan HKDF ile paya özel AES ve HMAC anahtarlarını türet"""
+        hkdf = HKDF(
+            algorithm=hashes.SHA256(),
+            length=32 * 2,
+            salt=None,
+            info=b"SIS share key" + struct.pack("<I", share_index),
+            backend=default_backend()
+        )
+        key = hkdf.derive(master_key)
+        return key[:32], key[32:]
+
+    @staticmethod
+    @traced("crypto.encrypt")
+    def encrypt_payload(raw: bytes, password: str, key_batch: dict = None, share_index: int = 0) -> bytes:
+        """Ham bayt verisini parola ile şifrele
+
+        key_batch verilirse pay kümesinin ortak salt'ı ve ana anahtarı kullanılır, her pay için
+        yalnızca HKDF çalışır. Çıktı: zarf başlığı + iv + şifreli metin + HMAC.
+        """
+        if key_batch is None:
+            key_batch = CryptoService.create_key_batch(password)
+        aes_key, hmac_key = CryptoService.derive_share_keys(key_batch["master_key"], share_index)
+
+        header = _ENVELOPE.pack(ENCRYPTED_MAGIC, ENCRYPTED_VERSION, key_batch["iterations"],
+                                key_batch["salt"], share_index)
         encrypted = CryptoService.encrypt_and_authenticate(raw, aes_key, hmac_key)
         
-        return salt + encrypted
+        return header + encrypted
 
     @staticmethod
-    def decrypt_share_data(encrypted_data: bytes, password: str) -> dict:
-        """Şifrelenmiş pay verisini çöz"""
+    @traced("crypto.decrypt")
+    def decrypt_payload(encrypted_data: bytes, password: str) -> bytes:
+        """encrypt_payload ile (veya eski salt + iv + ... formatında) şifrelenmiş veriyi çöz"""
+        if bytes(encrypted_data[:len(ENCRYPTED_MAGIC)]) == ENCRYPTED_MAGIC:
+            magic, version, iterations, salt, share_index = _ENVELOPE.unpack_from(encrypted_data, 0)
+            if version == AEAD_VERSION:
+                return CryptoService.decrypt_stream(io.BytesIO(encrypted_data), password, len(encrypted_data))
+            if version > ENCRYPTED_VERSION:
+                raise ValueError(f"Desteklenmeyen şifreleme sürümü: {version}")
+            master_key = CryptoService.derive_master_key(password, salt, iterations)
+            aes_key, hmac_key = CryptoService.derive_share_keys(master_key, share_index)
+            return CryptoService.decrypt_and_verify(encrypted_data[_ENVELOPE.size:], aes_key, hmac_key)
+
+        # Eski format: pay başına ayrı salt ve PBKDF2
         salt = encrypted_data[:16]
         encrypted = encrypted_data[16:]
         
         aes_key, hmac_key = CryptoService.derive_keys(password, salt)
-        raw = CryptoService.decrypt_and_verify(encrypted, aes_key, hmac_key)
-        
-        return pickle.loads(raw) 
\ No newline at end of file
+        return CryptoService.decrypt_and_verify(encrypted, aes_key, hmac_key)
+
+    @staticmethod
+    def parse_envelope(data) -> dict:
+        """Şifreli pay zarfının başlığını (KDF parametreleri, salt, şifre algoritması) çözümle
+
+        data dosyanın ilk ENVELOPE_PROBE_SIZE baytı olabilir; şifreli metne dokunulmaz.
+        """
+        if len(data) < _ENVELOPE.size or bytes(data[:len(ENCRYPTED_MAGIC)]) != ENCRYPTED_MAGIC:
+            raise ValueError("Geçersiz dosya formatı")
+        magic, version, iterations, salt, share_index = _ENVELOPE.unpack_from(data, 0)
+        envelope = {
+            "version": version,
+            "kdf": "pbkdf2-sha256",
+            "iterations": iterations,
+            "salt": salt,
+            "share_index": share_index,
+        }
+        if version == ENCRYPTED_VERSION:
+            envelope.update(cipher="aes-256-cbc-hmac-sha256", header_size=_ENVELOPE.size)
+        elif version == AEAD_VERSION:
+            if len(data) < ENVELOPE_PROBE_SIZE:
+                raise ValueError("Geçersiz dosya formatı")
+            cipher_id, chunk_size, prefix = _AEAD_PARAMS.unpack_from(data, _ENVELOPE.size)
+            if cipher_id not in AEAD_CIPHER_IDS or chunk_size <= 0:
+                raise ValueError("Desteklenmeyen şifreleme parametreleri")
+            envelope.update(cipher=AEAD_CIPHER_NAMES[cipher_id], chunk_size=chunk_size,
+                            nonce_prefix=prefix, header_size=ENVELOPE_PROBE_SIZE)
+        else:
+            raise ValueError(f"Desteklenmeyen şifreleme sürümü: {version}")
+        return envelope
+
+    @staticmethod
+    def derive_aead_key(master_key: bytes, share_index: int) -> bytes:
+        """Ana anahtardan HKDF ile paya özel AEAD anahtarını türet"""
+        hkdf = HKDF(
+            algorithm=hashes.SHA256(),
+            length=32,
+            salt=None,
+            info=b"SIS share aead" + struct.pack("<I", share_index),
+            backend=default_backend()
+        )
+        return hkdf.derive(master_key)
+
+    @staticmethod
+    @traced("crypto.encrypt_stream")
+    def encrypt_stream(buffers, out_file, password: str, key_batch: dict = None, share_index: int = 0,
+                       cipher: str = "aes-gcm", chunk_size: int = DEFAULT_AEAD_CHUNK) -> int:
+        """Tamponları sabit boyutlu, ayrı ayrı doğrulanan AEAD parçaları halinde dosyaya yaz
+
+        Tek geçişte şifreleme ve doğrulama yapılır; bellekte en fazla bir parça tutulur.
+        Zarf başlığı her parçanın ek doğrulanmış verisidir (AAD). Yazılan bayt sayısını döndürür.
+        """
+        if key_batch is None:
+            key_batch = CryptoService.create_key_batch(password)
+        cipher_id, aead_class = AEAD_CIPHERS[cipher]
+        aead = aead_class(CryptoService.derive_aead_key(key_batch["master_key"], share_index))
+        prefix = os.urandom(7)
+
+        header = (_ENVELOPE.pack(ENCRYPTED_MAGIC, AEAD_VERSION, key_batch["iterations"],
+                                 key_batch["salt"], share_index)
+                  + _AEAD_PARAMS.pack(cipher_id, chunk_size, prefix))
+        out_file.write(header)
+        written = len(header)
+
+        for counter, (last, chunk) in enumerate(_rechunk(buffers, chunk_size)):
+            sealed = aead.encrypt(_aead_nonce(prefix, counter, last), chunk, header)
+            out_file.write(sealed)
+            written += len(sealed)
+        return written
+
+    @staticmethod
+    @traced("crypto.decrypt_stream")
+    def decrypt_stream(in_file, password: str, total_size: int = None) -> bytearray:
+        """encrypt_stream çıktısını parça parça çözüp önceden ayrılmış tek tampona yaz"""
+        if total_size is None:
+            position = in_file.tell()
+            total_size = in_file.seek(0, os.SEEK_END) - position
+            in_file.seek(position)
+
+        header = in_file.read(ENVELOPE_PROBE_SIZE)
+        envelope = CryptoService.parse_envelope(header)
+        if envelope["version"] != AEAD_VERSION:
+            raise ValueError("Geçersiz dosya formatı")
+        chunk_size, prefix = envelope["chunk_size"], envelope["nonce_prefix"]
+
+        master_key = CryptoService.derive_master_key(password, envelope["salt"], envelope["iterations"])
+        aead = AEAD_CIPHERS[envelope["cipher"]][1](
+            CryptoService.derive_aead_key(master_key, envelope["share_index"]))
+
+        body_size = total_size - len(header)
+        sealed_size = chunk_size + AEAD_TAG_SIZE
+        chunk_count = max(1, -(-body_size // sealed_size))
+        plain_size = body_size - chunk_count * AEAD_TAG_SIZE
+        if plain_size < 0:
+            raise ValueError("Şifreli veri eksik")
+
+        plaintext = bytearray(plain_size)
+        offset = 0
+        for counter in range(chunk_count):
+            last = counter == chunk_count - 1
+            sealed = in_file.read(sealed_size if not last else body_size - counter * sealed_size)
+            chunk = aead.decrypt(_aead_nonce(prefix, counter, last), sealed, header)
+            plaintext[offset:offset + len(chunk)] = chunk
+            offset += len(chunk)
+        return plaintext
+
+    @staticmethod
+    def encrypt_share_data(share_data: dict, password: str) -> bytes:
+        """Pay verisini şifrele"""
+        with TraceService.span("crypto.pickle"):
+            raw = pickle.dumps(share_data)
+        return CryptoService.encrypt_payload(raw, password)
+
+    @staticmethod
+    def decrypt_share_data(encrypted_data: bytes, password: str) -> dict:
+        """Şifrelenmiş pay verisini çöz"""
+        raw = CryptoService.decrypt_payload(encrypted_data, password)
+        with TraceService.span("crypto.unpickle"):
+            return pickle.loads(raw) 
\ No newline at end of file
@@ -6,9 +6,121 @@ Pay dosyalarının kaydedilmesi, yüklenmesi ve yönetimi
 import os
 import pickle
 import glob
+import struct
+import zlib
+import tempfile
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import cv2
+import numpy as np
 from PIL import Image
-from .crypto_service import CryptoService
+from .crypto_service import CryptoService, ENCRYPTED_MAGIC, ENVELOPE_PROBE_SIZE
+from .share_format import ShareFormat, SHARE_MAGIC
+from .trace_service import TraceService, traced
+
+# Eski (magic içermeyen) şifreli format: salt + iv + en az bir AES bloğu + HMAC
+_LEGACY_ENCRYPTED_MIN_SIZE = 16 + 16 + 16 + 32
+
+
+class ShareStreamWriter:
+    """n pay dosyasına şerit şerit ekleme yapan yazıcı
+
+    Her dosya parça tablosunda her şerit için bir girdi bulunan ikili pay kabıdır;
+    başlık baştan yazılır, şeritler geldikçe yük alanına eklenir.
+    """
+
+    def __init__(self, header: dict, num_shares: int, directory: str = "shares"):
+        os.makedirs(directory, exist_ok=True)
+        self.paths = [os.path.join(directory, f"share_{idx+1}.bin") for idx in range(num_shares)]
+        chunks = ShareFormat.row_chunks(header["original_shape"], header.get("strip_rows"))
+        self._digest_offset = None
+        if header.get("pixel_digest") is not None:
+            self._digest_offset = ShareFormat.digest_offset(len(header["original_shape"]))
+        self._files = []
+        try:
+            for idx, path in enumerate(self.paths):
+                share_file = open(path, "wb")
+                self._files.append(share_file)
+                share_file.write(ShareFormat.pack_header({**header, "share_x": idx + 1}, chunks))
+        except Exception:
+            self.close()
+            raise
+
+    def write_strip(self, shares: np.ndarray):
+        """(n, şerit_bayt) boyutlu pay şeridini her dosyanın sonuna ekle"""
+        for share_file, share in zip(self._files, shares):
+            share_file.write(memoryview(np.ascontiguousarray(share)))
+
+    def set_pixel_digest(self, digest: bytes):
+        """Başlıkta yer ayrılmış piksel özetini (header["pixel_digest"] verildiyse) yerine yaz"""
+        if self._digest_offset is None:
+            raise ValueError("Başlıkta piksel özeti için yer ayrılmadı")
+        for share_file in self._files:
+            position = share_file.tell()
+            share_file.seek(self._digest_offset)
+            share_file.write(digest)
+            share_file.seek(position)
+
+    def close(self):
+        """Dosyaları kapat"""
+        for share_file in self._files:
+            share_file.close()
+        self._files = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class PngStreamWriter:
+    """Satırları geldikçe sıkıştırıp açık bir ikili dosyaya yazan akış tabanlı PNG kodlayıcı
+
+    Dosyayı açmak ve kapatmak çağırana aittir (ör. FileService.atomic_open).
+    """
+
+    def __init__(self, out_file, width: int, height: int, channels: int = 3):
+        color_type = {1: 0, 3: 2, 4: 6}[channels]
+        self._row_bytes = width * channels
+        self._file = out_file
+        self._finished = False
+        self._file.write(b"\x89PNG\r\n\x1a\n")
+        self._write_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, color_type, 0, 0, 0))
+        self._compressor = zlib.compressobj(6)
+
+    def _write_chunk(self, chunk_type: bytes, data: bytes):
+        self._file.write(struct.pack(">I", len(data)))
+        self._file.write(chunk_type)
+        self._file.write(data)
+        self._file.write(struct.pack(">I", zlib.crc32(data, zlib.crc32(chunk_type)) & 0xFFFFFFFF))
+
+    def write_rows(self, rows: np.ndarray):
+        """RGB(A)/gri satırları ekle"""
+        rows = rows.reshape(rows.shape[0], self._row_bytes)
+        # Her satırın başında filtre türü baytı (0 = filtre yok)
+        filtered = np.zeros((rows.shape[0], self._row_bytes + 1), dtype=np.uint8)
+        filtered[:, 1:] = rows
+        data = self._compressor.compress(memoryview(filtered).cast("B"))
+        if data:
+            self._write_chunk(b"IDAT", data)
+
+    def close(self):
+        """Kalan veriyi boşalt ve PNG'yi sonlandır"""
+        if self._finished:
+            return
+        self._write_chunk(b"IDAT", self._compressor.flush())
+        self._write_chunk(b"IEND", b"")
+        self._finished = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # Hata durumunda yarım görüntü sonlandırılmaz; atomic_open geçici dosyayı siler
+        if exc_type is None:
+            self.close()
+
 
 class FileService:
     """Dosya işlemlerini yöneten servis sınıfı"""
@@ -19,41 +131,125 @@ class FileService:
         os.makedirs("shares", exist_ok=True)
 
     @staticmethod
+    @contextmanager
+    def atomic_open(file_path: str):
+        """Aynı klasörde geçici dosyaya yaz, başarıyla kapanınca os.replace ile yerine koy
+
+        Yazma yarıda kalırsa hedef dosya hiç oluşmaz (veya eski hali korunur).
+        """
+        directory = os.path.dirname(file_path) or "."
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=os.path.basename(file_path) + ".",
+                                         suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                yield f
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, file_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    @staticmethod
+    @traced("file.save_share")
     def save_share_data(share_idx: int, share_data: list, original_shape: tuple, 
-                       password_required: bool, password: str = None):
-        """Pay verisini dosyaya kaydet"""
-        FileService.ensure_shares_directory()
-        
-        # Veriyi hazırla
-        wrapped = {
+                       password_required: bool, password: str = None,
+                       threshold: int = None, scheme: str = "secretsharing", num_shares: int = None,
+                       key_batch: dict = None, directory: str = "shares", pixel_digest: bytes = None):
+        """Pay verisini dosyaya kaydet
+
+        key_batch (CryptoService.create_key_batch) verilirse tüm pay kümesi tek bir PBKDF2
+        türetmesini paylaşır. pixel_digest (ShareFormat.pixel_digest) başlığa yazılır ve geri
+        yüklemenin birebir doğruluğu tek bir özet karşılaştırmasıyla kontrol edilir.
+        """
+        os.makedirs(directory, exist_ok=True)
+        file_path = os.path.join(directory, f"share_{share_idx+1}.bin")
+
+        # Tüm şemalar ikili pay kabına yazılır; SecretSharer string payları ASCII yük olarak saklanır
+        meta = {
             "original_shape": original_shape,
-            "share_data": share_data,
-            "password_required": password_required
+            "scheme": scheme,
+            "dtype": "ascii" if scheme == "secretsharing" else "uint8",
+            "share_x": share_idx + 1,
+            "threshold": threshold,
+            "num_shares": num_shares or threshold,
+            "pixel_digest": pixel_digest
         }
         
         if password_required and password:
-            # Şifrelenmiş pay
-            final_data = CryptoService.encrypt_share_data(wrapped, password)
+            # Şifrelenmiş pay: kab parça parça AEAD ile şifrelenip doğrudan dosyaya yazılır
+            with FileService.atomic_open(file_path) as f:
+                CryptoService.encrypt_stream(ShareFormat.iter_buffers(meta, share_data), f, password,
+                                             key_batch, share_idx + 1)
         else:
-            # Şifrelenmemiş pay
-            final_data = pickle.dumps(wrapped)
-        
-        # Dosyaya kaydet
-        file_path = f"shares/share_{share_idx+1}.bin"
-        with open(file_path, "wb") as f:
-            f.write(final_data)
+            # Şifrelenmemiş pay: başlık ve ham baytlar kopyalanmadan yazılır
+            with FileService.atomic_open(file_path) as f:
+                ShareFormat.write(f, meta, share_data)
         
         return file_path
 
     @staticmethod
-    def save_share_image(share_idx: int, share_image):
+    @traced("file.save_image")
+    def save_share_image(share_idx: int, share_image, directory: str = "shares"):
         """Pay görselleştirmesini PNG olarak kaydet"""
-        FileService.ensure_shares_directory()
-        file_path = f"shares/share_{share_idx+1}.png"
-        cv2.imwrite(file_path, share_image)
+        os.makedirs(directory, exist_ok=True)
+        file_path = os.path.join(directory, f"share_{share_idx+1}.png")
+        ok, encoded = cv2.imencode(".png", share_image)
+        if not ok:
+            raise ValueError("Pay görselleştirmesi PNG olarak kodlanamadı")
+        with FileService.atomic_open(file_path) as f:
+            f.write(memoryview(encoded).cast("B"))
         return file_path
 
     @staticmethod
+    @traced("file.save_batch")
+    def save_share_batch(share_data_list: list, share_images: list, original_shape: tuple,
+                         password_required: bool, password: str = None, threshold: int = None,
+                         scheme: str = "secretsharing", num_shares: int = None, key_batch: dict = None,
+                         workers: int = None, progress=None, directory: str = "shares",
+                         pixel_digest: bytes = None):
+        """Tüm payların .bin ve .png dosyalarını iş parçacığı havuzunda eşzamanlı ve atomik yaz
+
+        Şifreleme, PNG kodlama ve dosya G/Ç'si GIL'i bıraktığından toplam süre en yavaş tek
+        paya yaklaşır. progress(tamamlanan, toplam) her dosya bittiğinde çağıran iş
+        parçacığında çağrılır. Pay dosyalarının yollarını pay sırasıyla döndürür.
+        """
+        os.makedirs(directory, exist_ok=True)
+        num_shares = num_shares or len(share_data_list)
+        if password_required and password and key_batch is None:
+            key_batch = CryptoService.create_key_batch(password)
+
+        share_images = share_images or []
+        total = len(share_data_list) + len(share_images)
+        workers = workers or min(total, os.cpu_count() or 1) or 1
+        paths = [None] * len(share_data_list)
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {}
+            for share_idx, share_data in enumerate(share_data_list):
+                future = executor.submit(TraceService.wrap(FileService.save_share_data), share_idx, share_data,
+                                         original_shape, password_required, password, threshold,
+                                         scheme, num_shares, key_batch, directory, pixel_digest)
+                futures[future] = share_idx
+            for share_idx, share_image in enumerate(share_images):
+                futures[executor.submit(TraceService.wrap(FileService.save_share_image), share_idx, share_image,
+                                        directory)] = None
+            try:
+                for done, future in enumerate(as_completed(futures), 1):
+                    path = future.result()
+                    if futures[future] is not None:
+                        paths[futures[future]] = path
+                    if progress is not None:
+                        progress(done, total)
+            except Exception:
+                for future in futures:
+                    future.cancel()
+                raise
+        return paths
+
+    @staticmethod
+    @traced("file.save_reconstructed")
     def save_reconstructed_image(image, file_path: str = "reconstructed_image.jpg"):
         """Geri yüklenen görüntüyü kaydet"""
         if len(image.shape) == 3:
@@ -67,48 +263,177 @@ class FileService:
         return file_path
 
     @staticmethod
-    def load_share_file(file_path: str, password: str = None):
-        """Pay dosyasını yükle ve çöz"""
+    def detect_format(prefix: bytes, file_size: int = None) -> str:
+        """Dosyanın ilk baytlarından formatı belirle; yük ayrıştırılmaz
+
+        "container": şifrelenmemiş pay kabı, "encrypted": şifreli pay zarfı,
+        "legacy_pickle": eski şifrelenmemiş pickle dosyası,
+        "legacy_encrypted": eski salt + iv + şifreli metin + HMAC dosyası.
+        """
+        prefix = bytes(prefix[:4])
+        if prefix == SHARE_MAGIC:
+            return "container"
+        if prefix == ENCRYPTED_MAGIC:
+            return "encrypted"
+        # pickle protokol 2-5 işaretçisi: 0x80 ve protokol numarası
+        if len(prefix) >= 2 and prefix[0] == 0x80 and 2 <= prefix[1] <= 5:
+            return "legacy_pickle"
+        if file_size is None or file_size >= _LEGACY_ENCRYPTED_MIN_SIZE:
+            return "legacy_encrypted"
+        raise ValueError("Geçersiz dosya formatı")
+
+    @staticmethod
+    def inspect_share(file_path: str) -> dict:
+        """Yükü okumadan pay dosyasının meta verisini döndür
+
+        Şifrelenmemiş kaplarda başlık (şema, x, k, n, boyut, parça tablosu), şifreli zarflarda
+        KDF parametreleri, salt ve şifre algoritması döner; iç başlık parola olmadan okunamaz.
+        """
+        with open(file_path, "rb") as f:
+            file_size = os.fstat(f.fileno()).st_size
+            probe = f.read(max(ShareFormat.PREFIX_SIZE, ENVELOPE_PROBE_SIZE))
+            kind = FileService.detect_format(probe, file_size)
+            if kind == "container":
+                f.seek(0)
+                info = ShareFormat.read_header(f)
+            elif kind == "encrypted":
+                info = CryptoService.parse_envelope(probe)
+            else:
+                info = {}
+        info.update(path=file_path, format=kind, file_size=file_size,
+                    encrypted=kind in ("encrypted", "legacy_encrypted"))
+        return info
+
+    @staticmethod
+    @traced("file.load_share")
+    def load_share_file(file_path: str, password: str = None, allow_legacy_pickle: bool = False):
+        """Pay dosyasını yükle ve çöz; format ilk baytlardaki magic değerinden belirlenir
+
+        Eski şifrelenmemiş pickle dosyaları doğrulanmamış içerik çalıştırabileceğinden
+        yalnızca allow_legacy_pickle=True ile (güvenilen dosyalar için) açılır.
+        """
         with open(file_path, "rb") as f:
             content = f.read()
-        
-        # Dosya formatını kontrol et (şifrelenmiş mi değil mi)
-        try:
-            # Önce şifrelenmemiş olarak dene
-            wrapped_share = pickle.loads(content)
-            if "password_required" in wrapped_share:
-                password_required = wrapped_share["password_required"]
-                if password_required and not password:
+        kind = FileService.detect_format(content, len(content))
+
+        # İkili pay kabı: yük np.frombuffer ile kopyasız görünüm olarak döner
+        if kind == "container":
+            wrapped_share = ShareFormat.loads(content)
+            wrapped_share["password_required"] = False
+            return wrapped_share, False
+
+        if kind == "legacy_pickle" and not allow_legacy_pickle and not password:
+            raise ValueError("Eski (pickle) pay dosyaları güvenli değildir ve varsayılan olarak açılmaz; "
+                             "dosya şifreliyse parola girin")
+
+        if kind == "legacy_pickle" and allow_legacy_pickle:
+            # Eski sürümlerin şifrelenmemiş pickle dosyaları (yalnızca açıkça izin verilirse);
+            # rastgele salt'ı pickle işaretçisiyle başlayan eski şifreli dosyalar aşağıda çözülür
+            try:
+                wrapped_share = pickle.loads(content)
+            except Exception:
+                wrapped_share = None
+            if isinstance(wrapped_share, dict):
+                if wrapped_share.get("password_required") and not password:
                     raise ValueError("Bu dosya şifrelenmiş! Parola gerekli.")
-                return wrapped_share, password_required
+                return wrapped_share, bool(wrapped_share.get("password_required"))
+
+        if not password:
+            raise ValueError("Bu dosya şifrelenmiş! Parola gerekli.")
+
+        try:
+            raw = CryptoService.decrypt_payload(content, password)
+        except Exception as e:
+            raise ValueError(f"Şifre çözme hatası: {str(e)}")
+
+        try:
+            if ShareFormat.is_share_container(raw):
+                wrapped_share = ShareFormat.loads(raw)
             else:
-                # Eski format - şifrelenmiş kabul et
-                raise ValueError("Eski format dosya")
-        except (pickle.UnpicklingError, ValueError):
-            # Şifrelenmiş dosya
-            if len(content) < 16:
-                raise ValueError("Geçersiz dosya formatı")
-            
-            if not password:
-                raise ValueError("Bu dosya şifrelenmiş! Parola gerekli.")
-            
+                # HMAC ile doğrulanmış eski format içeriği
+                wrapped_share = pickle.loads(raw)
+            wrapped_share["password_required"] = True
+            return wrapped_share, True
+        except Exception as e:
+            raise ValueError(f"Şifre çözme hatası: {str(e)}")
+
+    @staticmethod
+    @traced("file.load_batch")
+    def load_share_files(file_paths: list, password: str = None, workers: int = None, progress=None,
+                         allow_legacy_pickle: bool = False):
+        """Pay dosyalarını iş parçacığı havuzunda eşzamanlı okuyup doğrula ve çöz
+
+        Dosya G/Ç'si ve şifre çözme GIL'i bıraktığından yüklemeler örtüşür; ortak salt'lı kümede
+        PBKDF2 bir kez çalışır, diğer iş parçacıkları anahtar önbelleğinde bekler.
+        progress(tamamlanan, toplam) her dosya bittiğinde çağıran iş parçacığında çağrılır.
+        Paylar x koordinatına (pay sırasına) göre sıralanmış olarak döner:
+        (sarılı pay listesi, şifreli mi).
+        """
+        file_paths = list(file_paths)
+        if not file_paths:
+            return [], False
+        workers = workers or min(len(file_paths), os.cpu_count() or 1)
+
+        results = [None] * len(file_paths)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(TraceService.wrap(FileService.load_share_file), path, password,
+                                allow_legacy_pickle): idx
+                for idx, path in enumerate(file_paths)
+            }
             try:
-                wrapped_share = CryptoService.decrypt_share_data(content, password)
-                return wrapped_share, True
-            except Exception as e:
-                raise ValueError(f"Şifre çözme hatası: {str(e)}")
+                for done, future in enumerate(as_completed(futures), 1):
+                    results[futures[future]] = future.result()
+                    if progress is not None:
+                        progress(done, len(file_paths))
+            except Exception:
+                for future in futures:
+                    future.cancel()
+                raise
+
+        order = sorted(range(len(results)),
+                       key=lambda idx: (results[idx][0].get("share_x", 0), idx))
+        wrapped_shares = [results[idx][0] for idx in order]
+        password_required = any(encrypted for _, encrypted in results)
+        return wrapped_shares, password_required
+
+    @staticmethod
+    def open_share_stream(file_path: str):
+        """Pay kabını aç; (başlık, pay baytlarının başında konumlanmış dosya) döndür"""
+        share_file = open(file_path, "rb")
+        try:
+            header = ShareFormat.read_header(share_file)
+        except Exception:
+            share_file.close()
+            raise
+        return header, share_file
 
     @staticmethod
-    def get_share_files():
-        """Mevcut pay dosyalarını listele"""
-        FileService.ensure_shares_directory()
-        return glob.glob("shares/share_*.bin")
+    def map_share_file(file_path: str):
+        """Şifrelenmemiş pay kabını belleğe eşle; share_data salt okunur np.memmap olur
+
+        Yalnızca erişilen sayfalar diskten okunur, dosyanın tamamı belleğe alınmaz.
+        """
+        with open(file_path, "rb") as f:
+            header = ShareFormat.read_header(f)
+        wrapped = dict(header)
+        wrapped["sections"] = {
+            section: np.memmap(file_path, dtype=np.uint8, mode="r", offset=offset, shape=(length,))
+            for section, (offset, length) in ShareFormat.section_spans(header).items()
+        }
+        wrapped["share_data"] = wrapped["sections"][0]
+        wrapped["password_required"] = False
+        return wrapped
 
     @staticmethod
-    def get_share_image_files():
-        """Mevcut pay görselleştirme dosyalarını listele"""
-        FileService.ensure_shares_directory()
-        return glob.glob("shares/share_*.png")
+    def map_share_rows(file_path: str, row_start: int, row_stop: int):
+        """Pay kabında yalnızca [row_start, row_stop) satırlarını (satır, genişlik, kanal) olarak eşle"""
+        with open(file_path, "rb") as f:
+            header = ShareFormat.read_header(f)
+        offset, length = ShareFormat.row_span(header, row_start, row_stop)
+        shape = (row_stop - row_start,) + tuple(header["original_shape"][1:])
+        rows = np.memmap(file_path, dtype=np.uint8, mode="r", offset=offset, shape=shape)
+        return header, rows
 
     @staticmethod
     def backup_file(file_path: str):
@@ -149,6 +474,7 @@ class FileService:
         """Geçici dosyaları temizle"""
         temp_patterns = [
             "shares/*.backup",
+            "shares/*.tmp",
             "*.tmp",
             "temp_*"
         ]
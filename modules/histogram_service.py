@@ -0,0 +1,102 @@
+"""
+Histogram Servisi
+Görüntü histogramlarının tek geçişte hesaplanması ve önbelleklenmesi
+"""
+
+from collections import OrderedDict
+import threading
+import weakref
+import cv2
+import numpy as np
+
+# BGR kanallarını tek bincount'ta ayırmak için kanal başına 256 kutu ofseti
+_CHANNEL_OFFSETS = np.array([0, 256, 512], dtype=np.uint16)
+
+
+class HistogramCache:
+    """(görüntü kimliği, sürüm) ile anahtarlanan, boyut sınırlı histogram önbelleği
+
+    Kayıt görüntüye zayıf referans tutar; görüntü silinirse ya da aynı id() başka bir
+    diziye verilirse kayıt geçersiz sayılır.
+    """
+
+    def __init__(self, max_entries: int = 64):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, image: np.ndarray, version: int = 0):
+        """Görüntünün bu sürümü için önbellekteki histogramı döndür, yoksa None"""
+        with self._lock:
+            entry = self._entries.get(id(image))
+            if entry is None:
+                return None
+            ref, entry_version, value = entry
+            if ref() is not image or entry_version != version:
+                del self._entries[id(image)]
+                return None
+            self._entries.move_to_end(id(image))
+            return value
+
+    def put(self, image: np.ndarray, value: dict, version: int = 0):
+        """Histogramı ekle; sınır aşılırsa en eski kayıtları sil"""
+        with self._lock:
+            self._entries[id(image)] = (weakref.ref(image), version, value)
+            self._entries.move_to_end(id(image))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Önbelleği temizle"""
+        with self._lock:
+            self._entries.clear()
+
+
+class HistogramService:
+    """Histogram hesaplama servisi"""
+
+    cache = HistogramCache()
+
+    @staticmethod
+    def compute(image: np.ndarray) -> dict:
+        """Kanal ve gri tonlama histogramlarını hesapla
+
+        Renkli görüntülerde üç kanal, kanal ofsetleriyle kaydırılmış değerler üzerinde tek bir
+        np.bincount ile sayılır. Ortalama ve standart sapma gri histogramdan türetilir.
+        Dönüş: {"channels": (C, 256) RGB sırasında sayımlar, "gray": (256,), "mean", "std"}
+        """
+        image = np.asarray(image, dtype=np.uint8)
+        if image.ndim == 3 and image.shape[2] >= 3:
+            bgr = image[:, :, :3]
+            counts = np.bincount((bgr + _CHANNEL_OFFSETS).reshape(-1), minlength=768)
+            channels = counts.reshape(3, 256)[::-1]
+            gray = cv2.cvtColor(np.ascontiguousarray(bgr), cv2.COLOR_BGR2GRAY)
+            gray_counts = np.bincount(gray.reshape(-1), minlength=256)
+        else:
+            gray_counts = np.bincount(image.reshape(-1), minlength=256)
+            channels = gray_counts[None, :]
+
+        levels = np.arange(256, dtype=np.float64)
+        total = max(int(gray_counts.sum()), 1)
+        mean = float(gray_counts @ levels) / total
+        std = float(np.sqrt(max(float(gray_counts @ (levels - mean) ** 2) / total, 0.0)))
+        return {"channels": channels, "gray": gray_counts, "mean": mean, "std": std}
+
+    @staticmethod
+    def get(image: np.ndarray, version: int = 0) -> dict:
+        """Önbellekten döndür; yoksa hesaplayıp önbelleğe ekle
+
+        Görüntü yerinde değiştirildiyse version artırılarak yeniden hesaplama zorlanır.
+        """
+        result = HistogramService.cache.get(image, version)
+        if result is None:
+            result = HistogramService.compute(image)
+            HistogramService.cache.put(image, result, version)
+        return result
+
+    @staticmethod
+    def log_normalize(counts: np.ndarray, scale: float = 1000.0) -> np.ndarray:
+        """Sayımları log1p ile sıkıştırıp en büyük değeri scale olacak şekilde ölçekle"""
+        hist = np.log1p(counts.astype(np.float64))
+        peak = hist.max()
+        return hist / peak * scale if peak > 0 else hist
@@ -0,0 +1,119 @@
+"""
+Görüntü Yükleme Servisi
+Görüntüyü tek kez (gerekirse küçültülmüş olarak) çözer ve çözülmüş diziyi önbellekte tutar
+"""
+
+from collections import OrderedDict
+import os
+import threading
+import cv2
+import numpy as np
+from PIL import Image
+
+# Küçültme katsayısı -> çözücünün doğrudan küçültülmüş çıktı verdiği bayrak
+_REDUCED_FLAGS = ((8, cv2.IMREAD_REDUCED_COLOR_8), (4, cv2.IMREAD_REDUCED_COLOR_4),
+                  (2, cv2.IMREAD_REDUCED_COLOR_2))
+
+
+class ImageCache:
+    """(yol, değişiklik zamanı, dosya boyutu, hedef boyut) ile anahtarlanan LRU dizi önbelleği
+
+    Dosya değişirse anahtar da değişir; toplam bayt max_bytes'ı aşarsa en eski kayıtlar silinir.
+    """
+
+    def __init__(self, max_entries: int = 8, max_bytes: int = 512 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(image_path: str, max_dimension: int = None):
+        """Önbellek anahtarı; dosyanın stat bilgisi okunur, içeriği okunmaz"""
+        stat = os.stat(image_path)
+        return os.path.abspath(image_path), stat.st_mtime_ns, stat.st_size, max_dimension
+
+    def get(self, key):
+        """Kayıtlı diziyi döndür, yoksa None"""
+        with self._lock:
+            image = self._entries.get(key)
+            if image is not None:
+                self._entries.move_to_end(key)
+            return image
+
+    def put(self, key, image: np.ndarray):
+        """Diziyi ekle; sınırlar aşılırsa en eski kayıtları sil"""
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous.nbytes
+            self._entries[key] = image
+            self._bytes += image.nbytes
+            while len(self._entries) > 1 and (len(self._entries) > self.max_entries
+                                              or self._bytes > self.max_bytes):
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.nbytes
+
+    def clear(self):
+        """Önbelleği temizle"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+class ImageLoader:
+    """Görüntüleri tek çözme yolundan yükleyen servis"""
+
+    cache = ImageCache()
+
+    @staticmethod
+    def target_size(width: int, height: int, max_dimension: int = None):
+        """En uzun kenarı max_dimension'ı aşmayacak (genişlik, yükseklik)"""
+        if max_dimension and (height > max_dimension or width > max_dimension):
+            scale = max_dimension / max(height, width)
+            return int(width * scale), int(height * scale)
+        return width, height
+
+    @staticmethod
+    def decode(image_path: str, max_dimension: int = None) -> np.ndarray:
+        """Görüntüyü BGR olarak çöz; küçültme isteniyorsa çözücü doğrudan 1/2, 1/4 ya da 1/8
+        çözünürlükte çalışır (JPEG'de DCT ölçekleme), kalan oran INTER_AREA ile tamamlanır"""
+        flag = cv2.IMREAD_COLOR
+        if max_dimension:
+            try:
+                with Image.open(image_path) as img:
+                    longest = max(img.size)
+            except (OSError, ValueError):
+                longest = 0
+            for factor, reduced_flag in _REDUCED_FLAGS:
+                if longest // factor >= max_dimension:
+                    flag = reduced_flag
+                    break
+
+        image = cv2.imread(image_path, flag)
+        if image is None:
+            raise FileNotFoundError("Görüntü dosyası yüklenemedi.")
+
+        height, width = image.shape[:2]
+        size = ImageLoader.target_size(width, height, max_dimension)
+        if size != (width, height):
+            image = cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+        return image
+
+    @staticmethod
+    def load(image_path: str, max_dimension: int = 800) -> np.ndarray:
+        """Önbellekten döndür ya da bir kez çözüp önbelleğe ekle
+
+        Dönen dizi paylaşıldığı için salt okunurdur; değiştirmek için kopyalanmalıdır.
+        """
+        try:
+            key = ImageCache.make_key(image_path, max_dimension)
+        except OSError:
+            raise FileNotFoundError("Görüntü dosyası yüklenemedi.")
+        image = ImageLoader.cache.get(key)
+        if image is None:
+            image = ImageLoader.decode(image_path, max_dimension)
+            image.flags.writeable = False
+            ImageLoader.cache.put(key, image)
+        return image
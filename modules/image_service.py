@@ -7,7 +7,25 @@ import cv2
 import numpy as np
 from secretsharing import SecretSharer
 import os
+import shutil
 from datetime import datetime
+from PIL import Image
+from .shamir_engine import ShamirEngine
+from .thien_lin_engine import ThienLinEngine
+from .xor_engine import XorEngine
+from .parallel_engine import ParallelEngine, DEFAULT_TILE_ROWS
+from .file_service import FileService, ShareStreamWriter, PngStreamWriter
+from .share_format import ShareFormat, PIXEL_DIGEST_SIZE
+from .share_store import ShareStore
+from .image_loader import ImageLoader
+from .trace_service import traced
+
+DEFAULT_MEMORY_BUDGET = 64 * 1024 * 1024
+
+# ASCII kodu -> onaltılık hane değeri (geçersiz karakterler 0)
+_HEX_NIBBLES = np.zeros(128, dtype=np.uint8)
+for _digit, _char in enumerate("0123456789abcdef"):
+    _HEX_NIBBLES[ord(_char)] = _HEX_NIBBLES[ord(_char.upper())] = _digit
 
 class ImageService:
     """Görüntü işleme işlemlerini yöneten servis sınıfı"""
@@ -19,28 +37,100 @@ class ImageService:
             f.write(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] {event}\n")
 
     @staticmethod
+    @traced("image.decode")
     def load_and_resize_image(image_path: str, max_dimension: int = 800):
-        """Görüntüyü yükle ve boyutlandır"""
-        image = cv2.imread(image_path)
-        if image is None:
-            raise FileNotFoundError("Görüntü dosyası yüklenemedi.")
-        
-        height, width = image.shape[:2]
-        if height > max_dimension or width > max_dimension:
-            scale = max_dimension / max(height, width)
-            new_width = int(width * scale)
-            new_height = int(height * scale)
-            image = cv2.resize(image, (new_width, new_height))
-        
-        return image
+        """Görüntüyü yükle ve boyutlandır (max_dimension=None tam çözünürlük)
+
+        Görüntü ImageLoader ile tek kez çözülür ve önbellekten paylaşılır; dönen dizi salt okunurdur.
+        """
+        return ImageLoader.load(image_path, max_dimension)
 
     @staticmethod
-    def secret_image_sharing(image_path: str, num_shares: int = 2, threshold: int = None, password: str = None):
-        """Shamir's Secret Sharing ile görüntü paylaştırma"""
+    @traced("image.split")
+    def split_image_array(image: np.ndarray, backend: str, threshold: int, num_shares: int,
+                          workers: int = 1, tile_rows: int = DEFAULT_TILE_ROWS, progress=None) -> np.ndarray:
+        """Dizi tabanlı motorlardan biriyle görüntü dizisini paylaştır, (n, pay boyutu) döndür
+
+        progress(tamamlanan, toplam) verilirse görüntü tile_rows satırlık bantlar halinde
+        paylaştırılır ve her banttan sonra çağrılır; geri çağırma istisna fırlatarak işi durdurabilir.
+        """
+        if progress is not None and not (backend == "gf256" and workers and workers > 1):
+            return ImageService._split_in_bands(image, backend, threshold, num_shares, tile_rows, progress)
+        if backend == "gf256":
+            if workers and workers > 1:
+                return ParallelEngine.split(image, threshold, num_shares, workers, tile_rows)
+            return ShamirEngine.split(image, threshold, num_shares)
+        if backend == "xor":
+            if threshold != num_shares:
+                raise ValueError("XOR paylaşımı yalnızca minimum parça sayısı toplam parça sayısına eşitken kullanılabilir")
+            return XorEngine.split(image, num_shares)
+        if backend == "thien_lin":
+            return ThienLinEngine.split(image, threshold, num_shares)
+        raise ValueError(f"Bilinmeyen paylaşım motoru: {backend}")
+
+    @staticmethod
+    def _split_in_bands(image: np.ndarray, backend: str, threshold: int, num_shares: int,
+                        tile_rows: int, progress) -> np.ndarray:
+        """Görüntüyü satır bantları halinde paylaştır; her bayt bağımsız olduğundan sonuç
+        tek geçişle aynı dağılımdadır (Thien-Lin bantları k baytın katıdır)"""
+        flat = np.ascontiguousarray(image, dtype=np.uint8).reshape(-1)
+        row_bytes = max(flat.size // max(image.shape[0], 1), 1)
+        band = max(int(tile_rows), 1) * row_bytes
+        if backend == "thien_lin":
+            band = -(-band // threshold) * threshold
+            share_size = ThienLinEngine.share_size(flat.size, threshold)
+        else:
+            share_size = flat.size
+
+        shares = np.empty((num_shares, share_size), dtype=np.uint8)
+        total = max(-(-flat.size // band), 1)
+        for idx, start in enumerate(range(0, flat.size, band)):
+            part = ImageService.split_image_array(flat[start:start + band], backend, threshold, num_shares)
+            column = start // threshold if backend == "thien_lin" else start
+            shares[:, column:column + part.shape[1]] = part
+            progress(idx + 1, total)
+        return shares
+
+    @staticmethod
+    @traced("image.share")
+    def secret_image_sharing(image_path: str, num_shares: int = 2, threshold: int = None, password: str = None,
+                             backend: str = "secretsharing", workers: int = 1,
+                             tile_rows: int = DEFAULT_TILE_ROWS, pyramid_levels: int = 0, progress=None,
+                             max_dimension: int = 800):
+        """Shamir's Secret Sharing ile görüntü paylaştırma
+
+        backend="secretsharing" blok başına SecretSharer string payları üretir,
+        backend="gf256" tüm pikselleri tek geçişte paylaştırıp (n, H*W*C) uint8 dizisi döndürür.
+        backend="thien_lin" her payı görüntünün 1/k'sı boyutunda (n, ceil(H*W*C/k)) üretir.
+        backend="xor" yalnızca k == n için rastgele maskeler ve XOR ile (n, H*W*C) paylar üretir.
+        gf256 ile workers > 1 verilirse görüntü tile_rows satırlık bantlar halinde süreç havuzunda işlenir.
+        pyramid_levels > 0 ise görüntü piramidi (1/2, 1/4, ...) de paylaştırılır ve paylar
+        {bölüm: (n, pay boyutu)} sözlüğü olarak döner; bölüm s, 2^s kat küçültülmüş seviyedir.
+        progress(tamamlanan, toplam) bant (ya da blok grubu) bittikçe çağrılır.
+        max_dimension=None görüntüyü tam çözünürlükte paylaştırır.
+        """
         if threshold is None:
             threshold = num_shares // 2 + 1
         
-        image = ImageService.load_and_resize_image(image_path)
+        image = ImageService.load_and_resize_image(image_path, max_dimension)
+
+        if backend != "secretsharing":
+            shares = ImageService.split_image_array(image, backend, threshold, num_shares, workers, tile_rows,
+                                                    progress)
+            scheme_names = {"gf256": "GF(2^8)", "thien_lin": "Thien-Lin", "xor": "XOR"}
+            ImageService.log_event(f"Görüntü boyutu: {image.nbytes} bytes, pay boyutu: {shares.shape[1]} bytes")
+            ImageService.log_event(f"{num_shares} parça ile görüntü paylaşıldı ({scheme_names[backend]}, minimum {threshold} parça gerekli).")
+            if not pyramid_levels:
+                return shares, image.shape
+
+            level_shares = {0: shares}
+            for section in range(1, pyramid_levels + 1):
+                height, width = ShareFormat.level_shape(image.shape, section)[:2]
+                level = cv2.resize(image, (width, height), interpolation=cv2.INTER_AREA)
+                level_shares[section] = ImageService.split_image_array(level, backend, threshold, num_shares)
+            ImageService.log_event(f"Aşamalı paylaşım: {pyramid_levels} ek çözünürlük seviyesi eklendi.")
+            return level_shares, image.shape
+
         image_bytes = image.tobytes()
         block_size = 16
         shares = []
@@ -55,6 +145,10 @@ class ImageService:
             value = int.from_bytes(block, 'big')
             block_shares = SecretSharer.split_secret(str(value), threshold, num_shares)
             shares.append(block_shares)
+            if progress is not None and len(shares) % 4096 == 0:
+                progress(i + block_size, len(image_bytes))
+        if progress is not None:
+            progress(len(image_bytes), len(image_bytes))
         
         ImageService.log_event(f"{num_shares} parça ile görüntü paylaşıldı. her parçadaki blok sayısı:{len(shares)}")
         ImageService.log_event(f"{num_shares} parça ile görüntü paylaşıldı (minimum {threshold} parça gerekli).")
@@ -62,9 +156,370 @@ class ImageService:
         return shares, image.shape
 
     @staticmethod
-    def reconstruct_image_from_shares(wrapped_shares: list, threshold: int, password: str = None):
-        """Paylardan görüntüyü doğrudan geri yükle (hata tespiti olmadan)"""
+    def share_data_list(shares, num_shares: int) -> list:
+        """secret_image_sharing çıktısını pay başına listeye çevir (save_share_batch girdisi)
+
+        Dizi payları satır satır, aşamalı paylar {bölüm: pay verisi} sözlükleri olarak ayrılır;
+        secretsharing çıktısı blok başına n string olduğundan pay başına string listesine çevrilir.
+        """
+        if isinstance(shares, dict):
+            sections = {section: ImageService.share_data_list(level, num_shares)
+                        for section, level in shares.items()}
+            return [{section: level[idx] for section, level in sections.items()} for idx in range(num_shares)]
+        if isinstance(shares, np.ndarray):
+            return list(shares)
+        return [[block[idx] for block in shares] for idx in range(num_shares)]
+
+    @staticmethod
+    def read_image_header(image_path: str):
+        """Pikselleri çözmeden görüntünün (yükseklik, genişlik, kanal) bilgisini oku"""
+        try:
+            with Image.open(image_path) as img:
+                width, height = img.size
+        except (OSError, ValueError):
+            raise FileNotFoundError("Görüntü dosyası yüklenemedi.")
+        return height, width, 3
+
+    @staticmethod
+    def _raw_strip_source(image_path: str):
+        """Sıkıştırılmamış (BMP/PPM/TIFF) dosyalar için satırları doğrudan eşleyen memmap döndür"""
+        with Image.open(image_path) as img:
+            if len(img.tile) != 1 or img.tile[0][0] != "raw":
+                return None
+            _, extents, offset, args = img.tile[0]
+            width, height = img.size
+            if extents != (0, 0, width, height):
+                return None
+        if isinstance(args, str):
+            args = (args, 0, 1)
+        rawmode, stride, orientation = (tuple(args) + (0, 1))[:3]
+        channels = {"BGR": 3, "RGB": 3, "L": 1}.get(rawmode)
+        if channels is None:
+            return None
+        stride = stride or width * channels
+
+        rows = np.memmap(image_path, dtype=np.uint8, mode="r", offset=offset, shape=(height, stride))
+        return rows, rawmode, channels, width, height, orientation
+
+    @staticmethod
+    def iter_image_strips(image_path: str, strip_rows: int):
+        """Görüntüyü tam çözünürlükte (satır_başlangıç, BGR şerit) parçaları halinde üret
+
+        Sıkıştırılmamış formatlarda yalnızca ilgili satırlar diskten okunur; sıkıştırılmış
+        formatlarda (PNG/JPEG) görüntü bir kez çözülüp şeritler onun üzerinden verilir.
+        """
+        strip_rows = max(1, int(strip_rows))
+        source = ImageService._raw_strip_source(image_path)
+
+        if source is None:
+            # Tam çözünürlüklü görüntü önbelleğe alınmaz, bellek bütçesi korunur
+            image = ImageLoader.decode(image_path)
+            for row in range(0, image.shape[0], strip_rows):
+                yield row, image[row:row + strip_rows]
+            return
+
+        rows, rawmode, channels, width, height, orientation = source
+        for row in range(0, height, strip_rows):
+            stop = min(row + strip_rows, height)
+            if orientation < 0:
+                # Alttan üste saklanan satırlar (BMP)
+                strip = rows[height - stop:height - row][::-1]
+            else:
+                strip = rows[row:stop]
+            strip = strip[:, :width * channels].reshape(stop - row, width, channels)
+            if rawmode == "RGB":
+                strip = cv2.cvtColor(np.ascontiguousarray(strip), cv2.COLOR_RGB2BGR)
+            elif rawmode == "L":
+                strip = cv2.cvtColor(np.ascontiguousarray(strip[:, :, 0]), cv2.COLOR_GRAY2BGR)
+            yield row, np.ascontiguousarray(strip)
+
+    @staticmethod
+    def strip_rows_for_budget(row_bytes: int, buffers: int, memory_budget: int = DEFAULT_MEMORY_BUDGET):
+        """Bellek bütçesine sığan şerit yüksekliğini hesapla (buffers: satır başına tampon sayısı)"""
+        return max(1, int(memory_budget) // max(1, row_bytes * buffers))
+
+    @staticmethod
+    @traced("image.share_streaming")
+    def share_image_streaming(image_path: str, num_shares: int = 2, threshold: int = None,
+                              memory_budget: int = DEFAULT_MEMORY_BUDGET, directory: str = "shares",
+                              store: ShareStore = None):
+        """Görüntüyü tam çözünürlükte şerit şerit paylaştırıp pay dosyalarına ekle
+
+        Bellek kullanımı görüntü boyutundan bağımsız olarak memory_budget civarında kalır.
+        Paylar önce geçici klasöre yazılır; yazma başarısız olur ya da kesilirse eski paylar
+        yerinde kalır. store verilirse küme <store.root>/<kimlik>/ altına taşınıp dizine
+        kaydedilir, aksi halde dosyalar directory'deki eskilerinin yerine konur.
+        """
+        if threshold is None:
+            threshold = num_shares // 2 + 1
+
+        height, width, channels = ImageService.read_image_header(image_path)
+        original_shape = (height, width, channels)
+        row_bytes = width * channels
+        # Kaynak şerit + k katsayı satırı + n pay satırı
+        strip_rows = ImageService.strip_rows_for_budget(row_bytes, 1 + threshold + num_shares, memory_budget)
+
+        header = {
+            "original_shape": original_shape,
+            "scheme": "gf256",
+            "threshold": threshold,
+            "num_shares": num_shares,
+            "strip_rows": strip_rows,
+            # Özet şeritler işlendikçe hesaplanır, yeri başlıkta ayrılıp sonda doldurulur
+            "pixel_digest": bytes(PIXEL_DIGEST_SIZE)
+        }
+
+        image_id = ShareStore.image_id(image_path) if store is not None else "stream"
+        staging = ShareStore.staging_directory(store.root if store is not None else directory, image_id)
+        hasher = ShareFormat.pixel_hasher(original_shape)
+        try:
+            with ShareStreamWriter(header, num_shares, staging) as writer:
+                for _, strip in ImageService.iter_image_strips(image_path, strip_rows):
+                    hasher.update(memoryview(np.ascontiguousarray(strip)).cast("B"))
+                    writer.write_strip(ShamirEngine.split(strip, threshold, num_shares))
+                writer.set_pixel_digest(hasher.digest())
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+        if store is not None:
+            paths = store.commit_staging(image_id, staging, writer.paths, original_shape, threshold,
+                                         "gf256", num_shares)
+        else:
+            paths = []
+            for path in writer.paths:
+                paths.append(os.path.join(directory, os.path.basename(path)))
+                os.replace(path, paths[-1])
+            os.rmdir(staging)
+
+        ImageService.log_event(f"Görüntü akış modunda paylaşıldı: {width}x{height}, şerit yüksekliği {strip_rows}")
+        ImageService.log_event(f"{num_shares} parça ile görüntü paylaşıldı (minimum {threshold} parça gerekli).")
+        return paths, original_shape
+
+    @staticmethod
+    @traced("image.reconstruct_streaming")
+    def reconstruct_image_streaming(share_paths: list, output_path: str = "reconstructed_image.png",
+                                    memory_budget: int = DEFAULT_MEMORY_BUDGET):
+        """Pay dosyalarını şerit şerit okuyup geri yüklenen görüntüyü doğrudan PNG olarak kodla
+
+        Yalnızca şifrelenmemiş gf256 payları desteklenir; aşamalı paylarda tam çözünürlük
+        (bölüm 0) okunur. PNG atomik yazılır, hata durumunda yarım dosya kalmaz.
+        """
+        streams = []
+        try:
+            for path in share_paths:
+                streams.append(FileService.open_share_stream(path))
+            header = streams[0][0]
+            if header["scheme"] != "gf256":
+                raise ValueError(f"Akış modu yalnızca gf256 paylarını destekler: {header['scheme']}")
+            threshold = header["threshold"]
+            if len(streams) < threshold:
+                raise ValueError(f"En az {threshold} parça gerekli!")
+            streams = streams[:threshold]
+            xs = [stream_header["share_x"] for stream_header, _ in streams]
+
+            height, width, channels = header["original_shape"]
+            row_bytes = width * channels
+            for stream_header, share_file in streams:
+                if (stream_header["scheme"] != "gf256"
+                        or stream_header["original_shape"] != header["original_shape"]):
+                    raise ValueError("Pay dosyaları aynı paylaşıma ait değil")
+                share_file.seek(ImageService._section_offset(stream_header, 0, height * row_bytes))
+            # k pay satırı + çıktı + RGB dönüşümü
+            strip_rows = ImageService.strip_rows_for_budget(row_bytes, threshold + 2, memory_budget)
+
+            share_buffer = np.empty((threshold, strip_rows * row_bytes), dtype=np.uint8)
+            strip_buffer = np.empty((strip_rows, width, channels), dtype=np.uint8)
+
+            with FileService.atomic_open(output_path) as out_file, \
+                    PngStreamWriter(out_file, width, height, channels) as encoder:
+                for row in range(0, height, strip_rows):
+                    rows = min(strip_rows, height - row)
+                    size = rows * row_bytes
+                    for share_row, (_, share_file) in zip(share_buffer, streams):
+                        if share_file.readinto(memoryview(share_row)[:size]) != size:
+                            raise ValueError("Pay dosyası beklenenden kısa")
+                    strip = strip_buffer[:rows]
+                    ShamirEngine.recover(share_buffer[:, :size], xs, out=strip.reshape(-1))
+                    encoder.write_rows(cv2.cvtColor(strip, cv2.COLOR_BGR2RGB))
+        finally:
+            for _, share_file in streams:
+                share_file.close()
+
+        ImageService.log_event(f"{len(xs)} parça kullanılarak görüntü akış modunda geri yüklendi: {output_path}")
+        return output_path
+
+    @staticmethod
+    def _section_offset(header: dict, section: int, expected_size: int) -> int:
+        """Bölümün yük başlangıcını parça tablosundan bul; parçalar ardışık ve tam olmalı"""
+        chunks = sorted((chunk for chunk in header["chunks"] if chunk[0] == section), key=lambda c: c[1])
+        if not chunks:
+            raise ValueError(f"Pay dosyasında {section}. bölüm yok")
+        offset = chunks[0][3]
+        position = offset
+        for _, _, _, chunk_offset, length in chunks:
+            if chunk_offset != position:
+                raise ValueError("Pay dosyasının parça tablosu ardışık değil")
+            position += length
+        if position - offset != expected_size:
+            raise ValueError("Pay dosyasının boyutu başlıkla uyuşmuyor")
+        return offset
+
+    @staticmethod
+    def reconstruct_region(share_paths: list, region: tuple):
+        """Yalnızca (x, y, genişlik, yükseklik) dikdörtgenini geri yükle
+
+        Pay dosyaları belleğe eşlenir ve sadece istenen satırların sayfalarına dokunulur;
+        büyük arşivlerde önizleme ve kırpma için tam çözümlemeye gerek kalmaz.
+        """
+        x, y, width, height = region
+        headers = []
+        blocks = []
+        for path in share_paths:
+            header, rows = FileService.map_share_rows(path, y, y + height)
+            if header["scheme"] != "gf256":
+                raise ValueError("Bölgesel geri yükleme yalnızca GF(2^8) paylarında desteklenir")
+            if x < 0 or width <= 0 or x + width > header["original_shape"][1]:
+                raise ValueError("Bölge görüntü sınırları dışında")
+            headers.append(header)
+            blocks.append(np.ascontiguousarray(rows[:, x:x + width]))
+            del rows
+            if len(headers) == header["threshold"]:
+                break
+
+        threshold = headers[0]["threshold"]
+        if len(headers) < threshold:
+            raise ValueError(f"En az {threshold} parça gerekli!")
+
+        region_shape = (height, width) + tuple(headers[0]["original_shape"][2:])
+        image_array = np.empty(region_shape, dtype=np.uint8)
+        ShamirEngine.recover(blocks, [header["share_x"] for header in headers],
+                             out=image_array.reshape(-1))
+        return image_array
+
+    @staticmethod
+    def reconstruct_progressive(wrapped_shares: list, threshold: int, stop_level: int = 0):
+        """Aşamalı paylardan kaba seviyeden inceye (seviye, görüntü) üret
+
+        İlk seviye milisaniyeler içinde önizleme olarak gösterilebilir; stop_level verilirse
+        daha ince seviyeler hiç çözülmez. Paylar FileService.map_share_file ile eşlendiyse
+        atlanan seviyelerin baytları diskten okunmaz.
+        """
+        sections = wrapped_shares[0].get("sections") or {0: None}
+        for level in sorted(sections, reverse=True):
+            if level < stop_level:
+                break
+            yield level, ImageService.reconstruct_image_from_shares(wrapped_shares, threshold, level=level)
+
+    @staticmethod
+    @traced("image.reconstruct_robust")
+    def reconstruct_image_robust(wrapped_shares: list, threshold: int):
+        """k'dan fazla pay ile hata tespitli geri yükleme
+
+        Tüm paylar birlikte Reed-Solomon kod sözcüğü olarak çözülür; bozuk veya hileli
+        paylar raporlanır ve görüntü yine doğru şekilde geri yüklenir.
+        Dönüş: (görüntü, {pay x: hatalı bayt sayısı})
+        """
+        if wrapped_shares[0].get("scheme") != "gf256":
+            raise ValueError("Hata tespitli geri yükleme yalnızca GF(2^8) paylarında desteklenir")
+        original_shape = wrapped_shares[0]["original_shape"]
+        threshold = wrapped_shares[0].get("threshold") or threshold
+        xs = [wrapped["share_x"] for wrapped in wrapped_shares]
+
+        image_array = np.empty(original_shape, dtype=np.uint8)
+        _, error_counts = ShamirEngine.decode([wrapped["share_data"] for wrapped in wrapped_shares],
+                                              xs, threshold, out=image_array.reshape(-1))
+
+        faulty_shares = {x: int(errors) for x, errors in zip(xs, error_counts) if errors}
+        if faulty_shares:
+            details = ", ".join(f"Pay {x}: {errors} bayt" for x, errors in faulty_shares.items())
+            ImageService.log_event(f"Bozuk paylar tespit edildi ve düzeltildi: {details}")
+        return image_array, faulty_shares
+
+    @staticmethod
+    @traced("image.reconstruct")
+    def reconstruct_image_from_shares(wrapped_shares: list, threshold: int, password: str = None,
+                                      workers: int = 1, tile_rows: int = DEFAULT_TILE_ROWS,
+                                      robust: bool = False, level: int = 0, progress=None):
+        """Paylardan görüntüyü geri yükle
+
+        robust=True ve k'dan fazla pay verildiğinde bozuk paylar tespit edilip düzeltilir,
+        aksi halde ilk k pay doğrudan birleştirilir (hata tespiti olmadan).
+        level > 0 ise aşamalı paylardaki 2^level kat küçültülmüş seviye geri yüklenir.
+        progress(tamamlanan, toplam) gf256 için her satır bandından sonra, diğer şemalarda
+        iş bitince çağrılır.
+        """
+        image_array = ImageService._reconstruct_array(wrapped_shares, threshold, workers, tile_rows,
+                                                      robust, level, progress)
+        if progress is not None:
+            progress(1, 1)
+        return image_array
+
+    @staticmethod
+    def _reconstruct_array(wrapped_shares: list, threshold: int, workers: int, tile_rows: int,
+                           robust: bool, level: int, progress):
+        """reconstruct_image_from_shares gövdesi"""
+        if level:
+            wrapped_shares = [
+                {**wrapped,
+                 "share_data": wrapped["sections"][level],
+                 "original_shape": ShareFormat.level_shape(wrapped["original_shape"], level)}
+                for wrapped in wrapped_shares
+            ]
         original_shape = wrapped_shares[0]["original_shape"]
+
+        if robust and len(wrapped_shares) > (wrapped_shares[0].get("threshold") or threshold):
+            return ImageService.reconstruct_image_robust(wrapped_shares, threshold)[0]
+
+        if wrapped_shares[0].get("scheme") == "xor":
+            # (n, n) paylaşımı: n farklı payın tamamı XOR'lanır
+            threshold = wrapped_shares[0].get("threshold") or threshold
+            selected = list({wrapped["share_x"]: wrapped for wrapped in wrapped_shares}.values())
+            if len(selected) < threshold:
+                raise ValueError(f"En az {threshold} parça gerekli!")
+            image_array = np.empty(original_shape, dtype=np.uint8)
+            XorEngine.recover([wrapped["share_data"] for wrapped in selected[:threshold]],
+                              out=image_array.reshape(-1))
+            return image_array
+
+        if wrapped_shares[0].get("scheme") == "thien_lin":
+            # Tüm katsayılar piksel verisi olduğundan k pay ters Vandermonde ile çözülür
+            threshold = wrapped_shares[0].get("threshold") or threshold
+            selected = wrapped_shares[:threshold]
+            if len(selected) < threshold:
+                raise ValueError(f"En az {threshold} parça gerekli!")
+            image_array = np.empty(original_shape, dtype=np.uint8)
+            ThienLinEngine.recover([wrapped["share_data"] for wrapped in selected],
+                                   [wrapped["share_x"] for wrapped in selected],
+                                   image_array.size, out=image_array.reshape(-1))
+            return image_array
+
+        if wrapped_shares[0].get("scheme") == "gf256":
+            # Lagrange katsayıları x kümesi başına bir kez hesaplanır, çıktı tek tampona yazılır
+            threshold = wrapped_shares[0].get("threshold") or threshold
+            selected = wrapped_shares[:threshold]
+            if len(selected) < threshold:
+                raise ValueError(f"En az {threshold} parça gerekli!")
+            xs = [wrapped["share_x"] for wrapped in selected]
+            if workers and workers > 1:
+                return ParallelEngine.recover([wrapped["share_data"] for wrapped in selected], xs,
+                                              original_shape, workers, tile_rows)
+            image_array = np.empty(original_shape, dtype=np.uint8)
+            if progress is None:
+                ShamirEngine.recover([wrapped["share_data"] for wrapped in selected], xs,
+                                     out=image_array.reshape(-1))
+                return image_array
+
+            flat = image_array.reshape(-1)
+            datas = [np.asarray(wrapped["share_data"], dtype=np.uint8).reshape(-1) for wrapped in selected]
+            band = max(int(tile_rows), 1) * max(flat.size // max(original_shape[0], 1), 1)
+            total = max(-(-flat.size // band), 1)
+            for idx, start in enumerate(range(0, flat.size, band)):
+                ShamirEngine.recover([data[start:start + band] for data in datas], xs,
+                                     out=flat[start:start + band])
+                progress(idx + 1, total)
+            return image_array
+
         share_data_list = [wrapped["share_data"] for wrapped in wrapped_shares]
 
         reconstructed_bytes = bytearray()
@@ -76,6 +531,8 @@ class ImageService:
             value = int(SecretSharer.recover_secret(valid_shares))
             block = value.to_bytes(16, 'big')
             reconstructed_bytes.extend(block)
+            if progress is not None and (block_idx + 1) % 4096 == 0:
+                progress(block_idx + 1, total_blocks)
 
         total_bytes = np.prod(original_shape)
         reconstructed_bytes = reconstructed_bytes[:total_bytes]
@@ -83,67 +540,108 @@ class ImageService:
         return image_array.reshape(original_shape)
 
     @staticmethod
+    def _fit_to_max_dimension(plane: np.ndarray, max_dimension: int) -> np.ndarray:
+        """Düzlemi en uzun kenarı max_dimension olacak şekilde alan ortalamasıyla küçült"""
+        height, width = plane.shape[:2]
+        if max_dimension and max(height, width) > max_dimension:
+            scale = max_dimension / max(height, width)
+            size = (max(1, int(width * scale)), max(1, int(height * scale)))
+            plane = cv2.resize(plane, size, interpolation=cv2.INTER_AREA)
+        return plane
+
+    @staticmethod
+    @traced("image.visualize")
     def create_share_visualization(shares: list, original_shape: tuple, max_dimension: int = 400):
-        """Payları görselleştir"""
-        # Calculate share image dimensions
+        """Payları görselleştir
+
+        Pay baytları doğrudan RGB düzlemine yerleştirilip max_dimension boyutuna küçültülür;
+        çıktı aynı paylar için her çalıştırmada aynıdır.
+        """
+        if isinstance(shares, np.ndarray):
+            # Dizi payları: pay baytlarını görüntü düzleminde yeniden şekillendir
+            full_size = int(np.prod(original_shape))
+            row_bytes = full_size // original_shape[0]
+            share_images = []
+            for share in shares:
+                share = share.reshape(-1)
+                if share.size == full_size:
+                    plane = share.reshape(original_shape)
+                else:
+                    # Küçültülmüş (1/k) paylar: aynı genişlikte daha az satıra yerleştir
+                    rows = -(-share.size // row_bytes)
+                    padded = np.zeros(rows * row_bytes, dtype=np.uint8)
+                    padded[:share.size] = share
+                    plane = padded.reshape((rows,) + tuple(original_shape[1:]))
+                if plane.ndim == 2:
+                    plane = cv2.cvtColor(plane, cv2.COLOR_GRAY2BGR)
+                plane = np.ascontiguousarray(plane[:, :, :3])
+                share_images.append(ImageService._fit_to_max_dimension(plane, max_dimension))
+            return share_images
+
+        # SecretSharer string payları: her bloğun pay değerinin son 6 onaltılık hanesi bir RGB pikseldir
+        strings = np.array(shares, dtype=str)
+        values = np.char.partition(strings, "-")[..., 2]
+        digits = max(values.dtype.itemsize // 4, 6)
+        codes = np.char.rjust(values, digits, "0").view(np.uint32).reshape(values.shape + (digits,))
+        nibbles = _HEX_NIBBLES[codes[..., -6:] & 0x7F]
+        colors = nibbles[..., 0::2] * 16 + nibbles[..., 1::2]
+
         total_blocks = len(shares)
-        width = int(np.sqrt(total_blocks))
-        height = (total_blocks + width - 1) // width
-        
-        # Ensure reasonable dimensions
-        if width > max_dimension or height > max_dimension:
-            scale = max_dimension / max(width, height)
-            width = int(width * scale)
-            height = int(height * scale)
-        
-        share_shape = (height, width, 3)  # RGB color image
+        width = max(1, int(np.sqrt(total_blocks)))
+        height = -(-total_blocks // width)
         share_images = []
-        
-        for share_idx in range(len(shares[0])):
-            # Create a color share image
-            share_image = np.zeros(share_shape, dtype=np.uint8)
-            
-            for i, block_shares in enumerate(shares):
-                try:
-                    if share_idx >= len(block_shares):
-                        continue
-                    
-                    # Extract share value
-                    share_value = block_shares[share_idx].split('-')[1]
-                    
-                    # Generate color values using hash
-                    seed = hash(share_value + str(share_idx) + str(i))
-                    
-                    # Create RGB values
-                    r = (seed * 7 + share_idx * 13) % 256
-                    g = (seed * 11 + i * 17) % 256
-                    b = (seed * 13 + share_idx * 19 + i * 23) % 256
-                    
-                    # Ensure minimum brightness
-                    if r < 50: r = (r + 100) % 256
-                    if g < 50: g = (g + 100) % 256
-                    if b < 50: b = (b + 100) % 256
-                    
-                    # Set pixel in share image
-                    if i < total_blocks:
-                        row = i // width
-                        col = i % width
-                        if row < height:
-                            share_image[row, col] = [r, g, b]
-                    
-                except (ValueError, IndexError) as e:
-                    # Set default color
-                    if i < total_blocks:
-                        row = i // width
-                        col = i % width
-                        if row < height:
-                            share_image[row, col] = [share_idx * 50, i * 15, 100]
-                    continue
-            
-            share_images.append(share_image)
-        
+        for share_idx in range(strings.shape[1]):
+            plane = np.zeros((height * width, 3), dtype=np.uint8)
+            plane[:total_blocks] = colors[:, share_idx]
+            share_images.append(ImageService._fit_to_max_dimension(plane.reshape(height, width, 3),
+                                                                   max_dimension))
         return share_images
 
+    @staticmethod
+    @traced("image.verify")
+    def verify_reconstruction(image: np.ndarray, wrapped_shares: list):
+        """Geri yüklenen pikselleri paylardaki özetle karşılaştır
+
+        True: birebir aynı, False: farklı, None: paylarda özet yok (eski format).
+        """
+        expected = next((wrapped.get("pixel_digest") for wrapped in wrapped_shares
+                         if wrapped.get("pixel_digest")), None)
+        if expected is None:
+            return None
+        return ShareFormat.pixel_digest(image) == expected
+
+    @staticmethod
+    @traced("image.quality")
+    def quality_metrics(original: np.ndarray, reconstructed: np.ndarray, max_dimension: int = 256) -> dict:
+        """PSNR ve SSIM'i max_dimension boyutuna küçültülmüş gri tonlama ızgarada OpenCV ile hesapla
+
+        max_dimension=None tam çözünürlükte hesaplar. SSIM, Wang vd. (2004) 11x11 Gauss
+        penceresiyle hesaplanır; birebir aynı görüntülerde PSNR sonsuzdur.
+        """
+        if original.shape != reconstructed.shape:
+            raise ValueError("Görüntü boyutları eşleşmiyor")
+        if original.ndim == 3:
+            original = cv2.cvtColor(original, cv2.COLOR_BGR2GRAY)
+            reconstructed = cv2.cvtColor(reconstructed, cv2.COLOR_BGR2GRAY)
+        original = ImageService._fit_to_max_dimension(original, max_dimension)
+        reconstructed = ImageService._fit_to_max_dimension(reconstructed, max_dimension)
+
+        psnr = cv2.PSNR(original, reconstructed) if cv2.norm(original, reconstructed, cv2.NORM_INF) else float("inf")
+
+        a = original.astype(np.float32)
+        b = reconstructed.astype(np.float32)
+        c1, c2 = (0.01 * 255) ** 2, (0.03 * 255) ** 2
+
+        def blur(x):
+            return cv2.GaussianBlur(x, (11, 11), 1.5)
+
+        mu_a, mu_b = blur(a), blur(b)
+        var_a = blur(a * a) - mu_a * mu_a
+        var_b = blur(b * b) - mu_b * mu_b
+        cov = blur(a * b) - mu_a * mu_b
+        ssim_map = ((2 * mu_a * mu_b + c1) * (2 * cov + c2)) / ((mu_a * mu_a + mu_b * mu_b + c1) * (var_a + var_b + c2))
+        return {"psnr": float(psnr), "ssim": float(ssim_map.mean())}
+
     @staticmethod
     def calculate_image_similarity(original: np.ndarray, reconstructed: np.ndarray):
         """İki görüntü arasındaki benzerliği hesapla"""
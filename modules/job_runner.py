@@ -0,0 +1,153 @@
+"""
+Arka Plan İş Yürütücüsü
+Ağır ImageService / FileService işlerini QThreadPool üzerinde iptal edilebilir işler olarak çalıştırır
+"""
+
+import threading
+import time
+import traceback
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from .trace_service import TraceService
+
+
+class JobCancelled(Exception):
+    """İş kullanıcı tarafından iptal edildi"""
+
+
+class JobSignals(QObject):
+    """İş parçacığından ana iş parçacığına kuyruklu olarak iletilen sinyaller"""
+
+    progress = pyqtSignal(int, str)
+    preview = pyqtSignal(object)
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+    traced = pyqtSignal(object)
+
+
+class JobContext:
+    """İş fonksiyonuna verilen ilerleme ve iptal arayüzü
+
+    stage(ad, başlangıç, bitiş) ile her aşamaya toplam ilerlemenin bir yüzde aralığı atanır;
+    report(tamamlanan, toplam) bu aralıkta ilerler. Güncellemeler en fazla min_interval
+    saniyede bir yayılır, böylece yeniden çizim maliyeti sınırlı kalır. İptal istenmişse
+    report ve check_cancelled JobCancelled fırlatır.
+    """
+
+    def __init__(self, signals: JobSignals, min_interval: float = 0.05):
+        self._signals = signals
+        self._cancel = threading.Event()
+        self._min_interval = min_interval
+        self._last_emit = 0.0
+        self._last_percent = -1
+        self._stage = ("", 0, 100)
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def cancel(self):
+        """İptal iste; iş bir sonraki report / check_cancelled çağrısında durur"""
+        self._cancel.set()
+
+    def check_cancelled(self):
+        if self._cancel.is_set():
+            raise JobCancelled()
+
+    def stage(self, name: str, start: int, end: int):
+        """Yeni aşamaya geç ve ilerlemeyi aşamanın başına getir"""
+        self._stage = (name, start, end)
+        self._emit(start, force=True)
+
+    def report(self, done: int, total: int):
+        """Aşama içindeki ilerlemeyi bildir (ImageService/FileService progress geri çağırması)"""
+        self.check_cancelled()
+        _, start, end = self._stage
+        fraction = done / total if total else 1.0
+        self._emit(int(start + (end - start) * min(max(fraction, 0.0), 1.0)), force=done >= total)
+
+    def preview(self, value):
+        """Ara sonucu (ör. aşamalı önizleme) ana iş parçacığına gönder"""
+        self.check_cancelled()
+        self._signals.preview.emit(value)
+
+    def _emit(self, percent: int, force: bool = False):
+        now = time.monotonic()
+        if percent == self._last_percent or (not force and now - self._last_emit < self._min_interval):
+            return
+        self._last_emit = now
+        self._last_percent = percent
+        self._signals.progress.emit(percent, self._stage[0])
+
+
+class BackgroundJob(QRunnable):
+    """fn(context, *args, **kwargs) çağrısını iş havuzunda çalıştıran iş"""
+
+    def __init__(self, fn, *args, **kwargs):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.signals = JobSignals()
+        self.context = JobContext(self.signals)
+        self._fn = fn
+        self._args = args
+        self._kwargs = kwargs
+
+    def cancel(self):
+        self.context.cancel()
+
+    def run(self):
+        try:
+            with TraceService.span(f"job.{getattr(self._fn, '__name__', 'job')}") as span:
+                result = self._fn(self.context, *self._args, **self._kwargs)
+        except JobCancelled:
+            self.signals.cancelled.emit()
+        except Exception as e:
+            traceback.print_exc()
+            self.signals.failed.emit(str(e))
+        else:
+            if TraceService.enabled:
+                self.signals.traced.emit(TraceService.breakdown(span))
+            if self.context.cancelled:
+                self.signals.cancelled.emit()
+            else:
+                self.signals.finished.emit(result)
+
+
+class JobRunner(QObject):
+    """Arka plan işlerini başlatan, izleyen ve iptal eden yürütücü"""
+
+    def __init__(self, parent=None, max_threads: int = 2):
+        super().__init__(parent)
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(max_threads)
+        self._jobs = set()
+
+    def submit(self, fn, *args, on_progress=None, on_preview=None, on_finished=None,
+               on_failed=None, on_cancelled=None, on_trace=None, **kwargs) -> BackgroundJob:
+        """İşi kuyruğa ekle; geri çağırmalar ana iş parçacığında çalışır
+
+        İzleme açıksa on_trace iş bitince TraceService.breakdown satırlarıyla çağrılır.
+        """
+        job = BackgroundJob(fn, *args, **kwargs)
+        for signal, slot in ((job.signals.progress, on_progress), (job.signals.preview, on_preview),
+                             (job.signals.finished, on_finished), (job.signals.failed, on_failed),
+                             (job.signals.cancelled, on_cancelled), (job.signals.traced, on_trace)):
+            if slot is not None:
+                signal.connect(slot)
+        for signal in (job.signals.finished, job.signals.failed, job.signals.cancelled):
+            signal.connect(lambda *_, job=job: self._jobs.discard(job))
+        self._jobs.add(job)
+        self._pool.start(job)
+        return job
+
+    def is_busy(self) -> bool:
+        return bool(self._jobs)
+
+    def cancel_all(self):
+        """Çalışan ve bekleyen tüm işlere iptal isteği gönder"""
+        for job in list(self._jobs):
+            job.cancel()
+
+    def wait(self, timeout_ms: int = -1) -> bool:
+        """Tüm işlerin bitmesini bekle (uygulama kapanırken)"""
+        return self._pool.waitForDone(timeout_ms)
@@ -0,0 +1,148 @@
+"""
+Paralel Paylaşım Motoru
+Görüntüyü satır bantlarına bölüp Shamir paylaşımı ve geri yüklemeyi süreç havuzunda çalıştırır
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+from .shamir_engine import ShamirEngine
+
+DEFAULT_TILE_ROWS = 64
+
+_executor = None
+_executor_workers = None
+
+
+def _get_executor(workers: int) -> ProcessPoolExecutor:
+    """İşçi sayısı değişmedikçe aynı süreç havuzunu yeniden kullan"""
+    global _executor, _executor_workers
+    if _executor is None or _executor_workers != workers:
+        if _executor is not None:
+            _executor.shutdown(wait=True)
+        _executor = ProcessPoolExecutor(max_workers=workers)
+        _executor_workers = workers
+    return _executor
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Paylaşımlı belleğe bağlan; unlink sorumluluğu ana süreçte kalır
+
+    İşçiler ana sürecin resource_tracker'ını devraldığı için tekrar kayıt zararsızdır,
+    kaydı geri almak ise ana sürecin kaydını da silerdi.
+    """
+    return shared_memory.SharedMemory(name=name)
+
+
+def _split_band(secret_name: str, shares_name: str, size: int, start: int, stop: int,
+                threshold: int, num_shares: int):
+    """İşçi: [start, stop) bayt aralığını paylaştırıp çıktı belleğine yaz"""
+    secret_shm = _attach(secret_name)
+    shares_shm = _attach(shares_name)
+    try:
+        secret = np.ndarray((size,), dtype=np.uint8, buffer=secret_shm.buf)
+        shares = np.ndarray((num_shares, size), dtype=np.uint8, buffer=shares_shm.buf)
+        ShamirEngine.split(secret[start:stop], threshold, num_shares, out=shares[:, start:stop])
+        del secret, shares
+    finally:
+        secret_shm.close()
+        shares_shm.close()
+    return start, stop
+
+
+def _recover_band(shares_name: str, output_name: str, size: int, start: int, stop: int, xs: tuple):
+    """İşçi: [start, stop) bayt aralığını k paydan geri yükle"""
+    shares_shm = _attach(shares_name)
+    output_shm = _attach(output_name)
+    try:
+        shares = np.ndarray((len(xs), size), dtype=np.uint8, buffer=shares_shm.buf)
+        output = np.ndarray((size,), dtype=np.uint8, buffer=output_shm.buf)
+        ShamirEngine.recover(shares[:, start:stop], xs, out=output[start:stop])
+        del shares, output
+    finally:
+        shares_shm.close()
+        output_shm.close()
+    return start, stop
+
+
+class ParallelEngine:
+    """Satır bantları üzerinde süreç havuzu ile çalışan paylaşım motoru"""
+
+    @staticmethod
+    def default_workers() -> int:
+        """Varsayılan işçi sayısı (çekirdek sayısı)"""
+        return os.cpu_count() or 1
+
+    @staticmethod
+    def row_bands(height: int, tile_rows: int = DEFAULT_TILE_ROWS):
+        """Görüntü satırlarını (başlangıç, bitiş) bantlarına böl"""
+        tile_rows = max(1, int(tile_rows))
+        return [(row, min(row + tile_rows, height)) for row in range(0, height, tile_rows)]
+
+    @staticmethod
+    def split(image: np.ndarray, threshold: int, num_shares: int,
+              workers: int = None, tile_rows: int = DEFAULT_TILE_ROWS) -> np.ndarray:
+        """Görüntüyü bant bant paralel paylaştır, (n, H*W*C) pay dizisi döndür"""
+        workers = workers or ParallelEngine.default_workers()
+        image = np.ascontiguousarray(image, dtype=np.uint8)
+        size = image.size
+        row_bytes = size // image.shape[0]
+
+        secret_shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        shares_shm = shared_memory.SharedMemory(create=True, size=max(size * num_shares, 1))
+        try:
+            np.ndarray((size,), dtype=np.uint8, buffer=secret_shm.buf)[:] = image.reshape(-1)
+
+            executor = _get_executor(workers)
+            futures = [
+                executor.submit(_split_band, secret_shm.name, shares_shm.name, size,
+                                row_start * row_bytes, row_stop * row_bytes, threshold, num_shares)
+                for row_start, row_stop in ParallelEngine.row_bands(image.shape[0], tile_rows)
+            ]
+            for future in futures:
+                future.result()
+
+            shares = np.ndarray((num_shares, size), dtype=np.uint8, buffer=shares_shm.buf).copy()
+        finally:
+            secret_shm.close()
+            secret_shm.unlink()
+            shares_shm.close()
+            shares_shm.unlink()
+
+        return shares
+
+    @staticmethod
+    def recover(shares, xs, original_shape: tuple,
+                workers: int = None, tile_rows: int = DEFAULT_TILE_ROWS) -> np.ndarray:
+        """k payı bant bant paralel birleştirip görüntüyü geri yükle"""
+        workers = workers or ParallelEngine.default_workers()
+        xs = tuple(int(x) for x in xs)
+        size = int(np.prod(original_shape))
+        row_bytes = size // original_shape[0]
+
+        shares_shm = shared_memory.SharedMemory(create=True, size=max(size * len(xs), 1))
+        output_shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        try:
+            staged = np.ndarray((len(xs), size), dtype=np.uint8, buffer=shares_shm.buf)
+            for row, share in zip(staged, shares):
+                row[:] = np.asarray(share, dtype=np.uint8).reshape(-1)
+            del staged
+
+            executor = _get_executor(workers)
+            futures = [
+                executor.submit(_recover_band, shares_shm.name, output_shm.name, size,
+                                row_start * row_bytes, row_stop * row_bytes, xs)
+                for row_start, row_stop in ParallelEngine.row_bands(original_shape[0], tile_rows)
+            ]
+            for future in futures:
+                future.result()
+
+            image = np.ndarray(original_shape, dtype=np.uint8, buffer=output_shm.buf).copy()
+        finally:
+            shares_shm.close()
+            shares_shm.unlink()
+            output_shm.close()
+            output_shm.unlink()
+
+        return image
@@ -0,0 +1,286 @@
+"""
+Shamir Motoru
+GF(2^8) üzerinde vektörize Shamir gizli paylaşımı (tüm pikseller tek geçişte)
+"""
+
+import os
+from functools import lru_cache
+import numpy as np
+
+# GF(2^8) indirgeme polinomu: x^8 + x^4 + x^3 + x + 1 (AES polinomu)
+GF_POLY = 0x11B
+# 0x03 bu alanın üretecidir, log/exp tabloları bu taban ile kurulur
+GF_GENERATOR = 0x03
+
+
+def _build_tables():
+    """GF(2^8) log/exp ve çarpım tablolarını hesapla"""
+    exp = np.zeros(512, dtype=np.uint8)
+    log = np.zeros(256, dtype=np.int16)
+
+    value = 1
+    for power in range(255):
+        exp[power] = value
+        log[value] = power
+        # value *= 0x03  ->  value ^ (value * 0x02)
+        doubled = value << 1
+        if doubled & 0x100:
+            doubled ^= GF_POLY
+        value = doubled ^ value
+    # exp[a + b] indekslemesi için tabloyu iki kez tekrarla
+    exp[255:510] = exp[:255]
+
+    # mul[a, b] = a * b; satır seçimi (mul[a]) skaler çarpımı tek bir take'e indirir
+    a = np.arange(256)
+    log_sum = log[a][:, None] + log[a][None, :]
+    mul = exp[log_sum].astype(np.uint8)
+    mul[0, :] = 0
+    mul[:, 0] = 0
+    return exp, log, mul
+
+
+GF_EXP, GF_LOG, GF_MUL = _build_tables()
+# GF_INV[0] tanımsızdır, vektörize işlemlerde 0 olarak bırakılır
+GF_INV = np.zeros(256, dtype=np.uint8)
+GF_INV[1:] = GF_EXP[255 - GF_LOG[1:]]
+
+
+def _gf_pow(value: int, exponent: int) -> int:
+    """GF(2^8) üs alma"""
+    if exponent == 0:
+        return 1
+    if value == 0:
+        return 0
+    return int(GF_EXP[(int(GF_LOG[value]) * exponent) % 255])
+
+
+@lru_cache(maxsize=128)
+def _lagrange_at_zero(xs: tuple) -> tuple:
+    """Verilen x kümesi için L_j(0) katsayılarını hesapla (x kümesi başına önbelleklenir)"""
+    if len(set(xs)) != len(xs):
+        raise ValueError("Aynı x değerine sahip paylar birlikte kullanılamaz")
+
+    coefficients = []
+    for j, x_j in enumerate(xs):
+        # L_j(0) = prod_{m != j} x_m / (x_m - x_j); GF(2^8) içinde çıkarma XOR'dur
+        value = 1
+        for m, x_m in enumerate(xs):
+            if m == j:
+                continue
+            term = GF_MUL[x_m, ShamirEngine.gf_inverse(x_m ^ x_j)]
+            value = int(GF_MUL[value, term])
+        coefficients.append(value)
+    return tuple(coefficients)
+
+
+@lru_cache(maxsize=128)
+def _syndrome_coefficients(xs: tuple, redundancy: int) -> tuple:
+    """Genelleştirilmiş Reed-Solomon sendrom katsayıları: v_i * x_i^l (l < m-k)
+
+    v_i = 1 / prod_{j != i} (x_i - x_j) dual kodun sütun çarpanlarıdır; hatasız paylarda
+    tüm sendromlar sıfırdır.
+    """
+    multipliers = []
+    for i, x_i in enumerate(xs):
+        product = 1
+        for j, x_j in enumerate(xs):
+            if i != j:
+                product = int(GF_MUL[product, x_i ^ x_j])
+        multipliers.append(int(GF_INV[product]))
+    return tuple(
+        tuple(int(GF_MUL[v_i, _gf_pow(x_i, power)]) for v_i, x_i in zip(multipliers, xs))
+        for power in range(redundancy)
+    )
+
+
+def _berlekamp_massey(syndromes: np.ndarray):
+    """(s, r) sendrom matrisinin her satırı için hata konumlayıcı polinomu bul (vektörize)
+
+    Dönüş: (s, r+1) katsayı dizisi (düşük dereceden yükseğe) ve (s,) polinom dereceleri.
+    """
+    count, redundancy = syndromes.shape
+    locator = np.zeros((count, redundancy + 1), dtype=np.uint8)
+    locator[:, 0] = 1
+    previous = locator.copy()
+    degree = np.zeros(count, dtype=np.int64)
+    shift = np.ones(count, dtype=np.int64)
+    last_discrepancy = np.ones(count, dtype=np.uint8)
+    columns = np.arange(redundancy + 1)
+
+    for step in range(redundancy):
+        discrepancy = syndromes[:, step].copy()
+        for i in range(1, step + 1):
+            discrepancy ^= GF_MUL[locator[:, i], syndromes[:, step - i]]
+
+        nonzero = discrepancy != 0
+        grow = nonzero & (2 * degree <= step)
+
+        # C(z) - (d / b) z^m B(z)
+        scale = GF_MUL[discrepancy, GF_INV[last_discrepancy]]
+        source = columns[None, :] - shift[:, None]
+        shifted = np.where(source >= 0,
+                           np.take_along_axis(previous, np.clip(source, 0, None), axis=1), 0)
+        updated = locator ^ GF_MUL[scale[:, None], shifted.astype(np.uint8)]
+
+        previous = np.where(grow[:, None], locator, previous)
+        locator = np.where(nonzero[:, None], updated, locator)
+        degree = np.where(grow, step + 1 - degree, degree)
+        last_discrepancy = np.where(grow, discrepancy, last_discrepancy)
+        shift = np.where(grow, 1, shift + 1)
+
+    return locator, degree
+
+
+class ShamirEngine:
+    """GF(2^8) üzerinde toplu (batched) Shamir paylaşımı yapan motor"""
+
+    @staticmethod
+    def gf_inverse(value: int) -> int:
+        """GF(2^8) çarpımsal tersi"""
+        if value == 0:
+            raise ZeroDivisionError("GF(2^8) içinde 0'ın tersi yoktur")
+        return int(GF_EXP[255 - GF_LOG[value]])
+
+    @staticmethod
+    def random_coefficients(threshold: int, size: int) -> np.ndarray:
+        """Polinomların sabit olmayan katsayılarını (k-1, N) dizisi olarak üret"""
+        if threshold <= 1:
+            return np.empty((0, size), dtype=np.uint8)
+        raw = os.urandom((threshold - 1) * size)
+        return np.frombuffer(raw, dtype=np.uint8).reshape(threshold - 1, size)
+
+    @staticmethod
+    def split(secret: np.ndarray, threshold: int, num_shares: int, out: np.ndarray = None) -> np.ndarray:
+        """Her bayt için k-1 dereceli rastgele polinomu x = 1..n noktalarında değerlendir
+
+        Dönüş değeri (n, N) boyutlu uint8 dizisidir; i. satır x = i+1 payıdır.
+        out verilirse paylar doğrudan bu (n, N) tampona yazılır.
+        """
+        if not 1 <= threshold <= num_shares:
+            raise ValueError("Minimum parça sayısı 1 ile toplam parça sayısı arasında olmalı")
+        if num_shares > 255:
+            raise ValueError("GF(2^8) en fazla 255 pay destekler")
+
+        secret = np.ascontiguousarray(secret, dtype=np.uint8).reshape(-1)
+        size = secret.size
+
+        # Katsayı matrisi (k, N): 0. satır gizli verinin kendisi
+        coefficients = np.empty((threshold, size), dtype=np.uint8)
+        coefficients[0] = secret
+        coefficients[1:] = ShamirEngine.random_coefficients(threshold, size)
+
+        if out is None:
+            shares = np.empty((num_shares, size), dtype=np.uint8)
+        elif out.shape != (num_shares, size):
+            raise ValueError("Çıktı tamponu pay boyutuyla uyuşmuyor")
+        else:
+            shares = out
+        for share_idx in range(num_shares):
+            x = share_idx + 1
+            mul_x = GF_MUL[x]
+            acc = shares[share_idx]
+            # Horner: acc = (((c_{k-1}) * x + c_{k-2}) * x + ...) + c_0
+            acc[:] = coefficients[threshold - 1]
+            for degree in range(threshold - 2, -1, -1):
+                np.take(mul_x, acc, out=acc)
+                np.bitwise_xor(acc, coefficients[degree], out=acc)
+
+        return shares
+
+    @staticmethod
+    def lagrange_coefficients(xs) -> tuple:
+        """x = 0 noktasındaki Lagrange taban katsayıları"""
+        return _lagrange_at_zero(tuple(int(x) for x in xs))
+
+    @staticmethod
+    def recover(shares, xs, out: np.ndarray = None) -> np.ndarray:
+        """k payı vektörize çarp-topla ile birleştirip gizli veriyi geri elde et
+
+        shares: her biri N baytlık pay dizileri, xs: payların x koordinatları.
+        out verilirse sonuç doğrudan bu (N elemanlı, uint8) tampona yazılır.
+        """
+        if len(shares) != len(xs):
+            raise ValueError("Pay sayısı ile x koordinatı sayısı eşleşmiyor")
+        coefficients = ShamirEngine.lagrange_coefficients(xs)
+
+        first = np.asarray(shares[0], dtype=np.uint8).reshape(-1)
+        if out is None:
+            out = np.empty(first.size, dtype=np.uint8)
+        elif out.size != first.size:
+            raise ValueError("Çıktı tamponu pay boyutuyla uyuşmuyor")
+
+        np.take(GF_MUL[coefficients[0]], first, out=out)
+        if len(shares) > 1:
+            term = np.empty_like(out)
+            for coefficient, share in zip(coefficients[1:], shares[1:]):
+                share = np.asarray(share, dtype=np.uint8).reshape(-1)
+                np.take(GF_MUL[coefficient], share, out=term)
+                np.bitwise_xor(out, term, out=out)
+
+        return out
+
+    @staticmethod
+    def decode(shares, xs, threshold: int, out: np.ndarray = None):
+        """k'dan fazla pay verildiğinde bozuk/hileli payları bulup düzelterek geri yükle
+
+        Paylar genelleştirilmiş Reed-Solomon kod sözcüğü olarak ele alınır. Sendromlar tüm
+        baytlar için vektörize hesaplanır; yalnızca sendromu sıfır olmayan konumlar
+        Berlekamp-Massey ile çözülür ve her konum hatasız k pay ile yeniden birleştirilir.
+        m pay ile konum başına en fazla (m-k)//2 hata düzeltilir.
+
+        Dönüş: (gizli veri, her pay için hatalı bayt sayısı dizisi)
+        """
+        xs = tuple(int(x) for x in xs)
+        count = len(xs)
+        redundancy = count - threshold
+        if len(shares) != count:
+            raise ValueError("Pay sayısı ile x koordinatı sayısı eşleşmiyor")
+        if redundancy < 1:
+            raise ValueError("Hata tespiti için minimum parça sayısından fazla pay gerekli")
+
+        shares = [np.asarray(share, dtype=np.uint8).reshape(-1) for share in shares]
+        out = ShamirEngine.recover(shares[:threshold], xs[:threshold], out=out)
+        error_counts = np.zeros(count, dtype=np.int64)
+
+        # Sendromlar: S_l = sum_i v_i x_i^l y_i
+        syndromes = np.zeros((redundancy, out.size), dtype=np.uint8)
+        term = np.empty(out.size, dtype=np.uint8)
+        for row, coefficients in zip(syndromes, _syndrome_coefficients(xs, redundancy)):
+            for coefficient, share in zip(coefficients, shares):
+                np.take(GF_MUL[coefficient], share, out=term)
+                np.bitwise_xor(row, term, out=row)
+
+        bad = np.flatnonzero(syndromes.any(axis=0))
+        if bad.size == 0:
+            return out, error_counts
+
+        locator, degree = _berlekamp_massey(np.ascontiguousarray(syndromes[:, bad].T))
+        del syndromes
+
+        # Chien araması: hata konumlayıcının kökleri 1/x_j noktalarındadır
+        error_mask = np.zeros((bad.size, count), dtype=bool)
+        for j, x_j in enumerate(xs):
+            mul_z = GF_MUL[GF_INV[x_j]]
+            value = locator[:, -1].copy()
+            for power in range(locator.shape[1] - 2, -1, -1):
+                value = mul_z[value] ^ locator[:, power]
+            error_mask[:, j] = value == 0
+
+        found = error_mask.sum(axis=1)
+        uncorrectable = (found != degree) | (degree > redundancy // 2)
+        if uncorrectable.any():
+            raise ValueError(f"{int(uncorrectable.sum())} konumda hata düzeltme kapasitesi aşıldı")
+
+        error_counts += error_mask.sum(axis=0)
+
+        # Aynı hata desenine sahip konumları tek bir Lagrange birleştirmesiyle düzelt
+        # (desenler satır olarak gruplanır; 63'ten fazla payda bit maskesi taşardı)
+        patterns, group = np.unique(error_mask, axis=0, return_inverse=True)
+        group = group.reshape(-1)
+        for idx, mask in enumerate(patterns):
+            positions = bad[group == idx]
+            good = np.flatnonzero(~mask)[:threshold]
+            out[positions] = ShamirEngine.recover([shares[j][positions] for j in good],
+                                                  [xs[j] for j in good])
+
+        return out, error_counts
@@ -0,0 +1,281 @@
+"""
+Pay Dosya Formatı
+Sürümlü ikili pay kabı: sabit başlık + parça tablosu + ham pay baytları
+"""
+
+import hashlib
+import struct
+import numpy as np
+
+SHARE_MAGIC = b"SISS"
+# Sürüm 2: bayrak verilirse boyutlardan sonra orijinal piksellerin özeti gelir
+SHARE_FORMAT_VERSION = 2
+
+FLAG_PIXEL_DIGEST = 0x01
+PIXEL_DIGEST_SIZE = 32
+
+# magic, sürüm, şema, dtype, x, k, n, boyut sayısı, bayraklar, başlık uzunluğu
+_PREFIX = struct.Struct("<4sBBBBBBBBI")
+_DIM = struct.Struct("<I")
+_COUNT = struct.Struct("<I")
+# bölüm, başlangıç satırı, satır sayısı, dosya ofseti, uzunluk
+_CHUNK = struct.Struct("<IIIQQ")
+
+SCHEME_CODES = {"gf256": 1, "thien_lin": 2, "xor": 3, "secretsharing": 4}
+SCHEME_NAMES = {code: name for name, code in SCHEME_CODES.items()}
+# "ascii": SecretSharer string payları, satır sonu ile ayrılmış ASCII metin olarak saklanır
+DTYPE_CODES = {"uint8": 1, "ascii": 2}
+DTYPE_NAMES = {code: name for name, code in DTYPE_CODES.items()}
+
+
+class ShareFormat:
+    """İkili pay kabını yazan ve okuyan yardımcı sınıf"""
+
+    PREFIX_SIZE = _PREFIX.size
+
+    @staticmethod
+    def header_size(ndim: int, chunk_count: int, digest: bool = False) -> int:
+        """Başlığın (parça tablosu dahil) bayt cinsinden uzunluğu"""
+        return (_PREFIX.size + ndim * _DIM.size + (PIXEL_DIGEST_SIZE if digest else 0)
+                + _COUNT.size + chunk_count * _CHUNK.size)
+
+    @staticmethod
+    def digest_offset(ndim: int) -> int:
+        """Piksel özetinin dosya başına göre ofseti"""
+        return _PREFIX.size + ndim * _DIM.size
+
+    @staticmethod
+    def pixel_hasher(original_shape: tuple):
+        """Orijinal pikseller için artımlı özet nesnesi; satırlar sırayla update ile beslenir"""
+        hasher = hashlib.blake2b(digest_size=PIXEL_DIGEST_SIZE)
+        hasher.update(b"".join(_DIM.pack(int(dim)) for dim in original_shape))
+        return hasher
+
+    @staticmethod
+    def pixel_digest(image: np.ndarray) -> bytes:
+        """Görüntünün boyutu ve ham baytları üzerinden BLAKE2b-256 özeti"""
+        image = np.ascontiguousarray(image, dtype=np.uint8)
+        hasher = ShareFormat.pixel_hasher(image.shape)
+        hasher.update(memoryview(image).cast("B"))
+        return hasher.digest()
+
+    @staticmethod
+    def row_chunks(original_shape: tuple, strip_rows: int = None, section: int = 0,
+                   base_offset: int = 0):
+        """Satır şeritlerini (bölüm, satır, satır sayısı, göreli ofset, uzunluk) olarak listele"""
+        height = original_shape[0]
+        row_bytes = int(np.prod(original_shape[1:], dtype=np.int64))
+        strip_rows = strip_rows or max(height, 1)
+        chunks = []
+        offset = base_offset
+        for row in range(0, height, strip_rows):
+            rows = min(strip_rows, height - row)
+            chunks.append((section, row, rows, offset, rows * row_bytes))
+            offset += rows * row_bytes
+        return chunks
+
+    @staticmethod
+    def level_shape(original_shape: tuple, section: int) -> tuple:
+        """Piramit bölümünün boyutu: bölüm s, her kenarı 2^s kat küçültülmüş görüntüdür"""
+        scale = 1 << int(section)
+        height, width = original_shape[:2]
+        return (-(-height // scale), -(-width // scale)) + tuple(original_shape[2:])
+
+    @staticmethod
+    def default_chunks(original_shape: tuple, payload_size: int, section: int = 0,
+                       base_offset: int = 0):
+        """Yük görüntüyle aynı boyuttaysa tek satır şeridi, değilse (ör. 1/k paylar) tek düz parça"""
+        shape = ShareFormat.level_shape(original_shape, section)
+        if payload_size == int(np.prod(shape, dtype=np.int64)):
+            return ShareFormat.row_chunks(shape, section=section, base_offset=base_offset)
+        return [(section, 0, int(shape[0]), base_offset, int(payload_size))]
+
+    @staticmethod
+    def _payload_layout(original_shape: tuple, share_data):
+        """Yükü (parça tablosu, yazılacak diziler) olarak hazırla
+
+        share_data tek bir dizi ya da {bölüm: dizi} sözlüğü (çözünürlük piramidi) olabilir;
+        piramitte kaba bölümler önce yazılır ki önizleme dosyanın başından okunabilsin.
+        """
+        if not isinstance(share_data, dict):
+            share_data = {0: share_data}
+        chunks = []
+        payloads = []
+        offset = 0
+        for section in sorted(share_data, reverse=True):
+            payload = share_data[section]
+            if isinstance(payload, (list, tuple)) and payload and isinstance(payload[0], str):
+                payload = np.frombuffer("\n".join(payload).encode("ascii"), dtype=np.uint8)
+            payload = np.ascontiguousarray(payload, dtype=np.uint8)
+            chunks.extend(ShareFormat.default_chunks(original_shape, payload.size, section, offset))
+            payloads.append(payload)
+            offset += payload.nbytes
+        return chunks, payloads
+
+    @staticmethod
+    def pack_header(meta: dict, chunks: list = None) -> bytes:
+        """Başlığı oluştur; parça ofsetleri yükün başına göre verilir ve mutlak ofsete çevrilir"""
+        shape = tuple(int(dim) for dim in meta["original_shape"])
+        if chunks is None:
+            chunks = ShareFormat.row_chunks(shape)
+        digest = meta.get("pixel_digest")
+        if digest is not None and len(digest) != PIXEL_DIGEST_SIZE:
+            raise ValueError("Piksel özeti 32 bayt olmalı")
+        size = ShareFormat.header_size(len(shape), len(chunks), digest is not None)
+
+        parts = [
+            _PREFIX.pack(
+                SHARE_MAGIC,
+                SHARE_FORMAT_VERSION,
+                SCHEME_CODES[meta.get("scheme", "gf256")],
+                DTYPE_CODES[meta.get("dtype", "uint8")],
+                int(meta["share_x"]),
+                int(meta["threshold"] or 0),
+                int(meta["num_shares"] or 0),
+                len(shape),
+                FLAG_PIXEL_DIGEST if digest is not None else 0,
+                size,
+            )
+        ]
+        parts.extend(_DIM.pack(dim) for dim in shape)
+        if digest is not None:
+            parts.append(bytes(digest))
+        parts.append(_COUNT.pack(len(chunks)))
+        parts.extend(_CHUNK.pack(section, row, rows, size + offset, length)
+                     for section, row, rows, offset, length in chunks)
+        return b"".join(parts)
+
+    @staticmethod
+    def is_share_container(data: bytes) -> bool:
+        """Verinin pay kabı ile başlayıp başlamadığını kontrol et"""
+        return bytes(data[:len(SHARE_MAGIC)]) == SHARE_MAGIC
+
+    @staticmethod
+    def parse_header(data) -> dict:
+        """Başlığı çözümle; data en az başlık uzunluğu kadar olmalı"""
+        if len(data) < _PREFIX.size:
+            raise ValueError("Geçersiz dosya formatı")
+        (magic, version, scheme, dtype, share_x, threshold, num_shares,
+         ndim, flags, size) = _PREFIX.unpack_from(data, 0)
+        if magic != SHARE_MAGIC:
+            raise ValueError("Geçersiz dosya formatı")
+        if version > SHARE_FORMAT_VERSION:
+            raise ValueError(f"Desteklenmeyen pay formatı sürümü: {version}")
+        if len(data) < size:
+            raise ValueError("Pay başlığı eksik")
+
+        offset = _PREFIX.size
+        shape = []
+        for _ in range(ndim):
+            shape.append(_DIM.unpack_from(data, offset)[0])
+            offset += _DIM.size
+        digest = None
+        if version >= 2 and flags & FLAG_PIXEL_DIGEST:
+            digest = bytes(data[offset:offset + PIXEL_DIGEST_SIZE])
+            offset += PIXEL_DIGEST_SIZE
+        (chunk_count,) = _COUNT.unpack_from(data, offset)
+        offset += _COUNT.size
+        chunks = [_CHUNK.unpack_from(data, offset + idx * _CHUNK.size) for idx in range(chunk_count)]
+
+        return {
+            "version": version,
+            "scheme": SCHEME_NAMES[scheme],
+            "dtype": DTYPE_NAMES[dtype],
+            "share_x": share_x,
+            "threshold": threshold,
+            "num_shares": num_shares,
+            "original_shape": tuple(shape),
+            "flags": flags,
+            "pixel_digest": digest,
+            "header_size": size,
+            "chunks": chunks,
+        }
+
+    @staticmethod
+    def read_header(share_file) -> dict:
+        """Açık dosyanın başından başlığı oku; dosya yükün başında konumlanır"""
+        prefix = share_file.read(_PREFIX.size)
+        if len(prefix) < _PREFIX.size or not ShareFormat.is_share_container(prefix):
+            raise ValueError("Geçersiz dosya formatı")
+        size = _PREFIX.unpack(prefix)[-1]
+        return ShareFormat.parse_header(prefix + share_file.read(size - _PREFIX.size))
+
+    @staticmethod
+    def iter_buffers(meta: dict, share_data, chunks: list = None):
+        """Pay kabını sırasıyla başlık ve ham yük tamponları (memoryview) olarak üret"""
+        layout, payloads = ShareFormat._payload_layout(meta["original_shape"], share_data)
+        yield ShareFormat.pack_header(meta, chunks or layout)
+        for payload in payloads:
+            yield memoryview(payload).cast("B")
+
+    @staticmethod
+    def write(share_file, meta: dict, share_data, chunks: list = None):
+        """Başlığı ve ham pay baytlarını kopyasız olarak dosyaya yaz"""
+        for buffer in ShareFormat.iter_buffers(meta, share_data, chunks):
+            share_file.write(buffer)
+
+    @staticmethod
+    def dumps(meta: dict, share_data, chunks: list = None) -> bytearray:
+        """Pay kabını bellekte tek bir tampon olarak oluştur (şifreleme için)"""
+        layout, payloads = ShareFormat._payload_layout(meta["original_shape"], share_data)
+        header = ShareFormat.pack_header(meta, chunks or layout)
+        buffer = bytearray(len(header) + sum(payload.nbytes for payload in payloads))
+        buffer[:len(header)] = header
+        offset = len(header)
+        for payload in payloads:
+            buffer[offset:offset + payload.nbytes] = memoryview(payload).cast("B")
+            offset += payload.nbytes
+        return buffer
+
+    @staticmethod
+    def section_spans(header: dict) -> dict:
+        """Her bölümün dosyadaki (ofset, uzunluk) aralığı; bölüm parçaları ardışıktır"""
+        spans = {}
+        for section, _, _, offset, length in header["chunks"]:
+            start, end = spans.get(section, (offset, offset))
+            spans[section] = (min(start, offset), max(end, offset + length))
+        return {section: (start, end - start) for section, (start, end) in spans.items()}
+
+    @staticmethod
+    def loads(data) -> dict:
+        """Pay kabını çöz; share_data, verinin üzerinde np.frombuffer görünümüdür
+
+        Piramitli paylarda tüm bölümler "sections" altında {bölüm: görünüm} olarak döner,
+        share_data tam çözünürlük (bölüm 0) görünümüdür.
+        """
+        header = ShareFormat.parse_header(data)
+        spans = ShareFormat.section_spans(header)
+        if header["dtype"] == "ascii":
+            sections = {
+                section: bytes(data[offset:offset + length]).decode("ascii").split("\n")
+                for section, (offset, length) in spans.items()
+            }
+        else:
+            sections = {
+                section: np.frombuffer(data, dtype=header["dtype"], count=length, offset=offset)
+                for section, (offset, length) in spans.items()
+            }
+        wrapped = dict(header)
+        wrapped["share_data"] = sections[0]
+        wrapped["sections"] = sections
+        return wrapped
+
+    @staticmethod
+    def row_span(header: dict, row_start: int, row_stop: int, section: int = 0):
+        """[row_start, row_stop) satırlarının dosyadaki (ofset, uzunluk) aralığını parça tablosundan bul"""
+        height = header["original_shape"][0]
+        if not 0 <= row_start < row_stop <= height:
+            raise ValueError("Satır aralığı görüntü sınırları dışında")
+        row_bytes = int(np.prod(header["original_shape"][1:], dtype=np.int64))
+
+        start = stop = None
+        for chunk_section, chunk_row, chunk_rows, offset, length in header["chunks"]:
+            if chunk_section != section:
+                continue
+            if chunk_row <= row_start < chunk_row + chunk_rows:
+                start = offset + (row_start - chunk_row) * row_bytes
+            if chunk_row < row_stop <= chunk_row + chunk_rows:
+                stop = offset + (row_stop - chunk_row) * row_bytes
+        if start is None or stop is None:
+            raise ValueError("Parça tablosu istenen satırları kapsamıyor")
+        return start, stop - start
@@ -0,0 +1,262 @@
+"""
+Pay Deposu
+Görüntü içeriğinden türetilen kimlikle ad alanına ayrılmış pay kümeleri ve SQLite dizini
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from .file_service import FileService
+
+INDEX_FILE = "index.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS shares (
+    image_id   TEXT    NOT NULL,
+    x          INTEGER NOT NULL,
+    threshold  INTEGER NOT NULL,
+    num_shares INTEGER NOT NULL,
+    scheme     TEXT    NOT NULL,
+    shape      TEXT    NOT NULL,
+    size       INTEGER NOT NULL,
+    checksum   TEXT    NOT NULL,
+    path       TEXT    NOT NULL,
+    created    REAL    NOT NULL,
+    PRIMARY KEY (image_id, x)
+);
+CREATE INDEX IF NOT EXISTS shares_created ON shares (created);
+"""
+
+
+class ShareStore:
+    """shares/<kimlik>/share_<x>.bin düzeninde pay kümelerini saklayan depo
+
+    Her pay dosyası için (kimlik, x, k, n, şema, boyut, bayt, sağlama toplamı) dizinde
+    tutulur; "X görüntüsünün k payını bul" dizin taraması yerine indeksli sorgudur.
+    """
+
+    def __init__(self, root: str = "shares"):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        # Depo eşzamanlı arka plan işlerinden de kullanılır; bağlantıya erişim ve klasör
+        # değiştirme tek bir kilitle sıralanır
+        self._lock = threading.RLock()
+        self._db = sqlite3.connect(os.path.join(root, INDEX_FILE), check_same_thread=False)
+        self._db.executescript(_SCHEMA)
+
+    def _query(self, sql: str, params: tuple = ()) -> list:
+        """Kilit altında sorgu çalıştırıp tüm satırları döndür"""
+        with self._lock:
+            return self._db.execute(sql, params).fetchall()
+
+    @staticmethod
+    def image_id(image_path: str) -> str:
+        """Görüntü dosyasının içeriğinden 16 karakterlik kimlik türet"""
+        digest = hashlib.blake2b(digest_size=8)
+        with open(image_path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    @staticmethod
+    def file_checksum(file_path: str) -> str:
+        """Pay dosyasının SHA-256 özeti"""
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def directory(self, image_id: str) -> str:
+        """Kimliğe ait pay klasörü"""
+        return os.path.join(self.root, image_id)
+
+    def put_batch(self, image_id: str, share_data_list: list, share_images: list, original_shape: tuple,
+                  password_required: bool, password: str = None, threshold: int = None,
+                  scheme: str = "secretsharing", num_shares: int = None, key_batch: dict = None,
+                  progress=None, pixel_digest: bytes = None) -> list:
+        """Pay kümesini kimliğin klasörüne yaz ve dizine kaydet; aynı kimliğin eski kümesi değiştirilir
+
+        Küme önce geçici klasöre yazılır; yazma başarısız olur ya da iptal edilirse eski küme
+        ve dizin kayıtları olduğu gibi kalır.
+        """
+        num_shares = num_shares or len(share_data_list)
+        staging = ShareStore.staging_directory(self.root, image_id)
+        try:
+            staged_paths = FileService.save_share_batch(
+                share_data_list, share_images, original_shape, password_required, password,
+                threshold=threshold, scheme=scheme, num_shares=num_shares, key_batch=key_batch,
+                progress=progress, directory=staging, pixel_digest=pixel_digest
+            )
+        except BaseException:
+            # Yarım kalan (ör. iptal edilen) küme diskte bırakılmaz
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+        return self.commit_staging(image_id, staging, staged_paths, original_shape, threshold, scheme,
+                                   num_shares)
+
+    def commit_staging(self, image_id: str, staging: str, staged_paths: list, original_shape: tuple,
+                       threshold: int = None, scheme: str = "secretsharing", num_shares: int = None) -> list:
+        """staging_directory'ye yazılmış kümeyi kimliğin klasörüne taşı ve dizine kaydet
+
+        Hata olursa geçici klasör silinir, eski küme ve dizin kayıtları yerinde kalır.
+        Kimliğin klasöründeki pay yollarını döndürür.
+        """
+        target = self.directory(image_id)
+        paths = [os.path.join(target, os.path.basename(path)) for path in staged_paths]
+        try:
+            # Sağlama toplamları kilit dışında hesaplanır; kilit yalnızca yer değiştirme ve dizin
+            # işlemi boyunca tutulur
+            rows = ShareStore._index_rows(image_id, paths, original_shape, threshold, scheme,
+                                          num_shares or len(paths), source_paths=staged_paths)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        with self._lock:
+            ShareStore.replace_directory(staging, target, commit=lambda: self._write_rows(image_id, rows))
+        return paths
+
+    @staticmethod
+    def staging_directory(root: str, image_id: str) -> str:
+        """Kimlik için deponun kökünde benzersiz geçici klasör oluştur"""
+        os.makedirs(root, exist_ok=True)
+        return tempfile.mkdtemp(dir=root, prefix=f".{image_id}.", suffix=".tmp")
+
+    @staticmethod
+    def replace_directory(staging: str, target: str, commit=None):
+        """Geçici klasörü hedefin yerine koy; eski klasör ancak commit başarılı olursa silinir
+
+        commit (ör. dizin kaydı) hata verirse eski klasör geri konur.
+        """
+        backup = None
+        if os.path.exists(target):
+            backup = staging + ".old"
+            os.rename(target, backup)
+        try:
+            os.rename(staging, target)
+            if commit is not None:
+                commit()
+        except BaseException:
+            shutil.rmtree(target if not os.path.exists(staging) else staging, ignore_errors=True)
+            if backup is not None:
+                os.rename(backup, target)
+            raise
+        if backup is not None:
+            shutil.rmtree(backup, ignore_errors=True)
+
+    def register(self, image_id: str, paths: list, original_shape: tuple, threshold: int = None,
+                 scheme: str = "secretsharing", num_shares: int = None):
+        """Başka bir süreçte kimliğin klasörüne yazılmış pay dosyalarını dizine kaydet
+
+        paths pay sırasındadır (paths[i] x = i + 1 payıdır).
+        """
+        rows = ShareStore._index_rows(image_id, paths, original_shape, threshold, scheme, num_shares)
+        self._write_rows(image_id, rows)
+
+    @staticmethod
+    def _index_rows(image_id: str, paths: list, original_shape: tuple, threshold: int = None,
+                    scheme: str = "secretsharing", num_shares: int = None, source_paths: list = None) -> list:
+        """Dizin satırlarını hazırla; bayt ve sağlama toplamı source_paths'ten (varsayılan paths) okunur"""
+        created = time.time()
+        shape = json.dumps([int(dim) for dim in original_shape])
+        return [
+            (image_id, share_idx + 1, int(threshold or 0), int(num_shares or len(paths)), scheme, shape,
+             os.path.getsize(source), ShareStore.file_checksum(source), path, created)
+            for share_idx, (path, source) in enumerate(zip(paths, source_paths or paths))
+        ]
+
+    def _write_rows(self, image_id: str, rows: list):
+        """Kimliğin dizin kayıtlarını tek işlemde rows ile değiştir"""
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM shares WHERE image_id = ?", (image_id,))
+            self._db.executemany("INSERT OR REPLACE INTO shares VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+    def find(self, image_id: str, count: int = None) -> list:
+        """Kimliğin pay dosyalarını x sırasıyla döndür; count verilirse ilk count pay"""
+        rows = self._query(
+            "SELECT path FROM shares WHERE image_id = ? ORDER BY x LIMIT ?",
+            (image_id, -1 if count is None else int(count))
+        )
+        return [path for (path,) in rows]
+
+    def describe(self, image_id: str):
+        """Pay kümesinin özeti: k, n, şema, boyut, toplam bayt, oluşturulma zamanı (yoksa None)"""
+        rows = self._query(
+            "SELECT threshold, num_shares, scheme, shape, SUM(size), MIN(created), COUNT(*) "
+            "FROM shares WHERE image_id = ? GROUP BY image_id", (image_id,)
+        )
+        if not rows:
+            return None
+        threshold, num_shares, scheme, shape, size, created, stored = rows[0]
+        return {
+            "image_id": image_id,
+            "threshold": threshold,
+            "num_shares": num_shares,
+            "scheme": scheme,
+            "original_shape": tuple(json.loads(shape)),
+            "size": size,
+            "created": created,
+            "stored_shares": stored,
+        }
+
+    def verify(self, image_id: str) -> dict:
+        """Her pay dosyasının sağlama toplamını dizindekiyle karşılaştır: {x: geçerli mi}"""
+        rows = self._query("SELECT x, path, checksum FROM shares WHERE image_id = ? ORDER BY x", (image_id,))
+        return {
+            x: os.path.exists(path) and ShareStore.file_checksum(path) == checksum
+            for x, path, checksum in rows
+        }
+
+    def image_ids(self) -> list:
+        """Depodaki kimlikler, en eskiden en yeniye"""
+        rows = self._query("SELECT image_id FROM shares GROUP BY image_id ORDER BY MIN(created)")
+        return [image_id for (image_id,) in rows]
+
+    def total_size(self) -> int:
+        """Dizindeki tüm pay dosyalarının bayt cinsinden toplamı"""
+        return self._query("SELECT COALESCE(SUM(size), 0) FROM shares")[0][0]
+
+    def remove(self, image_id: str):
+        """Kimliğin pay klasörünü ve dizin kayıtlarını sil"""
+        with self._lock, self._db:
+            shutil.rmtree(self.directory(image_id), ignore_errors=True)
+            self._db.execute("DELETE FROM shares WHERE image_id = ?", (image_id,))
+
+    def evict(self, max_age: float = None, max_bytes: int = None) -> list:
+        """Eski pay kümelerini sil: max_age saniyeden eski olanlar, sonra kota aşılırsa en eskiler
+
+        Silinen kimlikleri döndürür.
+        """
+        rows = self._query(
+            "SELECT image_id, MIN(created), SUM(size) FROM shares GROUP BY image_id ORDER BY MIN(created)"
+        )
+        total = sum(size for _, _, size in rows)
+        cutoff = time.time() - max_age if max_age is not None else None
+
+        evicted = []
+        for image_id, created, size in rows:
+            expired = cutoff is not None and created < cutoff
+            over_quota = max_bytes is not None and total > max_bytes
+            if not (expired or over_quota):
+                continue
+            self.remove(image_id)
+            evicted.append(image_id)
+            total -= size
+        return evicted
+
+    def close(self):
+        """Dizin bağlantısını kapat"""
+        with self._lock:
+            self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,113 @@
+"""
+Thien-Lin Motoru
+GF(2^8) üzerinde (k, n) Thien-Lin görüntü paylaşımı: her pay görüntünün yaklaşık 1/k'sı kadardır
+"""
+
+from functools import lru_cache
+import numpy as np
+from .shamir_engine import GF_MUL, GF_INV
+
+
+@lru_cache(maxsize=128)
+def _inverse_vandermonde(xs: tuple) -> tuple:
+    """V[j, i] = x_j^i matrisinin GF(2^8) içindeki tersini Gauss eliminasyonu ile hesapla"""
+    size = len(xs)
+    if len(set(xs)) != size:
+        raise ValueError("Aynı x değerine sahip paylar birlikte kullanılamaz")
+
+    matrix = []
+    for x in xs:
+        row = [1]
+        for _ in range(size - 1):
+            row.append(int(GF_MUL[row[-1], x]))
+        matrix.append(row + [1 if col == len(matrix) else 0 for col in range(size)])
+
+    for col in range(size):
+        pivot = next(row for row in range(col, size) if matrix[row][col])
+        matrix[col], matrix[pivot] = matrix[pivot], matrix[col]
+        inverse = int(GF_INV[matrix[col][col]])
+        matrix[col] = [int(GF_MUL[inverse, value]) for value in matrix[col]]
+        for row in range(size):
+            factor = matrix[row][col]
+            if row != col and factor:
+                matrix[row] = [value ^ int(GF_MUL[factor, pivot_value])
+                               for value, pivot_value in zip(matrix[row], matrix[col])]
+
+    return tuple(tuple(row[size:]) for row in matrix)
+
+
+class ThienLinEngine:
+    """Polinomun k katsayısının tamamını piksel verisi için kullanan paylaşım motoru
+
+    Shamir'den farklı olarak rastgele katsayı yoktur: k ardışık bayt bir polinomun
+    katsayılarını oluşturur. Bu nedenle paylar 1/k boyutundadır, ancak k'dan az pay
+    bilgi sızdırabilir (ramp şeması).
+    """
+
+    @staticmethod
+    def share_size(secret_size: int, threshold: int) -> int:
+        """Bir payın bayt cinsinden boyutu"""
+        return -(-secret_size // threshold)
+
+    @staticmethod
+    def split(secret: np.ndarray, threshold: int, num_shares: int) -> np.ndarray:
+        """Gizli veriyi k baytlık gruplara ayırıp her grubu x = 1..n noktalarında değerlendir
+
+        Dönüş değeri (n, ceil(N/k)) boyutlu uint8 dizisidir.
+        """
+        if not 1 <= threshold <= num_shares:
+            raise ValueError("Minimum parça sayısı 1 ile toplam parça sayısı arasında olmalı")
+        if num_shares > 255:
+            raise ValueError("GF(2^8) en fazla 255 pay destekler")
+
+        secret = np.ascontiguousarray(secret, dtype=np.uint8).reshape(-1)
+        groups = ThienLinEngine.share_size(secret.size, threshold)
+
+        # (k, G) katsayı matrisi: i. satır her grubun i. baytı (son grup sıfırla doldurulur)
+        padded = np.zeros(groups * threshold, dtype=np.uint8)
+        padded[:secret.size] = secret
+        coefficients = np.ascontiguousarray(padded.reshape(groups, threshold).T)
+
+        shares = np.empty((num_shares, groups), dtype=np.uint8)
+        for share_idx in range(num_shares):
+            mul_x = GF_MUL[share_idx + 1]
+            acc = shares[share_idx]
+            acc[:] = coefficients[threshold - 1]
+            for degree in range(threshold - 2, -1, -1):
+                np.take(mul_x, acc, out=acc)
+                np.bitwise_xor(acc, coefficients[degree], out=acc)
+
+        return shares
+
+    @staticmethod
+    def recover(shares, xs, secret_size: int, out: np.ndarray = None) -> np.ndarray:
+        """k paydan tüm polinom katsayılarını (ters Vandermonde ile) çözüp gizli veriyi birleştir"""
+        xs = tuple(int(x) for x in xs)
+        threshold = len(xs)
+        if len(shares) != threshold:
+            raise ValueError("Pay sayısı ile x koordinatı sayısı eşleşmiyor")
+        inverse = _inverse_vandermonde(xs)
+
+        shares = [np.asarray(share, dtype=np.uint8).reshape(-1) for share in shares]
+        groups = shares[0].size
+        if groups != ThienLinEngine.share_size(secret_size, threshold):
+            raise ValueError("Pay boyutu minimum parça sayısıyla uyuşmuyor")
+
+        if out is None:
+            out = np.empty(secret_size, dtype=np.uint8)
+        padded = out if out.size == groups * threshold else np.empty(groups * threshold, dtype=np.uint8)
+        grouped = padded.reshape(groups, threshold)
+
+        coefficient = np.empty(groups, dtype=np.uint8)
+        term = np.empty(groups, dtype=np.uint8)
+        for degree, weights in enumerate(inverse):
+            coefficient.fill(0)
+            for weight, share in zip(weights, shares):
+                if weight:
+                    np.take(GF_MUL[weight], share, out=term)
+                    np.bitwise_xor(coefficient, term, out=coefficient)
+            grouped[:, degree] = coefficient
+
+        if padded is not out:
+            out[:] = padded[:secret_size]
+        return out
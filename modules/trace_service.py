@@ -0,0 +1,324 @@
+"""
+İzleme Servisi
+İç içe zamanlama aralıkları (span), aralık başına tracemalloc bellek tepe değeri ve
+dışa aktarım (JSON-lines izleme dosyası, Prometheus metin biçimi)
+"""
+
+from collections import deque
+import contextvars
+import functools
+import itertools
+import json
+import os
+import threading
+import time
+import tracemalloc
+
+MAX_SPANS = 10000
+# Ortam değişkenleri: SIS_TRACE=1 izlemeyi açar, SIS_TRACE_FILE JSON-lines dosyası,
+# SIS_TRACE_MEMORY=0 tracemalloc'u kapatır
+TRACE_ENV = "SIS_TRACE"
+TRACE_FILE_ENV = "SIS_TRACE_FILE"
+TRACE_MEMORY_ENV = "SIS_TRACE_MEMORY"
+
+_current_span = contextvars.ContextVar("sis_current_span", default=None)
+_span_ids = itertools.count(1)
+# Bellek ölçen açık aralıklar; tracemalloc tepe sayacı süreç genelinde tek olduğundan
+# sıfırlama ve örtüşme kararları bu kilit altında verilir
+_memory_spans = set()
+_memory_lock = threading.Lock()
+
+
+class Span:
+    """Tek bir zamanlama aralığı; with bloğu olarak kullanılır, bitince kaydediciye eklenir"""
+
+    __slots__ = ("name", "span_id", "parent", "attrs", "children", "thread", "start", "duration",
+                 "memory_peak", "error", "_t0", "_base", "_peak", "_token", "_overlap")
+
+    def __init__(self, name: str, attrs: dict):
+        self.name = name
+        self.span_id = next(_span_ids)
+        self.parent = None
+        self.attrs = attrs
+        self.children = []
+        self.thread = threading.current_thread().name
+        self.start = 0.0
+        self.duration = 0.0
+        self.memory_peak = None
+        self.error = None
+        self._base = self._peak = None
+        self._overlap = False
+
+    def ancestors(self) -> set:
+        """Üst aralıkların kümesi"""
+        result = set()
+        node = self.parent
+        while node is not None:
+            result.add(node)
+            node = node.parent
+        return result
+
+    def set(self, **attrs):
+        """Aralığa öznitelik ekle (ör. bayt sayısı)"""
+        self.attrs.update(attrs)
+
+    def __enter__(self):
+        self.parent = _current_span.get()
+        self._token = _current_span.set(self)
+        if TraceService.memory and tracemalloc.is_tracing():
+            # tracemalloc tek bir süreç geneli tepe değeri tutar. Açık aralıkların tümü bu aralığın
+            # üstleriyse üstlerin o ana kadarki tepesi saklanıp sayaç sıfırlanır. Başka bir iş
+            # parçacığında üst olmayan aralık açıksa sayaç sıfırlanmaz; tepe değeri ikisinin
+            # tahsislerini karıştıracağından örtüşen aralıklar bellek tepe değeri raporlamaz.
+            with _memory_lock:
+                ancestors = self.ancestors()
+                others = [span for span in _memory_spans if span not in ancestors]
+                current, peak = tracemalloc.get_traced_memory()
+                if others:
+                    self._overlap = True
+                    for span in others:
+                        span._overlap = True
+                else:
+                    for span in ancestors:
+                        if span._peak is not None:
+                            span._peak = max(span._peak, peak)
+                    tracemalloc.reset_peak()
+                    peak = current
+                self._base, self._peak = current, peak
+                _memory_spans.add(self)
+        self.start = time.time()
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.duration = time.perf_counter() - self._t0
+        if self._peak is not None:
+            with _memory_lock:
+                _memory_spans.discard(self)
+                if tracemalloc.is_tracing():
+                    self._peak = max(self._peak, tracemalloc.get_traced_memory()[1])
+                    if not self._overlap:
+                        self.memory_peak = self._peak - self._base
+                    if self.parent is not None and self.parent._peak is not None:
+                        self.parent._peak = max(self.parent._peak, self._peak)
+        if exc_type is not None:
+            self.error = exc_type.__name__
+        _current_span.reset(self._token)
+        if self.parent is not None:
+            self.parent.children.append(self)
+        TraceService.recorder.record(self)
+        return False
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "id": self.span_id,
+            "parent": self.parent.span_id if self.parent is not None else None,
+            "thread": self.thread,
+            "start": self.start,
+            "duration": self.duration,
+            "memory_peak": self.memory_peak,
+            "error": self.error,
+            "attrs": self.attrs,
+        }
+
+
+class _NullSpan:
+    """İzleme kapalıyken dönen, hiçbir şey yapmayan paylaşılan aralık"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set(self, **attrs):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class TraceRecorder:
+    """Biten aralıkları sınırlı bir halkada, aralık adına göre toplamları da sayaçlarda tutar
+
+    trace_file verilmişse her aralık bittiğinde JSON-lines satırı olarak dosyaya eklenir.
+    """
+
+    def __init__(self, max_spans: int = MAX_SPANS):
+        self.spans = deque(maxlen=max_spans)
+        self.trace_file = None
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def record(self, span: Span):
+        line = json.dumps(span.to_dict(), default=str) if self.trace_file else None
+        with self._lock:
+            self.spans.append(span)
+            stats = self._stats.get(span.name)
+            if stats is None:
+                stats = self._stats[span.name] = {"count": 0, "seconds": 0.0, "max": 0.0,
+                                                  "memory_peak": None, "errors": 0}
+            stats["count"] += 1
+            stats["seconds"] += span.duration
+            stats["max"] = max(stats["max"], span.duration)
+            if span.memory_peak is not None:
+                stats["memory_peak"] = max(stats["memory_peak"] or 0, span.memory_peak)
+            if span.error is not None:
+                stats["errors"] += 1
+            if line is not None:
+                with open(self.trace_file, "a", encoding="utf-8") as f:
+                    f.write(line + "\n")
+
+    def stats(self) -> dict:
+        """{aralık adı: {count, seconds, max, memory_peak, errors}} kopyası"""
+        with self._lock:
+            return {name: dict(values) for name, values in self._stats.items()}
+
+    def clear(self):
+        with self._lock:
+            self.spans.clear()
+            self._stats.clear()
+
+
+def traced(name: str):
+    """Fonksiyonu name adlı aralıkla sar; izleme kapalıyken yalnızca bir bayrak kontrolü yapılır"""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not TraceService.enabled:
+                return fn(*args, **kwargs)
+            with Span(name, {}):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class TraceService:
+    """Aşama bazlı izleme servisi (varsayılan olarak kapalı)"""
+
+    enabled = False
+    memory = False
+    recorder = TraceRecorder()
+    _started_tracemalloc = False
+
+    @staticmethod
+    def enable(memory: bool = True, trace_file: str = None):
+        """İzlemeyi aç; memory=True ise aralık başına bellek tepe değeri için tracemalloc başlatılır
+
+        tracemalloc tahsisleri belirgin biçimde yavaşlatır; yalnızca süre gerekiyorsa memory=False.
+        """
+        TraceService.recorder.trace_file = trace_file
+        if memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            TraceService._started_tracemalloc = True
+        TraceService.memory = memory
+        TraceService.enabled = True
+
+    @staticmethod
+    def enable_from_environment() -> bool:
+        """SIS_TRACE ortam değişkeni tanımlıysa izlemeyi aç"""
+        if os.environ.get(TRACE_ENV, "0") in ("", "0"):
+            return False
+        TraceService.enable(memory=os.environ.get(TRACE_MEMORY_ENV, "1") != "0",
+                            trace_file=os.environ.get(TRACE_FILE_ENV) or None)
+        return True
+
+    @staticmethod
+    def disable():
+        """İzlemeyi kapat; kaydedilmiş aralıklar dışa aktarım için korunur"""
+        TraceService.enabled = False
+        TraceService.memory = False
+        TraceService.recorder.trace_file = None
+        if TraceService._started_tracemalloc:
+            tracemalloc.stop()
+            TraceService._started_tracemalloc = False
+
+    @staticmethod
+    def span(name: str, **attrs):
+        """with TraceService.span("ad"): ... ile aralık aç; kapalıyken paylaşılan boş aralık döner"""
+        if not TraceService.enabled:
+            return _NULL_SPAN
+        return Span(name, attrs)
+
+    @staticmethod
+    def wrap(fn):
+        """fn'i geçerli aralığa bağla; iş parçacığı havuzuna gönderilen işler üst aralığın altına düşer
+
+        Her gönderim için ayrı çağrılmalıdır (bağlam kopyası aynı anda tek iş parçacığında çalışır).
+        """
+        if not TraceService.enabled:
+            return fn
+        return functools.partial(contextvars.copy_context().run, fn)
+
+    @staticmethod
+    def breakdown(span) -> list:
+        """Aralık ağacını aynı adlı kardeşleri birleştirerek satırlara dök (arayüz paneli için)
+
+        Her satır: {"name", "depth", "count", "seconds", "memory_peak"}; izleme kapalıyken boş liste.
+        """
+        if not isinstance(span, Span):
+            return []
+        rows = []
+
+        def walk(nodes, depth):
+            groups = {}
+            for node in nodes:
+                groups.setdefault(node.name, []).append(node)
+            for name, group in groups.items():
+                peaks = [node.memory_peak for node in group if node.memory_peak is not None]
+                rows.append({"name": name, "depth": depth, "count": len(group),
+                             "seconds": sum(node.duration for node in group),
+                             "memory_peak": max(peaks) if peaks else None})
+                walk(sorted((child for node in group for child in node.children), key=lambda c: c.start),
+                     depth + 1)
+
+        walk([span], 0)
+        return rows
+
+    @staticmethod
+    def export_jsonl(file_path: str) -> int:
+        """Kaydedilmiş aralıkları JSON-lines olarak yaz; yazılan satır sayısını döndür"""
+        spans = list(TraceService.recorder.spans)
+        with open(file_path, "w", encoding="utf-8") as f:
+            for span in spans:
+                f.write(json.dumps(span.to_dict(), default=str) + "\n")
+        return len(spans)
+
+    @staticmethod
+    def prometheus_text(prefix: str = "sis") -> str:
+        """Aralık toplamlarını Prometheus metin biçiminde döndür"""
+        stats = TraceService.recorder.stats()
+
+        def label(name):
+            escaped = name.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+            return f'{{span="{escaped}"}}'
+
+        lines = [
+            f"# HELP {prefix}_span_duration_seconds Aşama süresi (saniye)",
+            f"# TYPE {prefix}_span_duration_seconds summary",
+        ]
+        for name, values in sorted(stats.items()):
+            lines.append(f"{prefix}_span_duration_seconds_sum{label(name)} {values['seconds']:.9f}")
+            lines.append(f"{prefix}_span_duration_seconds_count{label(name)} {values['count']}")
+        lines += [
+            f"# HELP {prefix}_span_duration_max_seconds En uzun tek aralık süresi (saniye)",
+            f"# TYPE {prefix}_span_duration_max_seconds gauge",
+        ]
+        lines += [f"{prefix}_span_duration_max_seconds{label(name)} {values['max']:.9f}"
+                  for name, values in sorted(stats.items())]
+        lines += [
+            f"# HELP {prefix}_span_memory_peak_bytes Aralık içindeki en yüksek tracemalloc tepe değeri",
+            f"# TYPE {prefix}_span_memory_peak_bytes gauge",
+        ]
+        lines += [f"{prefix}_span_memory_peak_bytes{label(name)} {values['memory_peak']}"
+                  for name, values in sorted(stats.items()) if values["memory_peak"] is not None]
+        lines += [
+            f"# HELP {prefix}_span_errors_total Hata ile biten aralık sayısı",
+            f"# TYPE {prefix}_span_errors_total counter",
+        ]
+        lines += [f"{prefix}_span_errors_total{label(name)} {values['errors']}"
+                  for name, values in sorted(stats.items())]
+        return "\n".join(lines) + "\n"
@@ -6,20 +6,40 @@ Yeniden kullanılabilir UI bileşenleri ve widget'lar
 from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
                             QLabel, QPushButton, QSpinBox, QLineEdit, QCheckBox,
                             QGridLayout, QScrollArea, QProgressBar)
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtGui import QPixmap, QImage
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
-import cv2
 import numpy as np
+from .histogram_service import HistogramService
+
+
+def array_to_qimage(image: np.ndarray) -> QImage:
+    """BGR ya da gri tonlama uint8 diziyi kopyalamadan saran QImage
+
+    QImage dizinin belleğini kullanır; dizi QImage yaşadığı sürece tutulur.
+    """
+    image = np.ascontiguousarray(image)
+    height, width = image.shape[:2]
+    image_format = QImage.Format.Format_Grayscale8 if image.ndim == 2 else QImage.Format.Format_BGR888
+    qimg = QImage(image.data, width, height, image.strides[0], image_format)
+    qimg.source_array = image
+    return qimg
 
 class HistogramWindow(QMainWindow):
-    """Histogram görüntüleme penceresi"""
+    """Histogram görüntüleme penceresi
+
+    Her görüntü kendi satırında ayrı bir tuval olarak yer alır; satırlar yalnızca görünür
+    alana girdiklerinde çizilir ve histogramlar HistogramService önbelleğinden gelir.
+    """
+
+    ROW_HEIGHT = 400
     
     def __init__(self, images_dict):
         super().__init__()
         self.setWindowTitle("Görüntü Histogramları")
+        self._rows = []
         self.showMaximized()
         self.setup_ui(images_dict)
         
@@ -35,37 +55,34 @@ class HistogramWindow(QMainWindow):
         scroll.setWidgetResizable(True)
         scroll.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
         scroll.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
+        self._scroll = scroll
         
         scroll_widget = QWidget()
         scroll_layout = QVBoxLayout(scroll_widget)
         scroll_layout.setSpacing(20)
         
-        # Create figure for histograms
-        fig = Figure(figsize=(16, 4 * len(images_dict)))
-        canvas = FigureCanvas(fig)
-        
-        # Plot histograms for each image
-        for idx, (title, image) in enumerate(images_dict.items()):
-            if image is not None:
-                self.create_histogram_plots(fig, idx, title, image, len(images_dict))
+        # Her görüntü için boş bir satır tuvali; çizim görünür olunca yapılır
+        for title, image in images_dict.items():
+            if image is None:
+                continue
+            canvas = FigureCanvas(Figure(figsize=(16, 4)))
+            canvas.setMinimumHeight(self.ROW_HEIGHT)
+            canvas.setMouseTracking(True)
+            scroll_layout.addWidget(canvas)
+            self._rows.append({"canvas": canvas, "title": title, "image": image, "rendered": False})
         
-        # Adjust layout
-        fig.tight_layout(pad=2.0)
-        
-        # Add canvas to scroll layout
-        scroll_layout.addWidget(canvas)
         scroll_layout.addStretch()
         
         # Set scroll widget
         scroll.setWidget(scroll_widget)
         main_layout.addWidget(scroll)
+        scroll.verticalScrollBar().valueChanged.connect(self.render_visible_rows)
         
         # Set window style
         self.setStyleSheet(self.get_histogram_style())
         
         # Enable mouse wheel scrolling
         self.setMouseTracking(True)
-        canvas.setMouseTracking(True)
         
         # Connect mouse wheel event
         def wheelEvent(event):
@@ -76,6 +93,26 @@ class HistogramWindow(QMainWindow):
                 scroll_bar.setValue(scroll_bar.value() + 30)
         
         self.wheelEvent = wheelEvent
+        QTimer.singleShot(0, self.render_visible_rows)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.render_visible_rows()
+
+    def render_visible_rows(self, *_):
+        """Görünür alandaki (ve bir satır ötesindeki) çizilmemiş satırları çiz"""
+        if not self._rows:
+            return
+        top = self._scroll.verticalScrollBar().value()
+        bottom = top + self._scroll.viewport().height() + self.ROW_HEIGHT
+        for row in self._rows:
+            canvas = row["canvas"]
+            if row["rendered"] or canvas.y() + canvas.height() < top or canvas.y() > bottom:
+                continue
+            self.create_histogram_plots(canvas.figure, 0, row["title"], row["image"], 1)
+            canvas.figure.tight_layout(pad=2.0)
+            canvas.draw_idle()
+            row["rendered"] = True
     
     def create_histogram_plots(self, fig, idx, title, image, total_images):
         """Histogram grafiklerini oluştur"""
@@ -86,39 +123,20 @@ class HistogramWindow(QMainWindow):
         # Add vertical space between subplots
         fig.subplots_adjust(hspace=0.6)
         
-        # Convert image to RGB if it's BGR
-        if len(image.shape) == 3:
-            rgb_image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-        else:
-            rgb_image = image
+        # Histogramlar görüntü başına bir kez hesaplanır
+        histogram = HistogramService.get(image)
         
         # Plot RGB histogram
-        colors = ('r', 'g', 'b')
-        for i, color in enumerate(colors):
-            if len(rgb_image.shape) == 3:
-                hist = cv2.calcHist([rgb_image], [i], None, [256], [0, 256])
-                hist = hist.flatten()
-                if hist.max() > 0:
-                    hist = np.log1p(hist)
-                    hist = hist / hist.max() * 1000
-                ax1.plot(hist, color=color, linewidth=2, label=f'{color.upper()} Kanalı')
-            else:
-                hist = cv2.calcHist([rgb_image], [0], None, [256], [0, 256])
-                hist = hist.flatten()
-                if hist.max() > 0:
-                    hist = np.log1p(hist)
-                    hist = hist / hist.max() * 1000
-                ax1.plot(hist, color='gray', linewidth=2, label='Gri Tonlama')
-                break
+        if len(histogram["channels"]) == 3:
+            for color, counts in zip(('r', 'g', 'b'), histogram["channels"]):
+                ax1.plot(HistogramService.log_normalize(counts), color=color, linewidth=2,
+                         label=f'{color.upper()} Kanalı')
+        else:
+            ax1.plot(HistogramService.log_normalize(histogram["channels"][0]), color='gray',
+                     linewidth=2, label='Gri Tonlama')
         
         # Plot grayscale histogram
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        hist_gray = cv2.calcHist([gray], [0], None, [256], [0, 256])
-        hist_gray = hist_gray.flatten()
-        if hist_gray.max() > 0:
-            hist_gray = np.log1p(hist_gray)
-            hist_gray = hist_gray / hist_gray.max() * 1000
-        ax2.plot(hist_gray, color='gray', linewidth=2)
+        ax2.plot(HistogramService.log_normalize(histogram["gray"]), color='gray', linewidth=2)
         
         # Style for RGB histogram
         ax1.set_title(f"{title} - RGB Histogramı", fontsize=10, pad=10, y=0.98, 
@@ -144,9 +162,7 @@ class HistogramWindow(QMainWindow):
         ax2.tick_params(axis='y', labelsize=8)
         
         # Add statistics
-        mean_val = np.mean(gray)
-        std_val = np.std(gray)
-        ax2.text(0.02, 0.95, f'Ortalama: {mean_val:.1f}\nStd: {std_val:.1f}',
+        ax2.text(0.02, 0.95, f'Ortalama: {histogram["mean"]:.1f}\nStd: {histogram["std"]:.1f}',
                 transform=ax2.transAxes, fontsize=8,
                 verticalalignment='top', bbox=dict(boxstyle='round',
                 facecolor='white', alpha=0.8))
@@ -380,7 +396,31 @@ class MetricsPanel(QWidget):
             if col > 1:
                 col = 0
                 row += 1
+
+        # Aşama dökümü (TraceService açıkken doldurulur)
+        self.stage_label = QLabel("")
+        self.stage_label.setStyleSheet("""
+            font-size: 11px;
+            font-family: monospace;
+            color: #333;
+            border: none;
+        """)
+        self.stage_label.setVisible(False)
+        layout.addWidget(self.stage_label, row + 1, 0, 1, 4)
     
+    def update_stages(self, rows: list):
+        """Son işin aşama sürelerini ve bellek tepe değerlerini göster (TraceService.breakdown)"""
+        lines = []
+        for row in rows:
+            line = f"{'  ' * row['depth']}{row['name']}: {row['seconds'] * 1000:.1f} ms"
+            if row["count"] > 1:
+                line += f" ({row['count']}x)"
+            if row["memory_peak"] is not None:
+                line += f", tepe {row['memory_peak'] / 1024 / 1024:.1f} MB"
+            lines.append(line)
+        self.stage_label.setText("\n".join(lines))
+        self.stage_label.setVisible(bool(lines))
+
     def update_metric(self, metric_name: str, value):
         """Metrik değerini güncelle"""
         if metric_name == 'memory_usage':
@@ -0,0 +1,58 @@
+"""
+XOR Motoru
+(n, n) paylaşımı: n-1 rastgele maske ve bir XOR payı, polinom aritmetiği gerektirmez
+"""
+
+import os
+import numpy as np
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+from cryptography.hazmat.backends import default_backend
+
+# Anahtar akışı bu büyüklükte parçalar halinde üretilir (sıfır tamponu yeniden kullanılır)
+KEYSTREAM_CHUNK = 4 * 1024 * 1024
+
+
+class XorEngine:
+    """Eşik = pay sayısı olduğunda bellek bant genişliği hızında çalışan paylaşım motoru"""
+
+    @staticmethod
+    def fill_random(buffer: np.ndarray):
+        """Tamponu AES-256-CTR anahtar akışıyla (CSPRNG) doldur"""
+        flat = buffer.reshape(-1)
+        cipher = Cipher(algorithms.AES(os.urandom(32)), modes.CTR(os.urandom(16)),
+                        backend=default_backend())
+        encryptor = cipher.encryptor()
+        zeros = bytes(min(KEYSTREAM_CHUNK, flat.size))
+        for start in range(0, flat.size, KEYSTREAM_CHUNK):
+            stop = min(start + KEYSTREAM_CHUNK, flat.size)
+            keystream = encryptor.update(zeros[:stop - start])
+            flat[start:stop] = np.frombuffer(keystream, dtype=np.uint8)
+
+    @staticmethod
+    def split(secret: np.ndarray, num_shares: int) -> np.ndarray:
+        """n-1 rastgele maske ve gizli verinin tüm maskelerle XOR'unu üret, (n, N) döndür"""
+        if num_shares < 2:
+            raise ValueError("XOR paylaşımı en az 2 pay gerektirir")
+        if num_shares > 255:
+            raise ValueError("En fazla 255 pay desteklenir")
+
+        secret = np.ascontiguousarray(secret, dtype=np.uint8).reshape(-1)
+        shares = np.empty((num_shares, secret.size), dtype=np.uint8)
+        XorEngine.fill_random(shares[:-1])
+
+        last = shares[-1]
+        last[:] = secret
+        for pad in shares[:-1]:
+            np.bitwise_xor(last, pad, out=last)
+        return shares
+
+    @staticmethod
+    def recover(shares, out: np.ndarray = None) -> np.ndarray:
+        """Tüm payları XOR'layarak gizli veriyi geri elde et"""
+        first = np.asarray(shares[0], dtype=np.uint8).reshape(-1)
+        if out is None:
+            out = np.empty(first.size, dtype=np.uint8)
+        out[:] = first
+        for share in shares[1:]:
+            np.bitwise_xor(out, np.asarray(share, dtype=np.uint8).reshape(-1), out=out)
+        return out
@@ -0,0 +1,7 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _work_dir(tmp_path, monkeypatch):
+    """sis_log.txt gibi çalışma dizinine yazılan dosyalar depo köküne değil tmp_path'e düşsün"""
+    monkeypatch.chdir(tmp_path)
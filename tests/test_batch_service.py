@@ -0,0 +1,39 @@
+import shutil
+
+import cv2
+import numpy as np
+import pytest
+
+from modules import BatchService, FileService, ImageService
+
+
+@pytest.fixture
+def source(tmp_path):
+    source = tmp_path / "images"
+    source.mkdir()
+    rng = np.random.default_rng(0)
+    for name in ("a.png", "b.png"):
+        cv2.imwrite(str(source / name), rng.integers(0, 256, size=(6, 8, 3), dtype=np.uint8))
+    shutil.copy(source / "a.png", source / "a_copy.png")
+    return source
+
+
+@pytest.mark.parametrize("scheme", ["gf256", "secretsharing"])
+def test_share_directory_with_duplicate_images(tmp_path, source, scheme):
+    out = tmp_path / "shares"
+    summary = BatchService.share_directory(str(source), str(out), num_shares=3, threshold=2, scheme=scheme,
+                                           workers=2)
+    assert (summary["total"], summary["shared"], summary["failed"]) == (3, 3, 0)
+
+    manifest = BatchService.load_manifest(str(out))
+    entries = {key.rsplit("/", 1)[-1]: entry for key, entry in manifest["images"].items()}
+    assert entries["a.png"]["shares"] == entries["a_copy.png"]["shares"]
+    assert entries["a.png"]["image_id"] != entries["b.png"]["image_id"]
+
+    for name, entry in entries.items():
+        wrapped_shares, _ = FileService.load_share_files(entry["shares"][1:])
+        restored = ImageService.reconstruct_image_from_shares(wrapped_shares, 2)
+        assert np.array_equal(restored, cv2.imread(str(source / name)))
+
+    summary = BatchService.share_directory(str(source), str(out), num_shares=3, threshold=2, scheme=scheme)
+    assert (summary["shared"], summary["skipped"]) == (0, 3)
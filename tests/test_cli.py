@@ -0,0 +1,26 @@
+import cv2
+import numpy as np
+import pytest
+
+from modules.cli import main
+
+
+@pytest.fixture
+def image_path(tmp_path):
+    path = tmp_path / "image.png"
+    image = np.random.default_rng(0).integers(0, 256, size=(6, 8, 3), dtype=np.uint8)
+    cv2.imwrite(str(path), image)
+    return path
+
+
+@pytest.mark.parametrize("scheme", ["gf256", "thien_lin", "secretsharing"])
+def test_share_and_reconstruct(tmp_path, image_path, scheme):
+    out = tmp_path / "shares"
+    assert main(["share", str(image_path), "-n", "3", "-k", "2", "--scheme", scheme, "-o", str(out)]) == 0
+    assert sorted(path.name for path in out.iterdir()) == ["share_1.bin", "share_2.bin", "share_3.bin"]
+
+    restored = tmp_path / "restored.png"
+    shares = [str(out / "share_1.bin"), str(out / "share_3.bin")]
+    assert main(["reconstruct", *shares, "-o", str(restored)]) == 0
+    assert np.array_equal(cv2.imread(str(restored)), cv2.imread(str(image_path)))
+    assert main(["verify", *shares]) == 0
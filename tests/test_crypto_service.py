@@ -0,0 +1,112 @@
+import io
+import struct
+
+from cryptography.exceptions import InvalidTag
+import numpy as np
+import pytest
+
+from modules import CryptoService, FileService, ShareFormat
+from modules.crypto_service import KeyCache
+import modules.crypto_service as crypto_service
+
+
+@pytest.fixture
+def kdf_calls(monkeypatch):
+    calls = []
+    pbkdf2 = crypto_service.PBKDF2HMAC
+
+    def counting(*args, **kwargs):
+        calls.append(kwargs.get("salt"))
+        return pbkdf2(*args, **kwargs)
+
+    CryptoService.key_cache.clear()
+    monkeypatch.setattr(crypto_service, "PBKDF2HMAC", counting)
+    yield calls
+    CryptoService.key_cache.clear()
+
+
+def test_concurrent_load_derives_key_once(tmp_path, kdf_calls):
+    shares = np.random.default_rng(0).integers(0, 256, size=(6, 48), dtype=np.uint8)
+    paths = FileService.save_share_batch(list(shares), None, (4, 4, 3), True, "parola", threshold=2,
+                                         scheme="gf256", num_shares=6, directory=str(tmp_path))
+    assert len(kdf_calls) == 1
+
+    CryptoService.key_cache.clear()
+    wrapped_shares, encrypted = FileService.load_share_files(paths, "parola", workers=6)
+    assert encrypted
+    assert len(kdf_calls) == 2
+    assert np.array_equal(np.asarray(wrapped_shares[5]["share_data"]).reshape(-1), shares[5])
+
+
+PASSWORD = "parola"
+CHUNK = 16
+_SEALED = CHUNK + crypto_service.AEAD_TAG_SIZE
+
+
+@pytest.fixture
+def key_batch():
+    CryptoService.key_cache.clear()
+    yield CryptoService.create_key_batch(PASSWORD, iterations=1000)
+    CryptoService.key_cache.clear()
+
+
+def _seal(key_batch, data, cipher="aes-gcm"):
+    out = io.BytesIO()
+    CryptoService.encrypt_stream([data[:20], data[20:]], out, PASSWORD, key_batch, share_index=1,
+                                 cipher=cipher, chunk_size=CHUNK)
+    sealed = out.getvalue()
+    size = crypto_service.ENVELOPE_PROBE_SIZE
+    return sealed[:size], [sealed[idx:idx + _SEALED] for idx in range(size, len(sealed), _SEALED)]
+
+
+def _open(header, chunks):
+    data = header + b"".join(chunks)
+    return bytes(CryptoService.decrypt_stream(io.BytesIO(data), PASSWORD, len(data)))
+
+
+@pytest.mark.parametrize("cipher", sorted(crypto_service.AEAD_CIPHERS))
+@pytest.mark.parametrize("size", [0, CHUNK, 50])
+def test_aead_roundtrip(key_batch, cipher, size):
+    data = bytes(range(size))
+    header, chunks = _seal(key_batch, data, cipher)
+    assert len(chunks) == max(1, -(-size // CHUNK))
+    assert CryptoService.parse_envelope(header)["cipher"] == cipher
+    assert _open(header, chunks) == data
+
+
+@pytest.mark.parametrize("tamper", [
+    lambda chunks: [chunks[1], chunks[0]] + chunks[2:],
+    lambda chunks: chunks[:1] + chunks[2:],
+    lambda chunks: chunks[:-1],
+    lambda chunks: chunks[:-1] + [chunks[-1][:-1]],
+], ids=["reordered", "dropped", "truncated", "cut"])
+def test_aead_rejects_modified_chunks(key_batch, tamper):
+    header, chunks = _seal(key_batch, bytes(range(50)))
+    with pytest.raises(InvalidTag):
+        _open(header, tamper(chunks))
+
+
+def test_aead_header_is_authenticated(key_batch):
+    header, chunks = _seal(key_batch, bytes(range(50)))
+    # Tur sayısı değiştirilir ama önbellek aynı ana anahtarı verir; yalnızca AAD farklıdır
+    tampered = bytearray(header)
+    tampered[5:9] = struct.pack("<I", 1001)
+    CryptoService.key_cache.put(KeyCache.make_key(PASSWORD, key_batch["salt"], 1001), key_batch["master_key"])
+    with pytest.raises(InvalidTag):
+        _open(bytes(tampered), chunks)
+
+
+def test_v1_envelope_still_loads(tmp_path, key_batch):
+    shares = np.random.default_rng(0).integers(0, 256, size=48, dtype=np.uint8)
+    meta = {"original_shape": (4, 4, 3), "scheme": "gf256", "dtype": "uint8", "share_x": 2, "threshold": 2,
+            "num_shares": 3, "pixel_digest": None}
+    raw = bytes(ShareFormat.dumps(meta, shares))
+    path = tmp_path / "share_2.bin"
+    path.write_bytes(CryptoService.encrypt_payload(raw, PASSWORD, key_batch, share_index=2))
+
+    assert FileService.inspect_share(str(path))["version"] == crypto_service.ENCRYPTED_VERSION
+    wrapped, encrypted = FileService.load_share_file(str(path), PASSWORD)
+    assert encrypted
+    assert np.array_equal(np.asarray(wrapped["share_data"]).reshape(-1), shares)
+    with pytest.raises(ValueError):
+        FileService.load_share_file(str(path), "yanlış")
@@ -0,0 +1,50 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from modules import FileService
+
+
+class _Exploit:
+    """Yüklenirse marker dosyasını oluşturan pickle yükü"""
+
+    def __init__(self, marker):
+        self.marker = marker
+
+    def __reduce__(self):
+        return open, (self.marker, "w")
+
+
+def test_legacy_pickle_payload_is_rejected(tmp_path):
+    marker = tmp_path / "pwned"
+    share_path = tmp_path / "evil.bin"
+    share_path.write_bytes(pickle.dumps(_Exploit(str(marker)), protocol=4))
+
+    with pytest.raises(ValueError):
+        FileService.load_share_file(str(share_path))
+    with pytest.raises(ValueError):
+        FileService.load_share_file(str(share_path), password="parola")
+    with pytest.raises(ValueError):
+        FileService.load_share_files([str(share_path)])
+    assert not marker.exists()
+
+
+def test_legacy_pickle_requires_opt_in(tmp_path):
+    share_path = tmp_path / "share_1.bin"
+    wrapped = {"share_x": 1, "share_data": [1, 2, 3], "original_shape": (1, 1, 3), "password_required": False}
+    share_path.write_bytes(pickle.dumps(wrapped, protocol=4))
+
+    loaded, encrypted = FileService.load_share_file(str(share_path), allow_legacy_pickle=True)
+    assert loaded["share_data"] == [1, 2, 3]
+    assert encrypted is False
+
+
+def test_container_roundtrip(tmp_path):
+    shares = np.random.default_rng(0).integers(0, 256, size=(3, 48), dtype=np.uint8)
+    paths = FileService.save_share_batch(list(shares), None, (4, 4, 3), False, threshold=2, scheme="gf256",
+                                         num_shares=3, directory=str(tmp_path))
+    wrapped_shares, encrypted = FileService.load_share_files(paths)
+    assert not encrypted
+    assert [wrapped["share_x"] for wrapped in wrapped_shares] == [1, 2, 3]
+    assert np.array_equal(np.asarray(wrapped_shares[1]["share_data"]).reshape(-1), shares[1])
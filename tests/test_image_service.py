@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from modules import ImageService
+
+
+def _wrap(shares, original_shape, scheme="gf256", threshold=2):
+    return [
+        {"share_x": idx + 1, "share_data": share, "original_shape": original_shape,
+         "scheme": scheme, "threshold": threshold}
+        for idx, share in enumerate(shares)
+    ]
+
+
+@pytest.fixture
+def image():
+    return np.random.default_rng(0).integers(0, 256, size=(12, 16, 3), dtype=np.uint8)
+
+
+def test_gf256_reconstruct_roundtrip(image):
+    shares = ImageService.split_image_array(image, "gf256", 2, 3)
+    wrapped = _wrap(shares, image.shape)
+    restored = ImageService.reconstruct_image_from_shares(wrapped[1:], 2)
+    assert np.array_equal(restored, image)
+
+
+def test_gf256_reconstruct_rejects_too_few_shares(image):
+    shares = ImageService.split_image_array(image, "gf256", 2, 3)
+    wrapped = _wrap(shares, image.shape)
+    with pytest.raises(ValueError):
+        ImageService.reconstruct_image_from_shares(wrapped[:1], 2)
+
+
+def test_gf256_reconstruct_uses_header_threshold(image):
+    shares = ImageService.split_image_array(image, "gf256", 3, 4)
+    wrapped = _wrap(shares, image.shape, threshold=3)
+    with pytest.raises(ValueError):
+        ImageService.reconstruct_image_from_shares(wrapped[:2], 2)
+    assert np.array_equal(ImageService.reconstruct_image_from_shares(wrapped[1:], 2), image)
+
+
+def test_robust_reconstruct_with_exactly_k_shares(image):
+    shares = ImageService.split_image_array(image, "gf256", 3, 4)
+    wrapped = _wrap(shares, image.shape, threshold=3)
+    restored = ImageService.reconstruct_image_from_shares(wrapped[:3], 2, robust=True)
+    assert np.array_equal(restored, image)
@@ -0,0 +1,8 @@
+import modules
+
+
+def test_star_import_skips_lazy_ui_exports():
+    namespace = {}
+    exec("from modules import *", namespace)
+    assert "ImageService" in namespace
+    assert not set(modules._LAZY_EXPORTS) & set(modules.__all__)
@@ -0,0 +1,51 @@
+import cv2
+import numpy as np
+import pytest
+
+from modules import FileService, ImageService, ShareFormat
+
+
+@pytest.fixture
+def image_path(tmp_path):
+    path = tmp_path / "image.png"
+    cv2.imwrite(str(path), np.random.default_rng(0).integers(0, 256, size=(13, 10, 3), dtype=np.uint8))
+    return str(path)
+
+
+def _share(tmp_path, image_path, scheme, threshold=2, num_shares=3, levels=2):
+    shares, original_shape = ImageService.secret_image_sharing(image_path, num_shares, threshold, backend=scheme,
+                                                               pyramid_levels=levels)
+    assert sorted(shares) == list(range(levels + 1))
+    return FileService.save_share_batch(ImageService.share_data_list(shares, num_shares), None, original_shape,
+                                        False, threshold=threshold, scheme=scheme, num_shares=num_shares,
+                                        directory=str(tmp_path / scheme))
+
+
+@pytest.mark.parametrize("scheme", ["gf256", "thien_lin"])
+def test_progressive_levels_coarse_to_fine(tmp_path, image_path, scheme):
+    image = cv2.imread(image_path)
+    paths = _share(tmp_path, image_path, scheme)
+    assert sorted(FileService.map_share_file(paths[0])["sections"]) == [0, 1, 2]
+
+    wrapped_shares, _ = FileService.load_share_files(paths[1:])
+    levels = list(ImageService.reconstruct_progressive(wrapped_shares, 2))
+    assert [level for level, _ in levels] == [2, 1, 0]
+    for level, restored in levels:
+        height, width = ShareFormat.level_shape(image.shape, level)[:2]
+        assert restored.shape == (height, width, 3)
+        expected = image if level == 0 else cv2.resize(image, (width, height), interpolation=cv2.INTER_AREA)
+        assert np.array_equal(restored, expected)
+
+
+def test_progressive_stop_level_and_mapped_shares(tmp_path, image_path):
+    paths = _share(tmp_path, image_path, "gf256", levels=3)
+    wrapped_shares = [FileService.map_share_file(path) for path in paths[:2]]
+    levels = [level for level, _ in ImageService.reconstruct_progressive(wrapped_shares, 2, stop_level=2)]
+    assert levels == [3, 2]
+
+
+def test_progressive_rejects_fewer_than_k_shares(tmp_path, image_path):
+    paths = _share(tmp_path, image_path, "thien_lin", threshold=3, num_shares=4)
+    wrapped_shares, _ = FileService.load_share_files(paths[:2])
+    with pytest.raises(ValueError):
+        next(ImageService.reconstruct_progressive(wrapped_shares, 2))
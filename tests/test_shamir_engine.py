@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from modules import ShamirEngine
+
+
+def _split(threshold, num_shares, size=4096, seed=0):
+    secret = np.random.default_rng(seed).integers(0, 256, size=size, dtype=np.uint8)
+    return secret, ShamirEngine.split(secret, threshold, num_shares)
+
+
+def _corrupt(shares, share_idx, positions):
+    shares[share_idx, positions] ^= np.random.default_rng(share_idx).integers(1, 256, size=len(positions),
+                                                                              dtype=np.uint8)
+
+
+def test_decode_without_errors():
+    secret, shares = _split(3, 5)
+    decoded, error_counts = ShamirEngine.decode(shares, range(1, 6), 3)
+    assert np.array_equal(decoded, secret)
+    assert not error_counts.any()
+
+
+def test_decode_corrects_up_to_capacity_and_reports_faulty_shares():
+    # m = 7, k = 3: konum başına (7-3)//2 = 2 hata düzeltilir
+    secret, shares = _split(3, 7)
+    _corrupt(shares, 1, np.arange(0, 4096, 3))
+    _corrupt(shares, 4, np.arange(0, 4096, 5))
+    _corrupt(shares, 6, np.arange(1, 4096, 3))
+
+    decoded, error_counts = ShamirEngine.decode(shares, range(1, 8), 3)
+    assert np.array_equal(decoded, secret)
+    assert error_counts.tolist() == [0, len(range(0, 4096, 3)), 0, 0, len(range(0, 4096, 5)), 0,
+                                     len(range(1, 4096, 3))]
+
+
+def test_decode_raises_when_capacity_exceeded():
+    # m = 6, k = 3: 1 hata düzeltilir; aynı konumda 2 hata tespit edilir ama düzeltilemez
+    _, shares = _split(3, 6)
+    _corrupt(shares, 0, np.arange(0, 4096, 2))
+    _corrupt(shares, 5, np.arange(0, 4096, 2))
+    with pytest.raises(ValueError):
+        ShamirEngine.decode(shares, range(1, 7), 3)
+
+
+def test_decode_rejects_without_redundancy():
+    _, shares = _split(3, 5)
+    with pytest.raises(ValueError):
+        ShamirEngine.decode(shares[:3], range(1, 4), 3)
+
+
+def test_decode_with_more_than_63_shares():
+    # k = 70 olduğundan birleştirme 63. sıranın ötesindeki payları da kullanır
+    secret, shares = _split(70, 100, size=512)
+    _corrupt(shares, 1, np.arange(0, 512, 2))
+    _corrupt(shares, 66, np.arange(1, 512, 2))
+    _corrupt(shares, 90, np.arange(0, 512, 4))
+
+    decoded, error_counts = ShamirEngine.decode(shares, range(1, 101), 70)
+    assert np.array_equal(decoded, secret)
+    assert np.flatnonzero(error_counts).tolist() == [1, 66, 90]
@@ -0,0 +1,75 @@
+from concurrent.futures import ThreadPoolExecutor
+import os
+
+import numpy as np
+import pytest
+
+from modules import ShareStore
+
+
+def _shares(seed):
+    return list(np.random.default_rng(seed).integers(0, 256, size=(3, 48), dtype=np.uint8))
+
+
+def _put(store, shares, progress=None):
+    return store.put_batch("img", shares, None, (4, 4, 3), False, threshold=2, scheme="gf256",
+                           num_shares=3, progress=progress)
+
+
+def test_put_batch_replaces_previous_set(tmp_path):
+    with ShareStore(str(tmp_path)) as store:
+        _put(store, _shares(0))
+        paths = _put(store, _shares(1))
+        assert store.find("img") == paths
+        assert all(store.verify("img").values())
+        assert sorted(os.listdir(tmp_path)) == ["img", "index.sqlite3"]
+
+
+def test_failed_put_batch_keeps_previous_set(tmp_path):
+    def fail(done, total):
+        raise RuntimeError("iptal")
+
+    with ShareStore(str(tmp_path)) as store:
+        paths = _put(store, _shares(0))
+        checksums = [ShareStore.file_checksum(path) for path in paths]
+        with pytest.raises(RuntimeError):
+            _put(store, _shares(1), progress=fail)
+
+        assert store.find("img") == paths
+        assert [ShareStore.file_checksum(path) for path in paths] == checksums
+        assert all(store.verify("img").values())
+        assert sorted(os.listdir(tmp_path)) == ["img", "index.sqlite3"]
+
+
+def test_concurrent_put_batch(tmp_path):
+    with ShareStore(str(tmp_path)) as store:
+        def put(idx):
+            return store.put_batch(f"img{idx % 4}", _shares(idx), None, (4, 4, 3), False, threshold=2,
+                                   scheme="gf256", num_shares=3)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(put, range(32)))
+
+        assert sorted(store.image_ids()) == [f"img{idx}" for idx in range(4)]
+        for image_id in store.image_ids():
+            assert len(store.find(image_id)) == 3
+            assert all(store.verify(image_id).values())
+
+
+def test_put_batch_checksums_outside_lock(tmp_path, monkeypatch):
+    file_checksum = ShareStore.file_checksum
+    with ShareStore(str(tmp_path)) as store:
+        held = []
+
+        def checksum(path):
+            # Kilit başka bir iş parçacığından alınabiliyorsa sağlama toplamı kilit dışında
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                acquired = executor.submit(store._lock.acquire, blocking=False).result()
+                if acquired:
+                    executor.submit(store._lock.release).result()
+            held.append(not acquired)
+            return file_checksum(path)
+
+        monkeypatch.setattr(ShareStore, "file_checksum", staticmethod(checksum))
+        _put(store, _shares(0))
+        assert held == [False, False, False]
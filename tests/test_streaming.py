@@ -0,0 +1,113 @@
+import io
+import os
+
+import cv2
+import numpy as np
+import pytest
+
+from modules import FileService, ImageService, ShamirEngine, ShareStore
+from modules.file_service import PngStreamWriter
+
+BUDGET = 2048
+
+
+def _image(height=37, width=7, seed=0):
+    return np.random.default_rng(seed).integers(0, 256, size=(height, width, 3), dtype=np.uint8)
+
+
+@pytest.mark.parametrize("extension", [".bmp", ".ppm", ".png"])
+def test_iter_image_strips_matches_decoded_image(tmp_path, extension):
+    path = str(tmp_path / f"image{extension}")
+    image = _image()
+    cv2.imwrite(path, image)
+    if extension != ".png":
+        assert ImageService._raw_strip_source(path) is not None
+
+    strips = list(ImageService.iter_image_strips(path, 5))
+    assert [row for row, _ in strips] == list(range(0, 37, 5))
+    assert np.array_equal(np.concatenate([strip for _, strip in strips]), image)
+
+
+def test_png_stream_writer(tmp_path):
+    image = _image(height=9, width=5)
+    buffer = io.BytesIO()
+    with PngStreamWriter(buffer, 5, 9) as encoder:
+        for row in range(0, 9, 4):
+            encoder.write_rows(cv2.cvtColor(image[row:row + 4], cv2.COLOR_BGR2RGB))
+    decoded = cv2.imdecode(np.frombuffer(buffer.getvalue(), dtype=np.uint8), cv2.IMREAD_COLOR)
+    assert np.array_equal(decoded, image)
+
+    buffer = io.BytesIO()
+    with pytest.raises(RuntimeError):
+        with PngStreamWriter(buffer, 5, 9) as encoder:
+            raise RuntimeError
+    assert b"IEND" not in buffer.getvalue()
+
+
+@pytest.mark.parametrize("extension", [".bmp", ".png"])
+def test_streaming_roundtrip(tmp_path, extension):
+    path = str(tmp_path / f"image{extension}")
+    image = _image()
+    cv2.imwrite(path, image)
+
+    paths, shape = ImageService.share_image_streaming(path, 4, 3, memory_budget=BUDGET,
+                                                      directory=str(tmp_path / "shares"))
+    assert shape == (37, 7, 3)
+    assert sorted(os.listdir(tmp_path / "shares")) == [f"share_{x}.bin" for x in range(1, 5)]
+
+    output = str(tmp_path / "restored.png")
+    ImageService.reconstruct_image_streaming(paths[1:], output, memory_budget=BUDGET)
+    assert np.array_equal(cv2.imread(output), image)
+    assert os.listdir(tmp_path).count("restored.png") == 1
+
+    with pytest.raises(ValueError):
+        ImageService.reconstruct_image_streaming(paths[:2], str(tmp_path / "short.png"))
+    assert not os.path.exists(tmp_path / "short.png")
+
+
+def test_failed_streaming_share_keeps_previous_set(tmp_path, monkeypatch):
+    path = str(tmp_path / "image.bmp")
+    cv2.imwrite(path, _image())
+    directory = str(tmp_path / "shares")
+    paths, _ = ImageService.share_image_streaming(path, 3, 2, memory_budget=BUDGET, directory=directory)
+    contents = [open(share_path, "rb").read() for share_path in paths]
+
+    split = ShamirEngine.split
+    calls = []
+
+    def failing_split(*args, **kwargs):
+        calls.append(None)
+        if len(calls) == 2:
+            raise RuntimeError("iptal")
+        return split(*args, **kwargs)
+
+    monkeypatch.setattr(ShamirEngine, "split", staticmethod(failing_split))
+    with pytest.raises(RuntimeError):
+        ImageService.share_image_streaming(path, 3, 2, memory_budget=BUDGET, directory=directory)
+
+    assert sorted(os.listdir(directory)) == ["share_1.bin", "share_2.bin", "share_3.bin"]
+    assert [open(share_path, "rb").read() for share_path in paths] == contents
+
+
+def test_streaming_share_into_store(tmp_path):
+    path = str(tmp_path / "image.bmp")
+    image = _image()
+    cv2.imwrite(path, image)
+
+    with ShareStore(str(tmp_path / "store")) as store:
+        paths, _ = ImageService.share_image_streaming(path, 3, 2, memory_budget=BUDGET, store=store)
+        image_id = ShareStore.image_id(path)
+        assert store.find(image_id) == paths
+        assert all(store.verify(image_id).values())
+        assert store.describe(image_id)["threshold"] == 2
+
+    wrapped_shares, _ = FileService.load_share_files(paths[:2])
+    assert np.array_equal(ImageService.reconstruct_image_from_shares(wrapped_shares, 2), image)
+
+
+def test_reconstruct_streaming_rejects_other_schemes(tmp_path):
+    shares = ImageService.split_image_array(_image(), "thien_lin", 2, 3)
+    paths = FileService.save_share_batch(list(shares), None, (37, 7, 3), False, threshold=2,
+                                         scheme="thien_lin", num_shares=3, directory=str(tmp_path))
+    with pytest.raises(ValueError):
+        ImageService.reconstruct_image_streaming(paths, str(tmp_path / "restored.png"))
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from modules import ImageService, ThienLinEngine
+
+
+def _wrap(shares, original_shape, threshold, xs=None):
+    xs = xs or range(1, len(shares) + 1)
+    return [{"share_x": x, "share_data": share, "original_shape": original_shape, "scheme": "thien_lin",
+             "threshold": threshold} for x, share in zip(xs, shares)]
+
+
+@pytest.fixture
+def image():
+    return np.random.default_rng(0).integers(0, 256, size=(7, 5, 3), dtype=np.uint8)
+
+
+@pytest.mark.parametrize("threshold, num_shares", [(1, 1), (2, 3), (3, 5), (4, 4)])
+def test_split_and_recover_any_k_shares(threshold, num_shares):
+    secret = np.random.default_rng(threshold).integers(0, 256, size=101, dtype=np.uint8)
+    shares = ThienLinEngine.split(secret, threshold, num_shares)
+    assert shares.shape == (num_shares, ThienLinEngine.share_size(101, threshold))
+
+    selected = list(range(num_shares))[::-1][:threshold]
+    recovered = ThienLinEngine.recover([shares[idx] for idx in selected], [idx + 1 for idx in selected], 101)
+    assert np.array_equal(recovered, secret)
+
+
+def test_banded_split_matches_single_pass(image):
+    # k = 4 bant boyutunu (2 satır = 30 bayt) 4'ün katına yuvarlar
+    calls = []
+    banded = ImageService.split_image_array(image, "thien_lin", 4, 5, tile_rows=2,
+                                            progress=lambda done, total: calls.append((done, total)))
+    assert np.array_equal(banded, ThienLinEngine.split(image, 4, 5))
+    assert calls[-1] == (len(calls), len(calls)) and len(calls) > 1
+
+
+def test_reconstruct_image(image):
+    shares = ImageService.split_image_array(image, "thien_lin", 3, 5)
+    wrapped = _wrap(shares, image.shape, 3)
+    assert np.array_equal(ImageService.reconstruct_image_from_shares(wrapped[2:], 3), image)
+
+
+def test_reconstruct_rejects_fewer_than_k_shares(image):
+    shares = ImageService.split_image_array(image, "thien_lin", 3, 5)
+    wrapped = _wrap(shares, image.shape, 3)
+    with pytest.raises(ValueError):
+        ImageService.reconstruct_image_from_shares(wrapped[:2], 2)
+    with pytest.raises(ValueError):
+        ThienLinEngine.recover(shares[:2], [1, 2], image.size)
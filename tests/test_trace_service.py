@@ -0,0 +1,123 @@
+from concurrent.futures import ThreadPoolExecutor
+import json
+import threading
+
+import pytest
+
+from modules import TraceService
+
+MB = 1024 * 1024
+
+
+@pytest.fixture
+def tracing(tmp_path):
+    TraceService.recorder.clear()
+    TraceService.enable(memory=True, trace_file=str(tmp_path / "trace.jsonl"))
+    yield tmp_path / "trace.jsonl"
+    TraceService.disable()
+    TraceService.recorder.clear()
+
+
+def _spans(name):
+    return [span for span in TraceService.recorder.spans if span.name == name]
+
+
+def test_nested_spans_and_breakdown(tracing):
+    with TraceService.span("outer") as outer:
+        for _ in range(2):
+            with TraceService.span("inner", rows=4):
+                pass
+
+    inner = _spans("inner")
+    assert [span.parent for span in inner] == [outer, outer]
+    assert inner[0].attrs == {"rows": 4}
+    assert [(row["name"], row["depth"], row["count"]) for row in TraceService.breakdown(outer)] == [
+        ("outer", 0, 1), ("inner", 1, 2)]
+
+
+def test_wrap_propagates_parent_to_pool_threads(tracing):
+    def work():
+        with TraceService.span("work"):
+            return threading.current_thread().name
+
+    with TraceService.span("batch") as batch:
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            threads = [executor.submit(TraceService.wrap(work)).result() for _ in range(2)]
+
+    assert all(name != threading.current_thread().name for name in threads)
+    assert [span.parent for span in _spans("work")] == [batch, batch]
+
+
+def test_memory_peak_of_sequential_spans(tracing):
+    with TraceService.span("outer"):
+        with TraceService.span("alloc"):
+            buffer = bytearray(8 * MB)
+            del buffer
+        with TraceService.span("small"):
+            pass
+
+    assert _spans("alloc")[0].memory_peak >= 7 * MB
+    assert _spans("small")[0].memory_peak < MB
+    assert _spans("outer")[0].memory_peak >= 7 * MB
+
+
+def test_overlapping_spans_do_not_report_memory_peak(tracing):
+    entered, release = threading.Event(), threading.Event()
+
+    def other():
+        with TraceService.span("other"):
+            entered.set()
+            release.wait()
+
+    thread = threading.Thread(target=other)
+    thread.start()
+    entered.wait()
+    with TraceService.span("alloc"):
+        buffer = bytearray(8 * MB)
+        del buffer
+    release.set()
+    thread.join()
+
+    assert _spans("alloc")[0].memory_peak is None
+    assert _spans("other")[0].memory_peak is None
+
+
+def test_parent_of_overlapping_children_keeps_memory_peak(tracing):
+    barrier = threading.Barrier(2)
+
+    def work():
+        with TraceService.span("work"):
+            barrier.wait()
+            buffer = bytearray(8 * MB)
+            barrier.wait()
+            del buffer
+
+    with TraceService.span("batch"):
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futures = [executor.submit(TraceService.wrap(work)) for _ in range(2)]
+            for future in futures:
+                future.result()
+
+    assert [span.memory_peak for span in _spans("work")] == [None, None]
+    assert _spans("batch")[0].memory_peak >= 15 * MB
+
+
+def test_jsonl_and_prometheus_export(tracing, tmp_path):
+    with TraceService.span("file.save"):
+        pass
+    with pytest.raises(RuntimeError):
+        with TraceService.span('bad"name'):
+            raise RuntimeError
+
+    lines = [json.loads(line) for line in tracing.read_text(encoding="utf-8").splitlines()]
+    assert [line["name"] for line in lines] == ["file.save", 'bad"name']
+    assert lines[1]["error"] == "RuntimeError"
+
+    export = tmp_path / "export.jsonl"
+    assert TraceService.export_jsonl(str(export)) == 2
+    assert export.read_text(encoding="utf-8").splitlines() == tracing.read_text(encoding="utf-8").splitlines()
+
+    text = TraceService.prometheus_text()
+    assert 'sis_span_duration_seconds_count{span="file.save"} 1' in text
+    assert 'sis_span_errors_total{span="bad\\"name"} 1' in text
+    assert '# TYPE sis_span_memory_peak_bytes gauge' in text
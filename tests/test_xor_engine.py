@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from modules import ImageService, XorEngine
+
+
+def _wrap(shares, original_shape, xs=None):
+    xs = xs or range(1, len(shares) + 1)
+    return [{"share_x": x, "share_data": share, "original_shape": original_shape, "scheme": "xor",
+             "threshold": len(shares)} for x, share in zip(xs, shares)]
+
+
+@pytest.fixture
+def image():
+    return np.random.default_rng(0).integers(0, 256, size=(7, 5, 3), dtype=np.uint8)
+
+
+@pytest.mark.parametrize("num_shares", [2, 3, 8])
+def test_split_and_recover(num_shares):
+    secret = np.random.default_rng(num_shares).integers(0, 256, size=101, dtype=np.uint8)
+    shares = XorEngine.split(secret, num_shares)
+    assert shares.shape == (num_shares, 101)
+    assert np.array_equal(XorEngine.recover(list(shares)[::-1]), secret)
+    assert not np.array_equal(XorEngine.recover(shares[:-1]), secret)
+
+
+def test_split_rejects_invalid_share_counts():
+    with pytest.raises(ValueError):
+        XorEngine.split(np.zeros(4, dtype=np.uint8), 1)
+    with pytest.raises(ValueError):
+        ImageService.split_image_array(np.zeros((2, 2, 3), dtype=np.uint8), "xor", 2, 3)
+
+
+def test_banded_split_reconstructs(image):
+    calls = []
+    shares = ImageService.split_image_array(image, "xor", 4, 4, tile_rows=2,
+                                            progress=lambda done, total: calls.append(done))
+    assert calls == [1, 2, 3, 4]
+    assert np.array_equal(ImageService.reconstruct_image_from_shares(_wrap(shares, image.shape), 4), image)
+
+
+def test_reconstruct_rejects_fewer_than_n_shares(image):
+    shares = ImageService.split_image_array(image, "xor", 3, 3)
+    wrapped = _wrap(shares, image.shape)
+    with pytest.raises(ValueError):
+        ImageService.reconstruct_image_from_shares(wrapped[:2], 2)
+    # Aynı pay iki kez verilirse tek pay sayılır
+    with pytest.raises(ValueError):
+        ImageService.reconstruct_image_from_shares([wrapped[0], wrapped[1], wrapped[1]], 3)